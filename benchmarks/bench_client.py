@@ -0,0 +1,174 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Client Benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    End-to-end latency and throughput of Client against the fake Links server
+    ( pytronlinks.fakelinks ), no Links install needed.
+
+        python benchmarks/bench_client.py --latency 0.002 --jitter 0.001 --iterations 500
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytronlinks
+from pytronlinks.fakelinks import FakeLinks, make_grammars
+
+clock = timeit.default_timer
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    k = (len(samples) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(samples) - 1)
+    return samples[lo] + (samples[hi] - samples[lo]) * (k - lo)
+
+
+def report(label, samples, elapsed, ops=None):
+    """ Prints one row: latencies in ms and throughput in calls per second """
+    ops = len(samples) if ops is None else ops
+    print('{:<28} {:>6} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f} {:>10.0f}'.format(
+        label, ops, sum(samples) / len(samples) * 1e3, percentile(samples, 50) * 1e3,
+        percentile(samples, 95) * 1e3, percentile(samples, 99) * 1e3, ops / elapsed))
+
+
+def timed(fcn, iterations):
+    samples = []
+    start = clock()
+    for i in range(iterations):
+        t = clock()
+        fcn(i)
+        samples.append(clock() - t)
+    return samples, clock() - start
+
+
+def bench_listen(ai, links, iterations):
+    """ Time from Links writing UserVariables.xml to listen() returning """
+    samples = []
+    start = clock()
+    for i in range(iterations):
+        sent = []
+
+        def speak(i=i):
+            sent.append(clock())
+            links.set_variable('Pytron', 'dictation {}'.format(i))
+
+        timer = threading.Timer(0.005, speak)
+        timer.start()
+        dictation = ai.listen(freq=0.01)
+        samples.append(clock() - sent[0])
+        timer.join()
+        assert dictation == 'dictation {}'.format(i), dictation
+    return samples, clock() - start
+
+
+def bench_threads(ai, threads, iterations):
+    """ Every thread talks through the one client and its connection pool """
+    samples = []
+    lock = threading.Lock()
+
+    def worker():
+        mine, _ = timed(lambda i: ai.talk('concurrent {}'.format(i)), iterations)
+        with lock:
+            samples.extend(mine)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = clock()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return samples, clock() - start
+
+
+def bench_async(links, concurrency, iterations):
+    """ AsyncClient with concurrency talks in flight at once """
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    ai = pytronlinks.AsyncClient(ip=links.host, port=links.port,
+                                 pool=pytronlinks.aio.AsyncConnectionPool(maxsize=concurrency))
+    samples = []
+
+    def track(i):
+        started = clock()
+        future = asyncio.ensure_future(ai.talk('async {}'.format(i)), loop=loop)
+        future.add_done_callback(lambda f: samples.append(clock() - started))
+        return future
+
+    start = clock()
+    for n in range(0, iterations, concurrency):
+        loop.run_until_complete(asyncio.gather(*[track(i) for i in range(n, min(n + concurrency, iterations))]))
+    elapsed = clock() - start
+    ai.close()
+    loop.close()
+    return samples, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the fake Links adds to each request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many random extra seconds')
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=10, help='Sets per batch')
+    parser.add_argument('--grammars', type=int, default=50)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    pytronlinks.Client._XML_PATH = folder
+    links = FakeLinks(latency=args.latency, jitter=args.jitter,
+                      grammars=make_grammars(args.grammars, 50),
+                      commands={'what time is it': 'It is benchmark o clock'}).start()
+    ai = pytronlinks.Client(ip=links.host, port=links.port, pool=pytronlinks.ConnectionPool(maxsize=args.threads))
+    links.variables_file = ai._xml_file()
+    links.set_variable('Pytron', '')
+    n = args.iterations
+
+    print('fake Links at {}:{}, latency {} ms, jitter {} ms, python {}'.format(
+        links.host, links.port, args.latency * 1e3, args.jitter * 1e3, sys.version.split()[0]))
+    print('{:<28} {:>6} {:>9} {:>9} {:>9} {:>9} {:>10}'.format('', 'calls', 'mean ms', 'p50 ms', 'p95 ms',
+                                                               'p99 ms', 'calls/s'))
+    try:
+        report('talk', *timed(lambda i: ai.talk('benchmark {}'.format(i)), n))
+        report('Set', *timed(lambda i: ai.Set('Bench', i), n))
+        report('Get', *timed(lambda i: ai.Get('Bench'), n))
+        report('CallCommand', *timed(lambda i: ai.CallCommand('what time is it'), n))
+        report('GetGrammarList ( {} )'.format(args.grammars), *timed(lambda i: ai.GetGrammarList(), max(n // 10, 1)))
+        report('listen wake-up', *bench_listen(ai, links, max(n // 10, 1)))
+
+        sequential, elapsed = timed(lambda i: [ai.Set('Bench', j) for j in range(args.batch)], max(n // args.batch, 1))
+        report('Set x{} sequential'.format(args.batch), sequential, elapsed)
+
+        def batched(i):
+            with ai.batch() as b:
+                for j in range(args.batch):
+                    b.Set('Bench', j)
+        report('Set x{} batched'.format(args.batch), *timed(batched, max(n // args.batch, 1)))
+
+        report('talk, {} threads'.format(args.threads), *bench_threads(ai, args.threads, max(n // args.threads, 1)))
+        if sys.version_info >= (3, 5):
+            report('talk, async x{}'.format(args.threads), *bench_async(links, args.threads, n))
+        print('{} requests served, pool: {}'.format(links.requests, ai.pool_stats()))
+    finally:
+        ai.close()
+        links.stop()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Phrase Index Benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compares PhraseIndex lookups against a linear scan of every grammar's commands.
+
+        python benchmarks/bench_index.py
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pytronlinks.grammar import Grammar
+from pytronlinks.phrases import PhraseIndex, normalize
+
+WORDS = ('play open close what time is it the music lights weather turn on off show me next '
+         'previous volume up down links jarvis computer start stop email calendar news read').split()
+
+
+def make_grammars(count=500, commands=100, seed=1):
+    rnd = random.Random(seed)
+    grammars = []
+    for g in range(count):
+        phrases = tuple(' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 6))) + ' {}'.format(g * commands + c)
+                        for c in range(commands))
+        grammars.append(Grammar('Grammar {}'.format(g), g % 3 != 0, True, 0, False, phrases))
+    return grammars
+
+
+def linear_lookup(grammars, phrase):
+    phrase = normalize(phrase)
+    return [(g, c) for g in grammars for c in g.commands if normalize(c) == phrase]
+
+
+def linear_prefix(grammars, phrase):
+    phrase = normalize(phrase)
+    return [(g, c) for g in grammars for c in g.commands if normalize(c).startswith(phrase)]
+
+
+def bench(label, fcn, number):
+    t = min(timeit.repeat(fcn, number=number, repeat=3)) / number
+    print('{:<34} {:>14.1f} us'.format(label, t * 1e6))
+    return t
+
+
+def main():
+    grammars = make_grammars()
+    total = sum(len(g.commands) for g in grammars)
+    rnd = random.Random(2)
+    targets = [rnd.choice(rnd.choice(grammars).commands) for _ in range(100)]
+    prefix = ' '.join(targets[0].split()[:2])
+
+    start = timeit.default_timer()
+    index = PhraseIndex(grammars)
+    print('{} commands in {} grammars, index built in {:.1f} ms'.format(
+        total, len(grammars), (timeit.default_timer() - start) * 1e3))
+    assert [m.command for m in index.lookup(targets[0])] == [c for g, c in linear_lookup(grammars, targets[0])]
+
+    it = iter(targets * 1000)
+    slow = bench('linear scan, exact', lambda: linear_lookup(grammars, targets[0]), 3)
+    fast = bench('PhraseIndex.lookup', lambda: index.lookup(next(it)), 10000)
+    print('{:<34} {:>14.0f}x'.format('speedup', slow / fast))
+    slow = bench('linear scan, prefix', lambda: linear_prefix(grammars, prefix), 3)
+    fast = bench('PhraseIndex.prefix ( 10 results )', lambda: list(index.prefix(prefix, limit=10)), 10000)
+    print('{:<34} {:>14.0f}x'.format('speedup', slow / fast))
+
+
+if __name__ == '__main__':
+    main()
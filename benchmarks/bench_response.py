@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Response Decoding Benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Compares pytronlinks.response against the old readlines() + ast.literal_eval path
+    on a large CallCommand reply and a large GetGrammarList reply.
+
+        python benchmarks/bench_response.py
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import ast
+import json
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pytronlinks.response import decode_json, decode_xml
+
+
+def call_command_body(size=64 * 1024):
+    text = ('The weather today is sunny with a high of 72 degrees. ' * (size // 54 + 1))[:size]
+    return 'HTTP/1.1 200 OK\nContent-Type: text/plain\n\n' + json.dumps({'response': text, 'error': ''}) + '\n'
+
+
+def grammar_body(grammars=200, commands=50):
+    inner = ['<?xml version="1.0"?><grammars>']
+    for g in range(grammars):
+        inner.append('<grammar><Name>Grammar {0}</Name><Enabled>true</Enabled><Loaded>true</Loaded>'
+                     '<Priority>0</Priority><DebugShowPhrases>false</DebugShowPhrases>'.format(g))
+        inner.extend('<Commands>command {0} of grammar {1}</Commands>'.format(c, g) for c in range(commands))
+        inner.append('</grammar>')
+    inner.append('</grammars>')
+    return ('HTTP/1.1 200 OK\nContent-Type: text/xml\n\n\n'
+            '<?xml version="1.0"?>\n<Links><response>' + escape(''.join(inner)) + '</response><error></error></Links>\n')
+
+
+def old_json(body):
+    j = body.splitlines(True)
+    response = ast.literal_eval(j[3].strip())
+    return response['response'], response['error']
+
+
+def old_xml(body):
+    x = body.splitlines(True)
+    root_ = ET.fromstringlist(x[4:])
+    return root_.find('response').text
+
+
+def new_json(body):
+    r = decode_json(body)
+    return r.response, r.error
+
+
+def new_xml(body):
+    return decode_xml(body).response
+
+
+def bench(label, old, new, body, number):
+    assert old(body) == new(body)
+    t_old = min(timeit.repeat(lambda: old(body), number=number, repeat=5)) / number
+    t_new = min(timeit.repeat(lambda: new(body), number=number, repeat=5)) / number
+    print('{:<28} {:>10.1f} us {:>10.1f} us {:>8.2f}x'.format(label, t_old * 1e6, t_new * 1e6, t_old / t_new))
+
+
+def main():
+    print('{:<28} {:>13} {:>13} {:>9}'.format('body', 'readlines', 'response.py', 'speedup'))
+    bench('CallCommand 64 KiB', old_json, new_json, call_command_body(), 200)
+    bench('CallCommand 1 MiB', old_json, new_json, call_command_body(1024 * 1024), 10)
+    bench('GetGrammarList 200x50', old_xml, new_xml, grammar_body(), 20)
+    bench('GetGrammarList 1000x50', old_xml, new_xml, grammar_body(1000), 5)
+
+
+if __name__ == '__main__':
+    main()
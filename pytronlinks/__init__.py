@@ -11,7 +11,23 @@
 """
 
 
+import sys
+
 from .client import *
+from .batch import Batch
+from .breaker import CircuitBreaker, CircuitOpenError
+from .cache import ResponseCache
+from .confirm import Confirmation
+from .dictation import DictationReader
+from .grammar import Grammar, GrammarDelta, GrammarSnapshot
+from .history import HistoryEntry, HistoryWriter
+from .hosts import ClientPool
+from .metrics import Metrics
+from .phrases import PhraseIndex
+from .pool import ConnectionPool
+from .speech import SpeechQueue
+from .variables import VariableStore
+from .wordlists import WordlistReader
 
 
 __copyright__ = 'Copyright 2016 by traBpUkciP'
@@ -22,5 +38,27 @@ __email__ = 'duroktar@gmail.com'
 __source__ = 'https://github.com/Duroktar/PytronAI/'
 
 __all__ = [
+    'Batch',
+    'CircuitBreaker',
+    'CircuitOpenError',
     'Client',
+    'ClientPool',
+    'Confirmation',
+    'ConnectionPool',
+    'DictationReader',
+    'Grammar',
+    'GrammarDelta',
+    'GrammarSnapshot',
+    'HistoryEntry',
+    'HistoryWriter',
+    'Metrics',
+    'PhraseIndex',
+    'ResponseCache',
+    'SpeechQueue',
+    'VariableStore',
+    'WordlistReader',
 ]
+
+if sys.version_info >= (3, 5):
+    from .aio import AsyncClient
+    __all__.append('AsyncClient')
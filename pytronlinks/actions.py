@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Actions
+    ~~~~~~~~~~~~~~~~
+
+    Links function signatures compiled once, then bound to arguments with proper Links quoting.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import re
+
+from .compat import quote, string_types
+
+# Left readable in request paths. Everything else ( spaces, quotes, &, #, +, = ... ) is percent-encoded.
+_SAFE = '[](),'
+
+# A nested Links function call, ie: the [Get("Mood")] in 'Mood is [Get("Mood")]'
+_NESTED = re.compile(r'\[\s*[\w.]+\s*\(')
+
+
+class Inline(str):
+    """ Argument text that is already Links-escaped. Action puts it between the quotes as is.
+        Text with a nested [Function(...)] call in it is treated this way without being marked.
+    """
+    __slots__ = ()
+
+
+class Action(object):
+    """ One Links function signature. Calling it with the arguments returns the action string,
+        every argument quoted the way Links reads strings ( in double quotes, " doubled ). Arguments
+        with a nested action in them, ie: 'Mood is [Get("Mood")]', are passed through for Links to run.
+
+         :Example:
+
+              from pytronlinks.actions import Action
+
+              greet = Action('SpeakEx', 'phrase', 'name', 'vol', 'rate', 'delay', 'volume_mode')
+              ai.custom(greet('Say "hi" & wave', 'IVONA Brian', 100, 0, 0, 'voice'))
+
+    """
+    __slots__ = ('name', 'params', '_head')
+
+    def __init__(self, name, *params):
+        """
+        :param name: Links function name
+        :param params: Parameter names, used for the argument count and error messages
+        """
+        self.name = name
+        self.params = params
+        self._head = '[{}('.format(name)
+
+    def __call__(self, *args):
+        if len(args) != len(self.params):
+            raise TypeError('{}() takes {} arguments ({}), {} given'.format(
+                self.name, len(self.params), ', '.join(self.params), len(args)))
+        return self._head + ', '.join([links_quote(arg) for arg in args]) + ')]'
+
+    def __repr__(self):
+        return 'Action({!r}, {})'.format(self.name, ', '.join(repr(p) for p in self.params))
+
+
+def links_escape(value):
+    """ Text of a Links string argument, " doubled. Inline values and text with a nested
+    [Function(...)] call in it are returned untouched.
+    """
+    if isinstance(value, Inline):
+        return value
+    if not isinstance(value, string_types):
+        value = str(value)
+    if _NESTED.search(value):
+        return value
+    return value.replace('"', '""')
+
+
+def links_quote(value):
+    """ A value as a Links string argument: links_escape'd and wrapped in double quotes """
+    return '"' + links_escape(value) + '"'
+
+
+def encode(action):
+    """ Percent-encodes an action string for the query string of a request path """
+    if not isinstance(action, bytes):
+        action = action.encode('utf-8')
+    return quote(action, safe=_SAFE)
+
+
+Speak = Action('Speak', 'text')
+SayAs = Action('SayAs', 'data', 'content')
+EmulateSpeech = Action('EmulateSpeech', 'command')
+LoquendoSpeak = Action('LLoquendo.Speech.Speak', 'text', 'volume', 'rate', 'ai_name')
+Get = Action('Get', 'var_name')
+Set = Action('Set', 'var_name', 'var_value')
+GetWord = Action('GetWord', 'wordlist', 'grammar', 'column')
+CallCommand = Action('CallCommand', 'command')
+GetGrammarList = Action('GetGrammarList', 'data_type')
+SetSpeechVolume = Action('SetSpeechVolume', 'vol')
+SetSpeechVoice = Action('SetSpeechVoice', 'name')
+SetSpeechConfig = Action('SetSpeechConfig', 'name', 'vol', 'rate')
+SpeakEx = Action('SpeakEx', 'phrase', 'name', 'vol', 'rate', 'delay', 'sys_or_voice_vol')
+StopVoiceByName = Action('StopVoiceByName', 'name', 'ResponseOnSuccess')
+StopVoiceByIdentifier = Action('StopVoiceByIdentifier', 'identifier', 'ResponseOnSuccess')
+SpeakExSysVolSync = Action('SpeakExSysVolSync', 'phrase', 'VoiceVolume', 'VoiceRate', 'phraseDelay', 'VoiceName')
+SpeakExSysVolAsync = Action('SpeakExSysVolAsync', 'phrase', 'VoiceVolume', 'VoiceRate', 'phraseDelay', 'VoiceName')
+
+
+def say_as(before, data, content, after=''):
+    """ [Speak] of text with a [SayAs] in the middle, as Client.SayAs sends it """
+    return Speak(Inline('{} {}. {}'.format(links_escape(before), SayAs(data, content), links_escape(after))))
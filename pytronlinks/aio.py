@@ -0,0 +1,481 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - asyncio Client
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Coroutine versions of the Client functions for use inside an asyncio event loop.
+    Requires Python 3.5 or newer.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import asyncio
+
+from . import actions
+from .breaker import CircuitOpenError, backoff
+from .client import Client
+from .compat import to_text
+from .metrics import clock
+from .pool import _STALE_ERRNOS
+from .speech import chunk_text
+
+
+class AsyncConnectionPool(object):
+    """ Non-blocking counterpart of ConnectionPool built on asyncio streams.
+        Keeps idle HTTP/1.1 keep-alive connections per (ip, port).
+    """
+
+    def __init__(self, maxsize=4, timeout=None):
+        """
+        :param maxsize: Max idle connections kept per (ip, port)
+        :param timeout: Seconds to wait for a whole request/response ( None waits forever )
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = {}
+        self._stats = {
+            'requests': 0,
+            'created': 0,
+            'reused': 0,
+            'reconnects': 0,
+            'discarded': 0,
+        }
+
+    async def request(self, host, port, path, timeout=None, idempotent=False):
+        """ Sends a GET request and reads the whole response without blocking the loop.
+
+        Same resend rules as ConnectionPool.request: idle connections Links has already closed are
+        dropped before use, and a request that finds a reused connection dead is only sent again on a
+        fresh one when writing it failed or it is idempotent.
+
+        :param host: ip or host name of the computer running Links
+        :param port: Port that Links is listening on
+        :param path: Request path, already quoted
+        :param timeout: Seconds to wait for this request. OPTIONAL. Defaults to the pool timeout
+        :param idempotent: Safe to send twice ( reads only ). OPTIONAL
+        :return: Returns a (status, body) tuple
+        """
+        if timeout is None:
+            timeout = self.timeout
+        return await asyncio.wait_for(self._request((host, int(port)), path, idempotent), timeout)
+
+    def stats(self):
+        """ Returns a snapshot of the pool counters plus the number of idle connections per host. """
+        stats = dict(self._stats)
+        stats['idle'] = dict(('{}:{}'.format(*k), len(v)) for k, v in self._idle.items())
+        return stats
+
+    def close(self):
+        """ Closes every idle connection. """
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for reader, writer in conns:
+                writer.close()
+
+    async def _request(self, key, path, idempotent=False):
+        conn, reused = self._acquire(key)
+        if conn is None:
+            conn = await self._connect(key)
+        sent = []
+        try:
+            try:
+                status, body, will_close = await self._send(conn, key, path, sent)
+            except (OSError, EOFError) as e:
+                conn[1].close()
+                conn = None
+                if not reused or not _stale(e) or (sent and not idempotent):
+                    raise
+                self._stats['reconnects'] += 1
+                conn = await self._connect(key)
+                status, body, will_close = await self._send(conn, key, path)
+        except BaseException:
+            # Failed or cancelled ( ie: by the wait_for timeout ) half way through, so it can't be reused
+            if conn is not None:
+                conn[1].close()
+            raise
+        self._stats['requests'] += 1
+        conns = self._idle.setdefault(key, [])
+        if will_close or len(conns) >= self.maxsize:
+            conn[1].close()
+            self._stats['discarded'] += 1
+        else:
+            conns.append(conn)
+        return status, body
+
+    def _acquire(self, key):
+        """ Pops an idle connection Links hasn't closed, or returns (None, False) -private """
+        conns = self._idle.get(key)
+        while conns:
+            reader, writer = conn = conns.pop()
+            if reader.at_eof() or reader.exception() is not None or writer.is_closing():
+                writer.close()
+                self._stats['discarded'] += 1
+                continue
+            self._stats['reused'] += 1
+            return conn, True
+        return None, False
+
+    async def _connect(self, key):
+        self._stats['created'] += 1
+        return await asyncio.open_connection(key[0], key[1])
+
+    @staticmethod
+    async def _send(conn, key, path, sent=None):
+        reader, writer = conn
+        writer.write('GET {} HTTP/1.1\r\nHost: {}:{}\r\nConnection: keep-alive\r\n\r\n'.format(
+            path, key[0], key[1]).encode('latin-1'))
+        await writer.drain()
+        if sent is not None:
+            sent.append(True)
+
+        line = await reader.readline()
+        if not line:
+            raise EOFError('Links closed the connection')
+        version, status = line.split(None, 2)[:2]
+        status = int(status)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
+
+        connection = headers.get('connection', '')
+        will_close = connection == 'close' or (version == b'HTTP/1.0' and connection != 'keep-alive')
+        if headers.get('transfer-encoding') == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            will_close = True
+        return status, body, will_close
+
+
+def _stale(error):
+    """ True for errors of a connection that was dead before the request got an answer -private """
+    if isinstance(error, EOFError):
+        return not isinstance(error, asyncio.IncompleteReadError)
+    return getattr(error, 'errno', None) in _STALE_ERRNOS
+
+
+class AsyncClient(object):
+    """ asyncio Pytron Client. Every Links function is a coroutine, and listen/GetConfirmation
+        wait on UserVariables.xml without blocking the loop, so many actions and listeners can share it.
+
+         :Example:
+
+              import asyncio
+              import pytronlinks
+
+              ai = pytronlinks.AsyncClient()
+
+              async def main():
+                  await asyncio.gather(ai.talk("Links is the best!"), ai.Set("Mood", "happy"))
+                  dictation = await ai.listen()
+                  await ai.talk(dictation)
+
+              asyncio.get_event_loop().run_until_complete(main())
+
+    """
+
+    def __init__(self, path=None, port='54657', key='ABC1234', ip='localhost', pool=None, metrics=True,
+                 timeout=10.0, retries=2, breaker=True, read_mode=Client.READ_AUTO):
+        """ Same parameters as Client.
+
+        :param port: Port that links is listening on
+        :param key: Links web key
+        :param ip: ip of computer with links
+        :param path: Path to \\LINKS\\Customization\\XML
+        :param pool: AsyncConnectionPool to share between clients. OPTIONAL
+        :param metrics: Metrics to record every call into, or False to turn them off. OPTIONAL
+        :param timeout: Seconds to wait on Links for any one request. OPTIONAL
+        :param retries: Extra attempts for Get, GetWord and GetGrammarList. OPTIONAL
+        :param breaker: CircuitBreaker to share, or False to turn it off. OPTIONAL
+        :param read_mode: Where Get reads variables ( see Client.read_mode ). OPTIONAL
+        """
+        # The blocking client only builds queries, reads responses and handles the xml file here.
+        self._client = Client(path=path, port=port, key=key, ip=ip, metrics=metrics, timeout=timeout,
+                              retries=retries, breaker=breaker, read_mode=read_mode)
+        self._pool = pool if pool is not None else AsyncConnectionPool()
+
+    @property
+    def ip(self):
+        return self._client.ip
+
+    @property
+    def port(self):
+        return self._client.port
+
+    @property
+    def key(self):
+        return self._client.key
+
+    async def talk(self, text):
+        """ Speaks through Links ( see Client.talk ) """
+        await self._get_request(actions.Speak(text))
+
+    async def talk_stream(self, text, max_chars=300, sanitize=True):
+        """ Speaks long text a sentence at a time ( see Client.talk_stream ) """
+        spoken = 0
+        for chunk in chunk_text(text, max_chars):
+            if sanitize:
+                chunk = Client.strip_bad_chars(Client.strip_non_ascii(chunk))
+            if chunk.strip():
+                await self._get_request(actions.Speak(chunk))
+                spoken += 1
+        return spoken
+
+    async def emulate_speech(self, command):
+        """ Sends an Emulate Speech Command ( see Client.emulate_speech ) """
+        await self._get_request(actions.EmulateSpeech(command))
+
+    async def custom(self, string):
+        """ Runs your own Links Action Commands ( see Client.custom ) """
+        return await self._get_request(string)
+
+    async def LoqSpeak(self, text, volume, rate, ai_name):
+        await self._get_request(actions.LoquendoSpeak(text, volume, rate, ai_name))
+
+    async def Get(self, var_name):
+        """ Gets a variable saved in UserVariables.xml ( see Client.Get ) """
+        if self._client.read_source == Client.READ_FILE:
+            values = await self._run(self._client._read_variables, [var_name])
+            return values[var_name]
+        return await self._get_request(actions.Get(var_name), retry=True)
+
+    async def Set(self, var_name, var_value):
+        """ Sets a variable in UserVariables.xml ( see Client.Set ) """
+        await self._get_request(actions.Set(var_name, var_value))
+
+    async def GetWord(self, wordlist, grammar, column):
+        """ Returns wordlist items by grammar (line) and column name ( see Client.GetWord ) """
+        return await self._get_request(actions.GetWord(wordlist, grammar, column), retry=True)
+
+    async def CallCommand(self, command):
+        """ Calls any non-dynamic command and returns the response from Links ( see Client.CallCommand ) """
+        return await self._get_request(actions.CallCommand(command))
+
+    async def GetGrammarList(self, data_type="XML"):
+        """ Returns a list of all callable commands ( see Client.GetGrammarList ) """
+        try:
+            status, body = await self._fetch(self._client._grammar_path(data_type), 'GetGrammarList', True)
+            return self._client._read_grammar_list(body)
+        except Exception as e:
+            print(e)
+            print("Exception in Get Grammar List function.")
+            return False
+
+    async def SayAs(self, before, data, content, after=""):
+        await self._get_request(actions.say_as(before, data, content, after))
+
+    async def SetSpeechVolume(self, vol):
+        await self._get_request(actions.SetSpeechVolume(vol))
+
+    async def SetSpeechVoice(self, name):
+        await self._get_request(actions.SetSpeechVoice(name))
+
+    async def SetSpeechConfig(self, name, vol, rate):
+        await self._get_request(actions.SetSpeechConfig(name, vol, rate))
+
+    async def SpeakEx(self, phrase, name, vol, rate, delay, sys_or_voice_vol="voice"):
+        await self._get_request(actions.SpeakEx(phrase, name, vol, rate, delay, sys_or_voice_vol))
+
+    async def StopVoiceByName(self, name, ResponseOnSuccess):
+        await self._get_request(actions.StopVoiceByName(name, ResponseOnSuccess))
+
+    async def StopVoiceByIdentifier(self, identifier, ResponseOnSuccess):
+        await self._get_request(actions.StopVoiceByIdentifier(identifier, ResponseOnSuccess))
+
+    async def SpeakExSysVolSync(self, phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName):
+        await self._get_request(actions.SpeakExSysVolSync(phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName))
+
+    async def SpeakExSysVolAsync(self, phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName):
+        await self._get_request(actions.SpeakExSysVolAsync(phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName))
+
+    async def listen(self, var_name='Pytron', freq=0.2):
+        """ Waits for a value in the UserVariables.xml file and returns it ( see Client.listen ).
+        Other tasks keep running while it waits.
+
+        :param var_name: Name of the Variable you want to "listen" to. OPTIONAL. Defaults to 'Pytron'
+        :param freq: Delay ( in seconds ) between checks where inotify isn't available. OPTIONAL
+        """
+        watcher = self._client._xml_watcher(freq)
+        waiting = None
+        try:
+            await self._run(self._client._clear_xml, var_name)
+            print("Listening..")
+            while True:
+                x = await self._run(self._client._get_xml, var_name)
+                if x:
+                    await self._run(self._client._clear_xml, var_name)
+                    return x
+                # The watcher blocks, so it waits in the executor. A second at a time, so a cancelled
+                # listen doesn't hold on to an executor thread for long.
+                waiting = asyncio.get_event_loop().run_in_executor(None, watcher.wait, 1.0)
+                await asyncio.shield(waiting)
+        except Exception as e:
+            print("Exception in listen function! Get under the desk quick!")
+            print(e)
+        finally:
+            if waiting is None or waiting.done():
+                watcher.close()
+            else:
+                waiting.add_done_callback(lambda f: watcher.close())
+
+    async def GetConfirmation(self, trigger_var='Answer', confirm=None, on_yes=None, on_no=None, timeout=10):
+        """ Asks for a yes/no answer and returns True or False ( see Client.GetConfirmation ) """
+        try:
+            if not trigger_var:
+                print("Need to select a trigger variable.")
+                return
+            if timeout > 60:
+                timeout = 60
+                print("Timeout set to max: 60 seconds.")
+            # Set up in the executor: clearing trigger_var rewrites UserVariables.xml
+            confirmation = await self._run(self._client.confirm_async, trigger_var, None, None, None, timeout)
+            answer = asyncio.get_event_loop().create_future()
+            self._chain(confirmation, answer)
+            if confirm:
+                await self.talk(confirm)
+            response = await answer
+            if response is True:
+                if on_yes:
+                    await self.talk(on_yes)
+                return True
+            elif response is False:
+                if on_no:
+                    await self.talk(on_no)
+                return False
+            print("Confirmation timed out")
+            return False
+        except Exception as e:
+            print(e)
+            return False
+
+    def confirm_async(self, trigger_var='Answer', confirm=None, on_yes=None, on_no=None, timeout=10):
+        """ Client.confirm_async as an asyncio future: await it for True, False or None ( timed out ).
+        Cancelling the future cancels the confirmation. The confirmation is set up in the executor, since
+        clearing trigger_var rewrites UserVariables.xml.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def started(task):
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                if not future.done():
+                    future.set_exception(task.exception())
+            else:
+                self._chain(task.result(), future)
+
+        loop.run_in_executor(None, self._client.confirm_async, trigger_var, confirm, on_yes, on_no,
+                             timeout).add_done_callback(started)
+        return future
+
+    def stats(self, reset=False):
+        """ Per-function call metrics ( see Client.stats ) """
+        return self._client.stats(reset)
+
+    def pool_stats(self):
+        """ Reports how the keep-alive connection pool is doing ( see Client.pool_stats ) """
+        return self._pool.stats()
+
+    def close(self):
+        """ Closes any idle connections to Links, then the wrapped Client ( see Client.close ). """
+        self._pool.close()
+        self._client.close()
+
+    async def _get_request(self, fcn, retry=False):
+        """ Non-blocking Client._get_request -private """
+        try:
+            name = self._client._function_name(fcn)
+            status, body = await self._fetch(self._client._action_path(fcn), name, retry)
+            result = self._client._read_response(status, body)
+            if result is False and self._client._metrics is not None:
+                self._client._metrics.error(name)
+            return result
+        except Exception as e:
+            print(e)
+            print("Exception in _get_request function. \n"
+                  "***Check your ip, port and key settings!*** \n"
+                  "Also, your shoes are untied..")
+            return False
+
+    async def _fetch(self, path, name='custom', retry=False):
+        """ Non-blocking Client._fetch: same timeout, retries and circuit breaker. Client.deadline() is
+        per thread and doesn't apply here, wrap calls in asyncio.wait_for instead -private
+        """
+        client = self._client
+        breaker = client._breaker
+        attempt = 0
+        while True:
+            if breaker is not None:
+                try:
+                    breaker.allow()
+                except CircuitOpenError:
+                    if client._metrics is not None:
+                        client._metrics.rejected(name)
+                    raise
+            try:
+                status, body = await self._send(path, name, client.timeout, retry)
+            except (OSError, EOFError, asyncio.TimeoutError):
+                if breaker is not None:
+                    breaker.failure()
+                if not retry or attempt >= client.retries:
+                    raise
+            else:
+                if status < 500:
+                    if breaker is not None:
+                        breaker.success()
+                    return status, to_text(body)
+                if breaker is not None:
+                    breaker.failure()
+                if not retry or attempt >= client.retries:
+                    return status, to_text(body)
+            await asyncio.sleep(backoff(attempt))
+            attempt += 1
+
+    async def _send(self, path, name, timeout, idempotent=False):
+        metrics = self._client._metrics
+        started = clock()
+        try:
+            status, body = await self._pool.request(self.ip, self.port, path, timeout, idempotent)
+        except Exception:
+            if metrics is not None:
+                metrics.record(name, clock() - started, len(path), 0, True)
+            raise
+        if metrics is not None:
+            metrics.record(name, clock() - started, len(path), len(body), status != 200)
+        return status, body
+
+    @staticmethod
+    def _chain(confirmation, future):
+        """ Resolves future with the confirmation's result, and cancels the confirmation along with
+        the future -private """
+        loop = asyncio.get_event_loop()
+
+        def resolve(result):
+            if not future.done():
+                future.set_result(result)
+
+        confirmation.add_done_callback(lambda c: loop.call_soon_threadsafe(resolve, c.result(0)))
+        future.add_done_callback(lambda f: f.cancelled() and confirmation.cancel())
+
+    @staticmethod
+    async def _run(fcn, *args):
+        """ Runs a blocking file helper in the default executor -private """
+        return await asyncio.get_event_loop().run_in_executor(None, fcn, *args)
@@ -0,0 +1,144 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Batched Actions
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Send many Links functions in one round trip.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+from . import actions
+from .compat import string_types
+
+
+class Batch(object):
+    """ Collects Links functions and sends them joined into as few requests as possible.
+        Results come back in the same order the calls were made.
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client()
+
+              with ai.batch() as b:
+                  b.Set("Mood", "happy")
+                  b.Set("Weather", "sunny")
+                  b.talk("Scene set!")
+              print(b.results)
+
+    """
+    # Plain text between two functions is echoed back by Links, so it can be used to split the response again.
+    SEPARATOR = '~|~'
+
+    def __init__(self, client, max_url_length=2048):
+        """ Use Client.batch() rather than creating one directly.
+
+        :param client: Client to send the batch through
+        :param max_url_length: Longest request path to send. Bigger batches are split automatically
+        """
+        self.client = client
+        self.max_url_length = max_url_length
+        self.results = []
+        self._actions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._actions = []
+
+    def __len__(self):
+        return len(self._actions)
+
+    def custom(self, string):
+        """ Queues any Links action string ( see Client.custom ) """
+        self._actions.append(string)
+        return self
+
+    def talk(self, text):
+        return self.custom(actions.Speak(text))
+
+    def emulate_speech(self, command):
+        return self.custom(actions.EmulateSpeech(command))
+
+    def Get(self, var_name):
+        return self.custom(actions.Get(var_name))
+
+    def Set(self, var_name, var_value):
+        return self.custom(actions.Set(var_name, var_value))
+
+    def GetWord(self, wordlist, grammar, column):
+        return self.custom(actions.GetWord(wordlist, grammar, column))
+
+    def CallCommand(self, command):
+        return self.custom(actions.CallCommand(command))
+
+    def SayAs(self, before, data, content, after=""):
+        return self.custom(actions.say_as(before, data, content, after))
+
+    def SetSpeechVolume(self, vol):
+        return self.custom(actions.SetSpeechVolume(vol))
+
+    def SetSpeechVoice(self, name):
+        return self.custom(actions.SetSpeechVoice(name))
+
+    def SetSpeechConfig(self, name, vol, rate):
+        return self.custom(actions.SetSpeechConfig(name, vol, rate))
+
+    def SpeakEx(self, phrase, name, vol, rate, delay, sys_or_voice_vol="voice"):
+        return self.custom(actions.SpeakEx(phrase, name, vol, rate, delay, sys_or_voice_vol))
+
+    def StopVoiceByName(self, name, ResponseOnSuccess):
+        return self.custom(actions.StopVoiceByName(name, ResponseOnSuccess))
+
+    def StopVoiceByIdentifier(self, identifier, ResponseOnSuccess):
+        return self.custom(actions.StopVoiceByIdentifier(identifier, ResponseOnSuccess))
+
+    def SpeakExSysVolSync(self, phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName):
+        return self.custom(actions.SpeakExSysVolSync(phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName))
+
+    def SpeakExSysVolAsync(self, phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName):
+        return self.custom(actions.SpeakExSysVolAsync(phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName))
+
+    def flush(self):
+        """ Sends everything queued so far and empties the batch.
+
+        :return: Returns a list with one result per queued call ( False for calls in a failed request )
+        """
+        pending, self._actions = self._actions, []
+        results = []
+        for chunk in self._chunks(pending):
+            action = self.SEPARATOR.join(chunk)
+            self.client._forget_sets(action)
+            response = self.client._get_request(action)
+            parts = response.split(self.SEPARATOR) if isinstance(response, string_types) else []
+            if len(parts) != len(chunk):
+                parts = [response] * len(chunk)
+            results.extend(parts)
+        self.results = results
+        return results
+
+    def _chunks(self, pending):
+        """ Splits actions into groups whose request path stays under max_url_length -private """
+        limit = self.max_url_length - len(self.client._action_path(''))
+        sep = len(actions.encode(self.SEPARATOR))
+        chunk = []
+        size = 0
+        for action in pending:
+            length = len(actions.encode(action))
+            if chunk and size + sep + length > limit:
+                yield chunk
+                chunk = []
+                size = 0
+            size += length + (sep if chunk else 0)
+            chunk.append(action)
+        if chunk:
+            yield chunk
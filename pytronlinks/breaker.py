@@ -0,0 +1,141 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Circuit Breaker
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Fails Links calls fast while Links is down instead of letting every caller wait on it.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import random
+import threading
+from time import time
+
+
+class CircuitOpenError(IOError):
+    """ Raised instead of sending a request while the circuit breaker is open """
+
+
+class CircuitBreaker(object):
+    """ Opens after failures calls in a row have failed. While open every call raises CircuitOpenError
+        straight away. With a probe function a background thread calls it every reset_timeout seconds
+        and closes the breaker once it returns True; without one a single trial call is let through
+        after reset_timeout ( half-open ) and its result decides.
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client(breaker=pytronlinks.CircuitBreaker(failures=3, reset_timeout=2))
+              print(ai.breaker.state)
+
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failures=5, reset_timeout=5.0, probe=None):
+        """
+        :param failures: Failures in a row that open the breaker
+        :param reset_timeout: Seconds between probes ( or before the half-open trial call )
+        :param probe: Callable returning True when Links answers again. OPTIONAL. Client sets its own
+        """
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self._state = self.CLOSED
+        self._failed = 0
+        self._opened_at = None
+        self._trial = False
+        self._prober = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {'opened': 0, 'rejected': 0, 'probes': 0}
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow(self):
+        """ Call before sending a request
+
+        :raises CircuitOpenError: While Links is considered down
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if (self._state == self.OPEN and self.probe is None and
+                    time() - self._opened_at >= self.reset_timeout):
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+            if self.probe is not None and self._prober is None:
+                self._start_probe()
+            self._stats['rejected'] += 1
+            raise CircuitOpenError('Links looks down, not sending requests for now ( circuit breaker open )')
+
+    def success(self):
+        with self._lock:
+            self._failed = 0
+            self._trial = False
+            self._state = self.CLOSED
+
+    def failure(self):
+        with self._lock:
+            self._failed += 1
+            self._trial = False
+            if self._state == self.HALF_OPEN or (self._state == self.CLOSED and self._failed >= self.failures):
+                self._open()
+
+    def stats(self):
+        """ Returns a dict with state, opened, rejected and probes """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['state'] = self._state
+            return stats
+
+    def close(self):
+        """ Stops the probe thread, if one is running. It starts again on the next call while open """
+        self._wake.set()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time()
+        self._stats['opened'] += 1
+        if self.probe is not None and self._prober is None:
+            self._start_probe()
+
+    def _start_probe(self):
+        self._wake.clear()
+        self._prober = threading.Thread(target=self._probe_loop, name='pytron-breaker')
+        self._prober.daemon = True
+        self._prober.start()
+
+    def _probe_loop(self):
+        while not self._wake.wait(self.reset_timeout):
+            with self._lock:
+                self._stats['probes'] += 1
+            try:
+                healthy = self.probe()
+            except Exception:
+                healthy = False
+            if healthy:
+                with self._lock:
+                    self._failed = 0
+                    self._state = self.CLOSED
+                    self._prober = None
+                return
+        with self._lock:
+            self._prober = None
+
+
+def backoff(attempt, base=0.05, cap=1.0):
+    """ Seconds to wait before retry number attempt ( from 0 ): a random time up to base * 2 ** attempt,
+    never more than cap ( "full jitter", so retrying callers don't all come back at once )
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,126 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Response Cache
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Bounded TTL / LRU cache for the results of read-style Links calls.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from time import time
+
+
+class ResponseCache(object):
+    """ Keeps results of Get, GetWord and CallCommand for a while so repeated calls don't go to Links.
+        Entries expire after the TTL of their function, and the least recently used ones are dropped
+        once there are more than maxsize entries or they take more than max_bytes.
+
+        CallCommand isn't cached by default since commands can do things. Give it a TTL to turn it on.
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client(cache=pytronlinks.ResponseCache(ttls={'GetWord': 300, 'CallCommand': 5}))
+              ai.GetWord("RSSFeeds", "CNN", "url")
+              ai.GetWord("RSSFeeds", "CNN", "url")    # Served from the cache
+              print(ai.cache_stats())
+
+    """
+    TTLS = {
+        'Get': 1.0,
+        'GetWord': 60.0,
+        'CallCommand': 0,
+    }
+
+    def __init__(self, ttls=None, maxsize=1024, max_bytes=1024 * 1024):
+        """
+        :param ttls: Dict of function name -> seconds, merged over ResponseCache.TTLS ( 0 turns caching off )
+        :param maxsize: Most entries to keep
+        :param max_bytes: Rough cap on the memory taken by keys and values
+        """
+        self.ttls = dict(self.TTLS)
+        self.ttls.update(ttls or {})
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, method, args):
+        """ Looks up a cached result.
+
+        :param method: Function name ( ie: 'GetWord' )
+        :param args: Tuple of the function arguments
+        :return: Returns a (found, value) tuple
+        """
+        key = (method, args)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] <= time():
+                if entry is not None:
+                    self._bytes -= entry[2]
+                self.misses += 1
+                return False, None
+            self._entries[key] = entry
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, method, args, value):
+        """ Stores a result, unless the function's TTL is 0 """
+        ttl = self.ttls.get(method, 0)
+        if not ttl:
+            return
+        key = (method, args)
+        size = _size(key, value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (time() + ttl, value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.maxsize or self._bytes > self.max_bytes):
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+                self.evictions += 1
+
+    def invalidate(self, method, args):
+        """ Drops one cached result """
+        with self._lock:
+            entry = self._entries.pop((method, args), None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def invalidate_variable(self, var_name):
+        """ Drops the cached Get of a variable. Called whenever the client sets or clears it. """
+        self.invalidate('Get', (var_name,))
+
+    def clear(self):
+        """ Drops everything """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """ Returns a dict with hits, misses, evictions, entries and bytes """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+def _size(key, value):
+    return sys.getsizeof(value) + sum(sys.getsizeof(a) for a in key[1]) + 128
@@ -13,12 +13,32 @@
     :license: BSD, see LICENSE for more details.
 """
 
+import collections
+import contextlib
 import os
+import re
+import socket
+import threading
 from time import sleep, time
-import datetime
-import xml.etree.ElementTree as ET
-import ast
-import urllib
+
+from . import actions
+from .batch import Batch
+from .breaker import CircuitBreaker, CircuitOpenError, backoff
+from .cache import ResponseCache
+from .compat import httplib, to_text
+from .confirm import ConfirmationWaiter
+from .dictation import DictationReader
+from .grammar import GrammarSnapshot, iter_grammars
+from .history import HistoryWriter, iter_history
+from .metrics import Metrics, clock
+from .phrases import PhraseIndex
+from .pool import ConnectionPool
+from .response import decode_json, decode_xml
+from .speech import SpeechQueue, chunk_text
+from .subscriptions import Dispatcher
+from .variables import VariableStore
+from .watcher import watch
+from .wordlists import WordlistReader
 
 
 class Client(object):
@@ -31,23 +51,41 @@ class Client(object):
                ai = pytronlinks.Client()
 
     """
+    READ_AUTO = 'auto'
+    READ_FILE = 'file'
+    READ_HTTP = 'http'
+    _LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+    _SET_PATTERN = re.compile(r'\[Set\(\s*"([^"]*)"')
+    _FUNCTION_PATTERN = re.compile(r'\[\s*([\w.]+)\s*\(')
     _APPDATA = None
     _SCRIPTS_PATH = None
     _XML_PATH = None
+    _WORDLISTS_PATH = None
     try:
             _APPDATA = os.getenv(r'APPDATA')
             _SCRIPTS_PATH = _APPDATA + r'\LINKS\Customization\Scripts'
             _XML_PATH = _APPDATA + r'\LINKS\Customization\XML'
+            _WORDLISTS_PATH = _APPDATA + r'\LINKS\Customization\Wordlists'
     except Exception as e:
-        print "Linux box probably.. Path not needed."
+        print("Linux box probably.. Path not needed.")
 
-    def __init__(self, path=None, port='54657', key='ABC1234', ip='localhost'):
+    def __init__(self, path=None, port='54657', key='ABC1234', ip='localhost', pool=None, cache=None,
+                 metrics=True, timeout=10.0, retries=2, breaker=True, read_mode=READ_AUTO):
         """ Initialize Client, either with custom parameters or the common default values
 
         :param port: Port that links is listening on
         :param key: Links web key
         :param ip: ip of computer with links
         :param path: Path to \LINKS\Customization\XML
+        :param pool: ConnectionPool to share between clients. OPTIONAL. Each client gets its own by default
+        :param cache: True or a ResponseCache to cache Get, GetWord and CallCommand results. OPTIONAL. Off by default
+        :param metrics: Metrics to record every call into, or False to turn them off. OPTIONAL. On by default
+        :param timeout: Seconds to wait on Links for any one request. OPTIONAL. Defaults to 10 ( None waits forever )
+        :param retries: Extra attempts for Get, GetWord and GetGrammarList when Links can't be reached. OPTIONAL
+        :param breaker: CircuitBreaker to share, or False to turn it off. OPTIONAL. Each client gets its own by default
+        :param read_mode: Where Get and get_many read variables: Client.READ_FILE ( UserVariables.xml ),
+                          Client.READ_HTTP ( ask Links ) or Client.READ_AUTO ( the file when Links runs on
+                          this machine and the file is there, else http ). OPTIONAL. See read_source
 
         :Example:
 
@@ -64,7 +102,29 @@ class Client(object):
         self.ip = ip
         self.port = port
         self.key = key
-
+        self._pool = pool if pool is not None else ConnectionPool()
+        self._watcher = None
+        self._variables = None
+        self._dispatcher = None
+        self._phrases = None
+        self._cache = ResponseCache() if cache is True else cache or None
+        self._wordlists = None
+        self._metrics = Metrics() if metrics is True else metrics or None
+        self._speech = None
+        self._history = None
+        self._dictation = None
+        self._confirmations = None
+        self._grammar_snapshot = None
+        self._pending_input = collections.deque()
+        self.timeout = timeout
+        self.retries = retries
+        self._deadlines = threading.local()
+        self._outcome = threading.local()
+        self._tail = (None, '')
+        self._breaker = CircuitBreaker() if breaker is True else breaker or None
+        self.read_mode = read_mode
+        if self._breaker is not None and self._breaker.probe is None:
+            self._breaker.probe = self._probe
 
     def talk(self, text):
         """ Speaks through Links
@@ -81,12 +141,116 @@ class Client(object):
 
         """
         try:
-            fcn = '[Speak("{}")]'.format(text)
+            fcn = actions.Speak(text)
             self._get_request(fcn)
         except Exception as e:
             print(e)
             return
 
+    def talk_async(self, text, priority=SpeechQueue.NORMAL, ttl=False, block=True, timeout=None):
+        """ Like talk, but queues the text and returns straight away. A background thread sends it to
+        Links. Queued LOW priority text is merged into one request, stale text is dropped and HIGH priority
+        text cuts off the current speech once a voice is set ( see Client.speech ).
+
+        :param text: String to be spoken
+        :param priority: SpeechQueue.LOW, SpeechQueue.NORMAL or SpeechQueue.HIGH. OPTIONAL
+        :param ttl: Seconds the text may wait before it is dropped. OPTIONAL. Defaults to SpeechQueue.TTL
+        :param block: Wait for room when the queue is full. OPTIONAL
+        :param timeout: Longest wait for room, in seconds. OPTIONAL
+        :return: Returns True if queued, False if there was no room
+
+        :Example:
+
+            import pytronlinks
+            from pytronlinks import SpeechQueue
+
+
+            ai = pytronlinks.Client()
+            ai.speech.voice = "IVONA Brian"
+
+            ai.talk_async("New mail from Bob", priority=SpeechQueue.LOW)
+            ai.talk_async("New mail from Alice", priority=SpeechQueue.LOW)   # Both said in one request
+            ai.talk_async("The oven is on fire!", priority=SpeechQueue.HIGH)
+            ai.speech.join()
+
+        """
+        return self.speech.put(text, priority, ttl, block, timeout)
+
+    def talk_stream(self, text, max_chars=300, sanitize=True):
+        """ Speaks long text a sentence at a time, so Links starts talking after the first sentence
+        instead of after the whole document, and no request gets too long for a url. Chunking and
+        cleanup run lazily, each chunk is sent as soon as it is ready.
+
+        :param text: A string, or an iterable of strings ( ie: paragraphs of an RSS article as they come in )
+        :param max_chars: Longest text sent in one [Speak]. OPTIONAL
+        :param sanitize: Run each chunk through strip_non_ascii and strip_bad_chars. OPTIONAL
+        :return: Returns the number of chunks spoken
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+            ai.talk_stream(open('article.txt'))
+
+        """
+        chunks = chunk_text(text, max_chars)
+        if sanitize:
+            chunks = (self.strip_bad_chars(self.strip_non_ascii(chunk)) for chunk in chunks)
+        spoken = 0
+        try:
+            for chunk in chunks:
+                if chunk.strip():
+                    self._get_request(actions.Speak(chunk))
+                    spoken += 1
+        except Exception as e:
+            print(e)
+            print("Exception in talk_stream function")
+        return spoken
+
+    @property
+    def speech(self):
+        """ SpeechQueue behind talk_async(). Set speech.voice ( or speech.identifier ) to let HIGH priority
+        text stop the current speech, and use speech.join() to wait until everything has been sent.
+        """
+        if self._speech is None:
+            self._speech = SpeechQueue(self)
+        return self._speech
+
+    @property
+    def history_writer(self):
+        """ HistoryWriter that logs dictation to history.txt in the Links Scripts folder. Set its max_bytes,
+        daily, compress and backups to change how the file is rotated.
+        """
+        if self._history is None:
+            self._history = HistoryWriter(self._SCRIPTS_PATH + r'\history.txt')
+        return self._history
+
+    def history(self, since=None, until=None, contains=None):
+        """ Yields past dictation from history.txt ( and its rotated segments ) as HistoryEntry records,
+        oldest first. The files are memory-mapped and binary searched on their timestamps, so a narrow
+        range of a huge history only reads the lines in that range.
+
+        :param since: datetime, time() seconds or 'YYYY-mm-dd[ HH:MM:SS]' text ( inclusive ). OPTIONAL
+        :param until: Same, exclusive. OPTIONAL
+        :param contains: Only entries with this text in them ( case insensitive ). OPTIONAL
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            for entry in ai.history(since='2016-11-01', contains='lights'):
+                print(entry.time, entry.text)
+
+        """
+        if self._history is not None:
+            self._history.flush()
+        return iter_history(self._SCRIPTS_PATH + r'\history.txt', since, until, contains)
+
     def emulate_speech(self, command):
         """ Sends an Emulate Speech Command -
 
@@ -107,7 +271,7 @@ class Client(object):
 
         """
         try:
-            fcn = '[EmulateSpeech("{}")]'.format(command)
+            fcn = actions.EmulateSpeech(command)
             self._get_request(fcn)
         except (TypeError, IOError, Exception):
             print("Exception in EmulateSpeech function")
@@ -131,6 +295,7 @@ class Client(object):
             ai.custom(r'[Set("Last Subject", "pytron is the coolest")]')
             ai.custom(r'[Speak("[Get("Last Subject")]")]')
         """
+        self._forget_sets(string)
         self._get_request(string)
         return
 
@@ -153,31 +318,76 @@ class Client(object):
                 print("Timeout set to max: 60 seconds.")
             if confirm:
                 self.talk(confirm)
-            for i in range(1, timeout):
-                response = self._get_xml(trigger_var)
-                if response == 'yes':
-                    if on_yes:
-                        self.talk(on_yes)
-                    return True
-                elif response == 'no':
-                    if on_no:
-                        self.talk(on_no)
-                    return False
-                else:
-                    sleep(1)
-                    # continue
+            deadline = time() + timeout
+            with self._xml_watcher() as watcher:
+                while True:
+                    response = self._get_xml(trigger_var)
+                    if response == 'yes':
+                        if on_yes:
+                            self.talk(on_yes)
+                        return True
+                    elif response == 'no':
+                        if on_no:
+                            self.talk(on_no)
+                        return False
+                    remaining = deadline - time()
+                    if remaining <= 0:
+                        break
+                    watcher.wait(remaining)
             print("Confirmation timed out")
             return False
         except Exception as e:
             print(e)
             return False
 
+    def confirm_async(self, trigger_var='Answer', confirm=None, on_yes=None, on_no=None, timeout=10):
+        """ Like GetConfirmation, but returns a Confirmation straight away instead of blocking. Its
+        result() is True for 'yes', False for 'no' and None after timeout seconds without an answer.
+        Every pending confirmation is checked by one background thread that wakes as soon as
+        UserVariables.xml changes, so several dialogs can run at once on different trigger variables.
+        confirm, on_yes and on_no are spoken with talk_async.
+
+        :param trigger_var: Variable Links sets to 'yes' or 'no'. Cleared before asking and after the answer
+        :param confirm: Question to speak. OPTIONAL
+        :param on_yes: Spoken when the answer is yes. OPTIONAL
+        :param on_no: Spoken when the answer is no. OPTIONAL
+        :param timeout: Seconds to wait for an answer. OPTIONAL
+        :return: Returns a Confirmation
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            lights = ai.confirm_async('LightsAnswer', confirm="Turn off the lights?")
+            oven = ai.confirm_async('OvenAnswer', confirm="Is the oven off?", on_no="Go check!")
+
+            if lights.result():
+                ai.emulate_speech("lights off")
+            print(oven.result())
+
+        """
+        confirmation = self._confirmation_waiter().add(trigger_var, timeout)
+        if confirm:
+            self.talk_async(confirm)
+        if on_yes or on_no:
+            def answered(c):
+                text = on_yes if c.result(0) is True else on_no if c.result(0) is False else None
+                if text:
+                    self.talk_async(text)
+            confirmation.add_done_callback(answered)
+        return confirmation
+
     # Checks for any value in the UserVariables.xml file and returns it input when found. ( BLOCKING )
     def listen(self, var_name='Pytron', freq=0.2):
         """ Check out the example to see how you could use this. This is probably the most powerful feature.
 
         :param var_name: Name of the Variable you want to "listen" to. OPTIONAL. Defaults to 'Pytron'
         :param freq: Delay ( in seconds ) between checks. OPTIONAL. Defaults to 0.2 seconds
+                     Only used where inotify isn't available, otherwise listen wakes up as soon as Links
+                     writes the file
 
 
 
@@ -223,19 +433,101 @@ class Client(object):
         """
         try:
             self._clear_xml(var_name)
-            print("Listening..")
-            while True:
-                x = self._get_xml(var_name)
-                if x:
-                    answer = x
-                    self._clear_xml(var_name)
-                    return answer
-                else:
-                    sleep(freq)
+            with self._xml_watcher(freq) as watcher:
+                print("Listening..")
+                while True:
+                    x = self._get_xml(var_name)
+                    if x:
+                        answer = x
+                        self._clear_xml(var_name)
+                        return answer
+                    else:
+                        watcher.wait()
         except Exception as e:
             print("Exception in listen function! Get under the desk quick!")
             print(e)
 
+    def subscribe(self, callbacks):
+        """ Listen to many variables with one loop. Each callback gets the new value of its variable,
+        and the value is cleared afterwards just like listen() does. Call run_forever() to start.
+
+        :param callbacks: Dict of variable name -> callback( value )
+
+        :Example:
+
+            import pytronlinks
+
+            ai = pytronlinks.Client()
+
+            ai.subscribe({
+                'Pytron': ai.talk,
+                'Lights': lambda value: ai.emulate_speech('lights ' + value),
+            })
+            try:
+                ai.run_forever()
+            except KeyboardInterrupt:
+                pass
+        """
+        self._subscriptions().subscribe(callbacks)
+
+    def unsubscribe(self, *names):
+        """ Stops dispatching the given variables
+
+        :param names: Variable names passed to subscribe()
+        """
+        self._subscriptions().unsubscribe(names)
+
+    def run_forever(self, freq=0.2):
+        """ Dispatches subscribed variables until stop() is called ( BLOCKING )
+
+        :param freq: Delay ( in seconds ) between checks where inotify isn't available
+        """
+        try:
+            self._subscriptions().watcher.interval = freq
+            print("Listening..")
+            self._subscriptions().run_forever()
+        except Exception as e:
+            print("Exception in run_forever function!")
+            print(e)
+
+    def dictation(self, timeout=None, freq=0.2):
+        """ Yields every line Links appends to dictation.txt in the Scripts folder, as it is written
+        ( BLOCKING ). The file is followed like tail -F from where the last read stopped, so lines
+        written in quick succession are all read once and the file is never truncated. Where that is
+        is kept in dictation.pos next to it, so lines written while no client was reading are read
+        on the next start. Each line is logged to history.txt as well.
+
+        :param timeout: Stop after this many seconds without dictation. OPTIONAL. Runs until stop()
+        :param freq: Delay ( in seconds ) between checks where inotify isn't available. OPTIONAL
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            for text in ai.dictation():
+                ai.talk("You said " + text)
+
+        """
+        reader = self._dictation_reader()
+        reader.interval = freq
+        while self._pending_input:
+            line = self._pending_input.popleft()
+            self._write_history(line)
+            yield line
+        for line in reader.follow(timeout):
+            self._write_history(line)
+            yield line
+
+    def stop(self):
+        """ Makes run_forever() and dictation() return ( it may take up to a second ) """
+        if self._dispatcher is not None:
+            self._dispatcher.stop()
+        if self._dictation is not None:
+            self._dictation.stop()
+
     def config(self):
         """ Config itself doesn't work yet and for now just prints this handy - Volume and Rate Cheat-Sheet -
 
@@ -275,7 +567,7 @@ class Client(object):
         :param ai_name: Name of tts Voice ( case sensitive )
         """
         try:
-            fcn = '[LLoquendo.Speech.Speak("{}", "{}", "{}", "{}")]'.format(text, volume, rate, ai_name)
+            fcn = actions.LoquendoSpeak(text, volume, rate, ai_name)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -285,30 +577,83 @@ class Client(object):
             return
 
     def Get(self, var_name):
-        """ Gets a variable saved in the '\\LINKS\\Customization\\XML\\UserVariables.xml' file.
+        """ Gets a variable saved in the '\\LINKS\\Customization\\XML\\UserVariables.xml' file, from the file itself
+        or from Links ( see read_mode ).
 
         :param var_name: Name of variable to get the value of
         :return: Returns the value of the variable
         """
         try:
-            fcn = '[Get("{}")]'.format(var_name)
-            self._get_request(fcn)
-            if self._XML_PATH:
-                return self._get_xml(var_name)
+            return self._cached('Get', (var_name,), self._get, var_name)
         except Exception as e:
             print(e)
             print("Exception in Get function."
                   "Gonna need coffee for this one.")
             return
 
+    def get_many(self, var_names):
+        """ Gets several variables with one read of UserVariables.xml or one request to Links ( see read_source )
+
+        :param var_names: Names of the variables
+        :return: Returns a dict of name -> value
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+            print(ai.get_many(['Mood', 'Weather', 'Last Subject']))
+
+        """
+        try:
+            values = {}
+            missing = []
+            for var_name in var_names:
+                found, value = (False, None) if self._cache is None else self._cache.get('Get', (var_name,))
+                if found:
+                    values[var_name] = value
+                else:
+                    missing.append(var_name)
+            if missing:
+                if self.read_source == self.READ_FILE:
+                    fetched = self._read_variables(missing)
+                else:
+                    batch = Batch(self)
+                    for var_name in missing:
+                        batch.Get(var_name)
+                    fetched = dict(zip(missing, batch.flush()))
+                for var_name, value in fetched.items():
+                    if self._cache is not None and value is not False and value is not None:
+                        self._cache.put('Get', (var_name,), value)
+                values.update(fetched)
+            return values
+        except Exception as e:
+            print(e)
+            print("Exception in get_many function")
+            return {}
+
+    @property
+    def read_source(self):
+        """ Where the next Get or get_many reads from, Client.READ_FILE or Client.READ_HTTP ( see read_mode ).
+        File reads show up in stats() as 'Get.file', http ones as 'Get'.
+        """
+        if self.read_mode != self.READ_AUTO:
+            return self.read_mode
+        if self._XML_PATH and self.ip in self._LOCAL_HOSTS and os.path.exists(self._xml_file()):
+            return self.READ_FILE
+        return self.READ_HTTP
+
     def Set(self, var_name, var_value):
-        """ Sets a variable in the '\LINKS\Customization\XML\UserVariables.xml' file.
+        """ Sets a variable in the '\\LINKS\\Customization\\XML\\UserVariables.xml' file.
 
         :param var_name: Name of variable
         :param var_value: Value to set
         """
         try:
-            fcn = '[Set("{}", "{}")]'.format(var_name, var_value)
+            if self._cache is not None:
+                self._cache.invalidate_variable(var_name)
+            fcn = actions.Set(var_name, var_value)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -316,7 +661,8 @@ class Client(object):
             return
 
     def GetWord(self, wordlist, grammar, column):
-        """ Returns wordlist items by grammar (line) and column name
+        """ Returns wordlist items by grammar (line) and column name. The wordlist file is read directly
+        when it can be found under the Links Customization folder, otherwise Links is asked over http.
 
         :param wordlist: File name of wordlist ( file type not needed )
         :param grammar: Basically the line index. ( ie: first column )
@@ -324,8 +670,7 @@ class Client(object):
         :return: Returns True or False
         """
         try:
-            fcn = '[GetWord("{}", "{}", "{}")]'.format(wordlist, grammar, column)
-            x = self._get_request(fcn)
+            x = self._cached('GetWord', (wordlist, grammar, column), self._get_word, wordlist, grammar, column)
             return x
         except Exception as e:
             print(e)
@@ -339,8 +684,8 @@ class Client(object):
 
         """
         try:
-            fcn = '[CallCommand("{}")]'.format(command)
-            result = self._get_request(fcn)
+            fcn = actions.CallCommand(command)
+            result = self._cached('CallCommand', (command,), self._get_request, fcn)
             return result
         except Exception as e:
             print(e)
@@ -356,67 +701,103 @@ class Client(object):
         :return:
         """
         try:
-            ip = self.ip
-            port = self.port
-            key = self.key
-            d_type = data_type
-
-            action = '?action=[GetGrammarList("{}")]'.format(d_type).upper()
-            output = '&output={}'.format(d_type).lower()
-            request = '&request=disable_recurse'
-            url = 'http://{}:{}/{}{}{}&key={}'.format(ip, port, action, output, request, key)
-
-            r = urllib.urlopen(url)
-            x = list(r.readlines())
-            root_ = ET.fromstringlist(x[4:])
-            response = root_.find('response')
-            xml = self.strip_non_ascii(response.text)
-            gram = ET.fromstring(xml.encode('utf-16-be'))
-            grammars = gram.findall('grammar')
-            return_list = []
-
-            for i in grammars:
-                section = i.find('Name')
-                commands = i.findall('Commands')
-                enabled = i.find('Enabled')
-                loaded = i.find('Loaded')
-                DebugShowPhrases = i.find('DebugShowPhrases')
-                priority = i.find('Priority')
-                name = section.text
-                name_len = len(name)
-                underscore = "=" * name_len
-
-                if str(enabled.text) == 'true':
-                    enabled = "Enabled"
-                    # print enabled
-                else:
-                    enabled = "Disabled"
-                    # print enabled
-
-                if str(loaded.text) == 'true':
-                    loaded = "Loaded"
-                    # print loaded
-                else:
-                    loaded = "Not loaded"
-                    # print loaded
-                enabled = "*" + enabled + "*"
-                loaded = "*" + loaded + "*"
-                return_list.append(name)
-                return_list.append(underscore)
-                return_list.append(enabled)
-                return_list.append(loaded)
-                return_list.append('\n')
-                for each in commands:
-                    return_list.append(each.text)
-
-                return_list.append('\n \n')
-
-            return return_list
+            status, body = self._fetch(self._grammar_path(data_type), 'GetGrammarList', True)
+            return self._read_grammar_list(body)
         except Exception as e:
             print(e)
             print("Exception in Get Grammar List function.")
             return False
 
+    def iter_grammars(self, data_type="XML"):
+        """ Like GetGrammarList, but yields one Grammar record at a time instead of a list of display
+        strings. Each Grammar has name, enabled, loaded, priority, debug_show_phrases and commands.
+
+        :param data_type: OPTIONAL. Defaults to "XML"
+        :return: Returns a generator of Grammar objects ( empty if Links couldn't be reached )
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            for grammar in ai.iter_grammars():
+                if grammar.enabled:
+                    print(grammar.name, len(grammar.commands))
+
+        """
+        try:
+            status, body = self._fetch(self._grammar_path(data_type), 'GetGrammarList', True)
+            xml = self.strip_non_ascii(decode_xml(body).response)
+        except Exception as e:
+            print(e)
+            print("Exception in iter_grammars function.")
+            return iter(())
+        return iter_grammars(xml)
+
+    def phrase_index(self, refresh=False):
+        """ Returns a PhraseIndex over every command phrase, built from iter_grammars on first use.
+        Use it to find which grammar and command will handle a phrase before calling
+        emulate_speech or CallCommand.
+
+        :param refresh: Fetch the grammars from Links again and rebuild the index. OPTIONAL
+        :return: Returns a PhraseIndex
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            matches = ai.phrase_index().lookup("what time is it")
+            if any(match.active for match in matches):
+                print(ai.CallCommand("what time is it"))
+
+        """
+        if self._phrases is None:
+            self._phrases = PhraseIndex(self.iter_grammars())
+        elif refresh:
+            self._phrases.refresh(self.iter_grammars())
+        return self._phrases
+
+    def grammar_changes(self, export=True):
+        """ Fetches the grammar list and returns what changed since the last call as a GrammarDelta
+        ( everything counts as added the first time ). An unchanged list is recognised by its hash without
+        being parsed, and with export command_list.txt is only rewritten from the first grammar that changed.
+        Cheap enough to poll.
+
+        :param export: Keep command_list.txt in the Scripts folder up to date. OPTIONAL
+        :return: Returns a GrammarDelta, or None if Links couldn't be reached
+
+        :Example:
+
+            import time
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            while True:
+                delta = ai.grammar_changes()
+                if delta:
+                    print(delta.added, delta.removed, delta.enabled, delta.disabled)
+                time.sleep(30)
+
+        """
+        try:
+            if self._grammar_snapshot is None:
+                self._grammar_snapshot = GrammarSnapshot(
+                    decode=lambda body: self.strip_non_ascii(decode_xml(body).response))
+            snapshot = self._grammar_snapshot
+            snapshot.path = self._SCRIPTS_PATH + r'\command_list.txt' if export and self._SCRIPTS_PATH else None
+            status, body = self._fetch(self._grammar_path(), 'GetGrammarList', True)
+            return snapshot.update(body)
+        except Exception as e:
+            print(e)
+            print("Exception in grammar_changes function.")
+            return None
 
     def SayAs(self, before, data, content, after=""):
         """ This function is only for speech. Will speak the appropriate way for the given data type. ( See example )
@@ -431,7 +812,7 @@ class Client(object):
             ai.SayAs(r"The phone number is","18001239874","Telephone","how cool is that?")
         """
         try:
-            fcn = '[Speak("{} [SayAs("{}","{}")]. {}")]'.format(before, data, content, after)
+            fcn = actions.say_as(before, data, content, after)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -444,7 +825,7 @@ class Client(object):
         :param vol: 0 - 100
         """
         try:
-            fcn = '[SetSpeechVolume("{}")]'.format(vol)
+            fcn = actions.SetSpeechVolume(vol)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -457,7 +838,7 @@ class Client(object):
         :param name: Name of tts speaker ( ex: IVONA Brian ) case sensitive
         """
         try:
-            fcn = '[SetSpeechVoice("{}")]'.format(name)
+            fcn = actions.SetSpeechVoice(name)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -472,7 +853,7 @@ class Client(object):
         :param rate: Speech rate -10 - 10
         """
         try:
-            fcn = '[SetSpeechConfig("{}", "{}", "{}")]'.format(name, vol, rate)
+            fcn = actions.SetSpeechConfig(name, vol, rate)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -490,8 +871,7 @@ class Client(object):
         :param sys_or_voice_vol: Use system wide volume or ai' set volume
         """
         try:
-            fcn = '[SpeakEx("{}", "{}", "{}", "{}", "{}", "{}")]'.format(phrase, name, vol, rate,
-                                                                         delay, sys_or_voice_vol)
+            fcn = actions.SpeakEx(phrase, name, vol, rate, delay, sys_or_voice_vol)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -505,7 +885,7 @@ class Client(object):
         :param ResponseOnSuccess: What the ai says after being silenced
         """
         try:
-            fcn = '[StopVoiceByName("{}", "{}")]'.format(name, ResponseOnSuccess)
+            fcn = actions.StopVoiceByName(name, ResponseOnSuccess)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -519,7 +899,7 @@ class Client(object):
         :param ResponseOnSuccess: AIs response
         """
         try:
-            fcn = '[StopVoiceByIdentifier("{}", "{}")]'.format(identifier, ResponseOnSuccess)
+            fcn = actions.StopVoiceByIdentifier(identifier, ResponseOnSuccess)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -536,8 +916,7 @@ class Client(object):
         :param VoiceName: Ai name ( case sensitive )
         """
         try:
-            fcn = '[SpeakExSysVolSync("{}", "{}", "{}", "{}", "{}")]'.format(phrase, VoiceVolume, VoiceRate,
-                                                                     phraseDelay, VoiceName)
+            fcn = actions.SpeakExSysVolSync(phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName)
             self._get_request(fcn)
         except Exception as e:
             print(e)
@@ -554,14 +933,139 @@ class Client(object):
         :param VoiceName: Ai name ( case sensitive )
         """
         try:
-            fcn = '[SpeakExSysVolAsync("{}", "{}", "{}", "{}", "{}")]'.format(phrase, VoiceVolume, VoiceRate,
-                                                                              phraseDelay, VoiceName)
+            fcn = actions.SpeakExSysVolAsync(phrase, VoiceVolume, VoiceRate, phraseDelay, VoiceName)
             self._get_request(fcn)
         except Exception as e:
             print(e)
             print("Exception in SpeakExSysVolAsync function")
             return
 
+    def batch(self, max_url_length=2048):
+        """ Queue up several Links functions and send them in one round trip. Anything queued inside
+        the with block is sent when it exits. Batches too long for one url are split automatically.
+
+        :param max_url_length: Longest request to send in one go. OPTIONAL. Defaults to 2048
+        :return: Returns a Batch with the same function names as Client ( talk, Set, SpeakEx, custom.. )
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+
+            with ai.batch() as b:
+                b.Set("Mood", "happy")
+                b.Set("Weather", "sunny")
+                b.Set("Time", "noon")
+                b.talk("Scene set!")
+            print(b.results)
+
+        """
+        return Batch(self, max_url_length)
+
+    def cache_stats(self):
+        """ Reports hits, misses, evictions, entries and bytes of the response cache
+
+        :return: Returns a dict, or None when the client was made without a cache
+        """
+        if self._cache is not None:
+            return self._cache.stats()
+
+    def stats(self, reset=False):
+        """ Reports calls, errors, bytes_out, bytes_in and mean/p50/p95/p99/max latency ( seconds ) for
+        every Links function called so far, plus 'xml.parse' and 'xml.write' for UserVariables.xml.
+        Calls the circuit breaker turned away without sending are counted as open_rejections
+
+        :param reset: Start counting from zero again afterwards. OPTIONAL
+        :return: Returns a dict of name -> dict, or None when the client was made with metrics=False
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+            ai.talk("one")
+            print(ai.stats()['Speak'])
+
+        """
+        if self._metrics is not None:
+            return self._metrics.stats(reset)
+
+    @contextlib.contextmanager
+    def deadline(self, seconds):
+        """ Every Links call made inside the with block ( on this thread ) has to finish within seconds,
+        retries included. Calls still waiting when time runs out fail like any other call that can't
+        reach Links. Blocks can be nested, the sooner deadline wins.
+
+        :param seconds: Time budget for the whole block
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+            with ai.deadline(0.5):
+                mood = ai.Get("Mood")
+                ai.talk("You seem {}".format(mood))
+
+        """
+        stack = getattr(self._deadlines, 'stack', None)
+        if stack is None:
+            stack = self._deadlines.stack = []
+        stack.append(time() + seconds)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @property
+    def breaker(self):
+        """ The CircuitBreaker in front of every request ( None when turned off ) """
+        return self._breaker
+
+    def pool_stats(self):
+        """ Reports how the keep-alive connection pool is doing
+
+        :return: Returns a dict of counters ( requests, created, reused, reconnects, discarded, idle )
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+            ai.talk("one")
+            ai.talk("two")
+            print(ai.pool_stats())
+
+        """
+        return self._pool.stats()
+
+    def close(self):
+        """ Closes any idle connections to Links, stops watching UserVariables.xml, forgets any
+        wordlists, stops the speech queue ( dropping what it hasn't sent ), cancels pending confirm_async()
+        calls, closes dictation.txt and flushes history.txt. Everything is opened again on the next call. """
+        if self._speech is not None:
+            self._speech.close()
+            self._speech = None
+        self._pool.close()
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        if self._wordlists is not None:
+            self._wordlists.close()
+        if self._breaker is not None:
+            self._breaker.close()
+        if self._dictation is not None:
+            self._dictation.close()
+        if self._confirmations is not None:
+            self._confirmations.close()
+        if self._history is not None:
+            self._history.close()
+
     def _get_xml(self, var_name='Pytron'):
         """ Checks xml file for incoming commands sent from links using the [Set("var", "value")] function
         and returns them.
@@ -571,99 +1075,169 @@ class Client(object):
         """
         try:
             self.variable = var_name
-            _path = self._XML_PATH + r'\UserVariables.xml'
-            tree = ET.parse(_path)
-            root = tree.getroot()
-            response = False
-            for variable in root.findall('Variable'):
-                n = variable.find('Name').text
-                if n == var_name:
-                    v = variable.find('Value')
-                    t = v.text
-                    response = t
-                    break
-            return response
+            return self.variables.get(var_name)
         except Exception as e:
             print("Exception in _get_xml function")
             print(e)
             return
 
     def _clear_xml(self, var_name='Pytron'):
-        """ Clears xml value with pythons standard xml library ET
+        """ Clears xml value with pythons standard xml library ET ( see VariableStore.clear_many )
 
         :param var_name: Variable name in xml file
         """
         try:
-            _path = self._XML_PATH + r'\UserVariables.xml'
-            tree = ET.parse(_path)
-            root = tree.getroot()
-            for variable in root.findall('Variable'):
-                n = variable.find('Name').text
-                if n == var_name:
-                    v = variable.find('Value')
-                    v.clear()
-                    break
-            tree.write(_path)
+            self.variables.clear_many([var_name])
             return
         except Exception as e:
             print("Exception in _clear_xml function")
             print(e)
             return
 
-    def _check_for_input(self):
-        """ Check dictation file for changes """
-        with open(self._SCRIPTS_PATH + "\dictation.txt", 'r') as f:
-            for line in f:
-                dictation = line
-                f.close()
-                if dictation:
-                    self._write_history(dictation)
-                    self._clear_input()
-                    return dictation
-                else:
-                    return False
+    @property
+    def variables(self):
+        """ VariableStore for UserVariables.xml. The file is only parsed again after it changes.
+
+        :Example:
+
+            import pytronlinks
 
-    def _clear_input(self):
-        """ Deletes any entries in dictation file. Also used to create new file on init. -private """
-        with open(self._SCRIPTS_PATH + '\dictation.txt', 'w+') as f:
-            f.close()
 
-    def _get_request(self, fcn):
+            ai = pytronlinks.Client()
+            print(ai.variables.get_many(['Pytron', 'Answer']))
+
+        """
+        if self._variables is None:
+            self._variables = VariableStore(self._xml_file(), self._metrics, self._forget_variables)
+        return self._variables
+
+    @property
+    def wordlists(self):
+        """ WordlistReader over the Links wordlist folder, for local GetWord lookups and whole-column scans.
+
+        :Example:
+
+            import pytronlinks
+
+
+            ai = pytronlinks.Client()
+            for url in ai.wordlists.column("RSSFeeds", "url"):
+                print(url)
+
+        """
+        if self._wordlists is None:
+            self._wordlists = WordlistReader(self._WORDLISTS_PATH)
+        return self._wordlists
+
+    def _subscriptions(self):
+        """ Returns the Dispatcher behind subscribe(), creating it ( and its watcher ) on first use -private """
+        if self._watcher is None:
+            self._watcher = self._xml_watcher()
+            if self._dispatcher is not None:
+                self._dispatcher.watcher = self._watcher
+        if self._dispatcher is None:
+            self._dispatcher = Dispatcher(self.variables, self._watcher)
+        return self._dispatcher
+
+    def _get(self, var_name):
+        """ Uncached part of Get: one read of UserVariables.xml or one request, never both -private """
+        if self.read_source == self.READ_FILE:
+            return self._read_variables([var_name])[var_name]
+        return self._get_request(actions.Get(var_name), retry=True)
+
+    def _read_variables(self, var_names):
+        """ Variables from UserVariables.xml, timed as 'Get.file' -private """
+        if self._metrics is None:
+            return self.variables.get_many(var_names)
+        with self._metrics.timer('Get.file'):
+            return self.variables.get_many(var_names)
+
+    def _get_word(self, wordlist, grammar, column):
+        """ Uncached part of GetWord. Tries the local wordlist file before http when Links runs here -private """
+        if self._WORDLISTS_PATH and self.ip in self._LOCAL_HOSTS:
+            try:
+                word = self.wordlists.get(wordlist, grammar, column)
+                if word is not None:
+                    return word
+            except (IOError, OSError, ValueError):
+                pass
+        fcn = actions.GetWord(wordlist, grammar, column)
+        return self._get_request(fcn, retry=True)
+
+    def _forget_sets(self, action):
+        """ Drops cached Gets of every variable an action string Sets -private """
+        if self._cache is not None:
+            for var_name in self._SET_PATTERN.findall(action):
+                self._cache.invalidate_variable(var_name)
+
+    def _forget_variables(self, var_names):
+        """ Drops cached Gets of variables written to UserVariables.xml ( VariableStore.on_write ) -private """
+        if self._cache is not None:
+            for var_name in var_names:
+                self._cache.invalidate_variable(var_name)
+
+    def _cached(self, method, args, fcn, *fcn_args):
+        """ Returns the cached result of method(args) or calls fcn(*fcn_args) and caches it -private """
+        if self._cache is None:
+            return fcn(*fcn_args)
+        found, value = self._cache.get(method, args)
+        if found:
+            return value
+        value = fcn(*fcn_args)
+        if value is not False and value is not None:
+            self._cache.put(method, args, value)
+        return value
+
+    def _xml_file(self):
+        """ Path to the UserVariables.xml file -private """
+        return self._XML_PATH + r'\UserVariables.xml'
+
+    def _xml_watcher(self, freq=0.2):
+        """ Returns a new watcher for UserVariables.xml -private
+
+        A change wakes each watcher once, so everything that waits ( listen, GetConfirmation, the
+        subscribe() dispatcher, confirm_async() ) needs its own. Close it when done waiting.
+
+        :param freq: Delay ( in seconds ) between checks when the watcher has to poll
+        """
+        return watch(self._xml_file(), freq)
+
+    def _confirmation_waiter(self):
+        """ Returns the ConfirmationWaiter behind confirm_async(), creating it on first use -private """
+        if self._confirmations is None:
+            self._confirmations = ConfirmationWaiter(self.variables, self._xml_file())
+        return self._confirmations
+
+    def _check_for_input(self):
+        """ Returns the next new line of the dictation file, or False if there is none ( see dictation() ) """
+        if not self._pending_input:
+            self._pending_input.extend(self._dictation_reader().read())
+        if not self._pending_input:
+            return False
+        dictation = self._pending_input.popleft()
+        self._write_history(dictation)
+        return dictation
+
+    def _dictation_reader(self):
+        """ Returns the DictationReader for dictation.txt, creating it on first use -private """
+        if self._dictation is None:
+            self._dictation = DictationReader(self._SCRIPTS_PATH + r'\dictation.txt',
+                                              position_file=self._SCRIPTS_PATH + r'\dictation.pos')
+        return self._dictation
+
+    def _get_request(self, fcn, retry=False):
         """ Speak to Links with a get request using urllib
 
         :param fcn: The function call for Links ( must be a valid links function )
+        :param retry: Safe to send again if Links can't be reached ( reads only ). OPTIONAL
         """
         try:
-            ip = self.ip
-            port = self.port
-            key = self.key
-            url = 'http://{}:{}/?action={}&key={}&output=json'.format(ip, port, fcn, key)
-#            r = requests.get(url)
-            r = urllib.urlopen(url)
-            if r.code == 200:
-                j = r.readlines()
-                # print(j)
-                response = ast.literal_eval(j[3].strip())
-                result = response['response']
-                # print result
-                err = (response['error'])
-                if len(err) > 0:
-                    print("v" * 20)
-                    z = err + "\n" + result
-                    print(z)
-                    print("^" * 20)
-                    print("\n")
-                    return False
-                else:
-                    # print(result)
-                    return result
-            elif r.code:
-                err = 'Error {}'.format(r.status_code)
-                print(err)
-                return err
-            else:
-                print("Something went terribly wrong.....")
-                return False
+            name = self._function_name(fcn)
+            status, body = self._fetch(self._action_path(fcn), name, retry)
+            result = self._read_response(status, body)
+            if result is False and self._metrics is not None:
+                self._metrics.error(name)
+            return result
         except Exception as e:
             print(e)
             print("Exception in _get_request function. \n"
@@ -671,31 +1245,168 @@ class Client(object):
                   "Also, your shoes are untied..")
             return False
 
+    def _read_response(self, status, body):
+        """ Pulls the result out of a Links json response -private
+
+        :param status: HTTP status code
+        :param body: Response body
+        :return: Returns the response text, False on a Links error or 'Error <status>'
+        """
+        if status == 200:
+            response = decode_json(body, status)
+            result = response.response
+            err = response.error
+            if len(err) > 0:
+                print("v" * 20)
+                z = err + "\n" + result
+                print(z)
+                print("^" * 20)
+                print("\n")
+                return False
+            else:
+                # print(result)
+                return result
+        elif status:
+            err = 'Error {}'.format(status)
+            print(err)
+            return err
+        else:
+            print("Something went terribly wrong.....")
+            return False
+
+    def _action_path(self, fcn):
+        """ Request path for a Links function call: the percent-encoded action followed by a
+        '&key=...&output=json' tail that is only built again when the key changes -private """
+        if self._tail[0] != self.key:
+            self._tail = (self.key, '&key={}&output=json'.format(actions.encode(self.key)))
+        return '/?action=' + actions.encode(fcn) + self._tail[1]
+
+    def _fetch(self, path, name='custom', retry=False):
+        """ Sends a query to the Links web service over a pooled keep-alive connection -private
+
+        Each attempt waits at most self.timeout, or whatever is left of the deadline() block it runs in.
+        With retry, requests that couldn't reach Links ( or got a 5xx ) are tried again up to self.retries
+        times after a jittered backoff.
+
+        :param path: Request path ( see _action_path )
+        :param name: Name the call is recorded under in stats()
+        :param retry: Safe to send again ( reads only ). OPTIONAL
+        :return: Returns a (status, body) tuple
+        :raises CircuitOpenError: While the circuit breaker is open
+        """
+        deadline = self._deadline()
+        self._outcome.failed = True
+        attempt = 0
+        while True:
+            if self._breaker is not None:
+                try:
+                    self._breaker.allow()
+                except CircuitOpenError:
+                    if self._metrics is not None:
+                        self._metrics.rejected(name)
+                    raise
+            timeout = self.timeout
+            if deadline is not None:
+                timeout = max(0.0, deadline - time()) if timeout is None else max(0.0, min(timeout, deadline - time()))
+                if not timeout:
+                    raise socket.timeout('Deadline passed before {} was sent'.format(name))
+            try:
+                status, body = self._send(path, name, timeout, retry, deadline)
+            except (socket.error, httplib.HTTPException):
+                if self._breaker is not None:
+                    self._breaker.failure()
+                if not self._retry(retry, attempt, deadline):
+                    raise
+            else:
+                if status < 500:
+                    if self._breaker is not None:
+                        self._breaker.success()
+                    self._outcome.failed = False
+                    return status, to_text(body)
+                if self._breaker is not None:
+                    self._breaker.failure()
+                if not self._retry(retry, attempt, deadline):
+                    return status, to_text(body)
+            attempt += 1
+
+    def _send(self, path, name, timeout, idempotent=False, deadline=None):
+        """ One request, recorded in stats() -private """
+        if self._metrics is None:
+            return self._pool.request(self.ip, self.port, path, timeout, idempotent, deadline)
+        started = clock()
+        try:
+            status, body = self._pool.request(self.ip, self.port, path, timeout, idempotent, deadline)
+        except Exception:
+            self._metrics.record(name, clock() - started, len(path), 0, True)
+            raise
+        self._metrics.record(name, clock() - started, len(path), len(body), status != 200)
+        return status, body
+
+    def _retry(self, retry, attempt, deadline):
+        """ Sleeps before the next attempt, or returns False when there shouldn't be one -private """
+        if not retry or attempt >= self.retries:
+            return False
+        delay = backoff(attempt)
+        if deadline is not None and time() + delay >= deadline:
+            return False
+        sleep(delay)
+        return True
+
+    def _failed(self):
+        """ True when the last request this thread sent couldn't reach Links or got a 5xx -private """
+        return getattr(self._outcome, 'failed', False)
+
+    def _deadline(self):
+        """ Soonest deadline of the deadline() blocks this thread is in, or None -private """
+        deadlines = getattr(self._deadlines, 'stack', None)
+        return min(deadlines) if deadlines else None
+
+    def _probe(self):
+        """ Circuit breaker probe: True when Links answers at all -private """
+        status, body = self._pool.request(self.ip, self.port, self._action_path(''), self.timeout, True)
+        return status < 500
+
+    def _function_name(self, fcn):
+        """ Name of the Links function in an action string, 'Batch' for batches -private """
+        if Batch.SEPARATOR in fcn:
+            return 'Batch'
+        match = self._FUNCTION_PATTERN.search(fcn)
+        return match.group(1) if match else 'custom'
+
+    def _grammar_path(self, data_type="XML"):
+        """ Request path for a GetGrammarList call -private """
+        action = actions.encode(actions.GetGrammarList(data_type).upper())
+        output = actions.encode(data_type.lower())
+        return '/?ACTION={}&output={}&request=disable_recurse&key={}'.format(action, output, actions.encode(self.key))
+
+    def _read_grammar_list(self, body):
+        """ Turns a GetGrammarList response body into the list returned by GetGrammarList -private """
+        response = decode_xml(body)
+        xml = self.strip_non_ascii(response.response)
+        return [line for grammar in iter_grammars(xml) for line in grammar.lines()]
+
     def _write_history(self, text):
         """ Appends history.txt with detected user input -private
 
         :param text:
         """
         try:
-            secs = time()
-            time_stamp = datetime.datetime.fromtimestamp(secs).strftime('%Y-%m-%d %H:%M:%S')
-            history = "{}: {}".format(time_stamp, text)
-            with open(self._SCRIPTS_PATH + '\history.txt', 'a') as f:
-                f.write(history)
-                f.close()
+            self.history_writer.write(text)
         except Exception as e:
             print(e)
             print("Exception in _write_history function")
 
-    def write_commands_to_file(self, commands):
+    def write_commands_to_file(self, commands=None):
         """ Writes a list of commands to a file in rst format.
 
-        :param commands: List of commands returned bt GetGrammarList function
+        :param commands: List of commands returned bt GetGrammarList function. OPTIONAL. When left out the
+                         grammars are streamed from iter_grammars one at a time
         :return: Returns True or Exceptions
         """
         try:
             data = commands
-            print type(data)
+            if data is None:
+                data = (line for grammar in self.iter_grammars() for line in grammar.lines())
             with open(self._SCRIPTS_PATH + r'\command_list.txt', 'w') as f:
                 f.writelines(data)
                 f.close()
@@ -762,6 +1473,43 @@ if __name__ == '__main__':
 
 
 """
+    Changelog- v.0.4.0 ( in development )
+    - Links requests now go over a pool of persistent keep-alive connections ( see pool_stats() )
+    - Added batch() to send many Links functions in one request
+    - Added AsyncClient, coroutine versions of the Client functions for asyncio ( Python 3.5+ )
+    - Client can now be imported on Python 3
+    - Links replies are decoded by a real json/xml parser instead of picking out fixed lines
+    - listen() and GetConfirmation() sleep until UserVariables.xml changes ( inotify on Linux, os.stat elsewhere )
+    - UserVariables.xml lookups are served from a cached index ( see Client.variables )
+    - Added VariableStore.clear_many() and write_many(), UserVariables.xml is now replaced atomically
+    - Added subscribe() and run_forever() to listen to many variables with one loop
+    - Added iter_grammars(), yields compact Grammar records parsed with iterparse
+    - write_commands_to_file() streams from iter_grammars() when no list is given
+    - Added phrase_index() for exact and prefix lookups of which grammar handles a phrase
+    - Added an opt-in TTL/LRU response cache for Get, GetWord and CallCommand ( Client(cache=True) )
+    - GetWord reads memory-mapped wordlist files directly when Links runs locally ( see Client.wordlists )
+    - Added pytronlinks.fakelinks, a stand-in Links server, and benchmarks/bench_client.py
+    - Every call is timed and counted per Links function, see stats() and Metrics(exporter=...)
+    - Added talk_async(), a background speech queue with priorities, merging, deadlines and preemption
+    - Requests time out ( timeout=10 ), reads are retried with jittered backoff, and a circuit breaker
+      fails calls fast while Links is down. Use deadline() to bound a whole block of calls
+    - Added ClientPool to broadcast to several Links machines at once and route single calls by latency
+    - Actions are built from prepared templates ( pytronlinks.actions ): quotes are doubled and the
+      action is percent-encoded, so text with ", &, # or + gets to Links intact. Text with a nested
+      action in it, ie: talk('Mood is [Get("Mood")]'), is passed through as is
+    - history.txt is written through a buffered HistoryWriter that keeps the file open and rotates it
+      by size and day, optionally gzipping old segments ( see Client.history_writer )
+    - Added history(since, until, contains) to query dictation history without reading the whole file
+    - Added dictation(), which follows dictation.txt like tail -F instead of reading and truncating it,
+      so no line Links writes is lost or read twice, across restarts too ( dictation.pos )
+    - Added confirm_async(), GetConfirmation returning a Confirmation future. Any number of them share
+      one watcher thread and resolve as soon as Links answers
+    - Get reads either UserVariables.xml or the [Get] response, not both ( see read_mode and read_source ).
+      Added get_many() to read many variables with one parse or one request
+    - Added talk_stream() to speak long text ( or an iterable of text ) a sentence at a time
+    - Added grammar_changes(), which diffs the grammar list against a hashed snapshot and rewrites
+      command_list.txt only from the first grammar that changed
+
     Changelog- v.0.3.9
     - Fixed some troublesome local variables.
 
@@ -0,0 +1,28 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Compatibility
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    The few names that moved between Python 2 and Python 3.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+try:
+    import httplib
+    from urllib import quote
+    string_types = basestring
+except ImportError:
+    import http.client as httplib
+    from urllib.parse import quote
+    string_types = str
+
+
+def to_text(data):
+    """ Decodes a response body on Python 3. Python 2 str is left alone. """
+    if isinstance(data, bytes) and not isinstance(data, str):
+        return data.decode('utf-8', 'replace')
+    return data
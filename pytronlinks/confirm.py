@@ -0,0 +1,177 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Confirmations
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Yes/no questions that don't block: each one is a future, all of them wait on one watcher thread.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import threading
+from time import time
+
+from .watcher import watch
+
+# Longest the waiter sleeps between checks of the deadlines
+_TICK = 0.25
+
+
+class Confirmation(object):
+    """ The answer to one confirm_async() question, once there is one.
+
+        result() is True for 'yes', False for 'no' and None when nobody answered in time
+        ( or the confirmation was cancelled ).
+    """
+
+    def __init__(self, trigger_var, deadline):
+        self.trigger_var = trigger_var
+        self.deadline = deadline
+        self._result = None
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """ Waits for the answer
+
+        :param timeout: Seconds to wait. OPTIONAL. Waits until the confirmation is resolved by default
+        :return: Returns True, False, or None if there was no answer ( yet )
+        """
+        self._done.wait(timeout)
+        return self._result
+
+    def cancel(self):
+        """ Stops waiting for an answer, result() will be None """
+        self._resolve(None)
+
+    def add_done_callback(self, fn):
+        """ Calls fn( confirmation ) once it is resolved, straight away if it already is.
+        Callbacks run on the waiter thread, so keep them short ( ie: use talk_async ).
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def __repr__(self):
+        state = repr(self._result) if self.done() else 'pending'
+        return 'Confirmation({!r}, {})'.format(self.trigger_var, state)
+
+    def _resolve(self, result):
+        """ Sets the result and runs the callbacks. Returns False if it was already resolved -private """
+        with self._lock:
+            if self._done.is_set():
+                return False
+            self._result = result
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                print("Exception in confirmation callback")
+                print(e)
+        return True
+
+
+class ConfirmationWaiter(object):
+    """ Resolves every pending Confirmation from one thread and one watcher on UserVariables.xml.
+        Each change reads all the trigger variables in one go. A 'yes' or 'no' resolves every
+        confirmation waiting on that variable and clears it. The thread exits when nothing is pending.
+
+        Use Client.confirm_async() rather than creating one directly.
+    """
+
+    def __init__(self, store, path, interval=0.2):
+        """
+        :param store: VariableStore for UserVariables.xml
+        :param path: Path to UserVariables.xml, to watch
+        :param interval: Delay ( in seconds ) between checks where inotify isn't available
+        """
+        self.store = store
+        self.path = path
+        self.interval = interval
+        self._pending = []
+        self._thread = None
+        self._watcher = None
+        self._lock = threading.Lock()
+
+    def add(self, trigger_var, timeout):
+        """ Clears trigger_var and starts waiting for a 'yes' or 'no' in it
+
+        :return: Returns a Confirmation
+        """
+        self.store.clear_many([trigger_var])
+        confirmation = Confirmation(trigger_var, time() + timeout)
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = watch(self.path, self.interval)
+            self._pending.append(confirmation)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='pytron-confirm')
+                self._thread.daemon = True
+                self._thread.start()
+        return confirmation
+
+    def pending(self):
+        """ Returns the number of confirmations still waiting """
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        """ Cancels everything pending and closes the watcher """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            thread = self._thread
+        for confirmation in pending:
+            confirmation.cancel()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        with self._lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._pending = [c for c in self._pending if not c.done()]
+                if not self._pending:
+                    self._thread = None
+                    return
+                pending = list(self._pending)
+                watcher = self._watcher
+            try:
+                self._check(pending)
+            except Exception as e:
+                print("Exception checking confirmations")
+                print(e)
+            now = time()
+            waiting = [c.deadline for c in pending if not c.done()]
+            if waiting:
+                watcher.wait(max(0.0, min(_TICK, min(waiting) - now)))
+
+    def _check(self, pending):
+        names = set(c.trigger_var for c in pending)
+        values = self.store.get_many(names)
+        answers = {}
+        for name, value in values.items():
+            value = (value or '').strip().lower()
+            if value in ('yes', 'no'):
+                answers[name] = value == 'yes'
+        if answers:
+            self.store.clear_many(list(answers))
+        now = time()
+        for confirmation in pending:
+            if confirmation.trigger_var in answers:
+                confirmation._resolve(answers[confirmation.trigger_var])
+            elif confirmation.deadline <= now:
+                confirmation._resolve(None)
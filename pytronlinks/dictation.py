@@ -0,0 +1,175 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Dictation Input
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Follows dictation.txt like tail -F: every line Links appends is read once, nothing is truncated.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import io
+import os
+import threading
+from time import time
+
+from .compat import to_text
+from .watcher import watch
+
+
+class DictationReader(object):
+    """ Keeps dictation.txt open at the last offset read and hands out each complete line once.
+
+        - Lines already in the file when it is first opened are handed out too, unless a position file
+          says they were read before
+        - A line is only handed out once its line break has been written. Blank lines are skipped
+        - When the file shrinks ( truncated ) it is read again from the start
+        - When the path points at a new file ( rotated or replaced ) the rest of the old file is read,
+          then the new one from the start. A missing file is waited for.
+        - follow() sleeps until the file changes ( inotify on Linux, os.stat elsewhere )
+
+        Use Client.dictation() rather than creating one directly.
+    """
+
+    def __init__(self, path, from_start=True, interval=0.2, position_file=None):
+        """
+        :param path: Full path to dictation.txt
+        :param from_start: Hand out lines already in the file. OPTIONAL. With False only new lines are
+        :param interval: Delay ( in seconds ) between checks where inotify isn't available. OPTIONAL
+        :param position_file: File to keep the offset read so far in, so a new reader ( ie: after a
+                              restart ) carries on where the last one stopped. OPTIONAL
+        """
+        self.path = path
+        self.interval = interval
+        self.position_file = position_file
+        self._file = None
+        self._partial = b''
+        self._watcher = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._open(from_start)
+
+    def read(self):
+        """ Returns a list of the lines added since the last read, without waiting """
+        with self._lock:
+            return self._read()
+
+    def follow(self, timeout=None):
+        """ Yields every new line as it is written ( BLOCKING )
+
+        :param timeout: Stop after this many seconds without a new line. OPTIONAL. Runs until stop()
+        """
+        watcher = self._watch()
+        # The watcher outlives a follow(), so it checks at the interval of the latest one
+        watcher.interval = self.interval
+        self._stopped = False
+        idle_since = time()
+        while not self._stopped:
+            lines = self.read()
+            if lines:
+                for line in lines:
+                    yield line
+                idle_since = time()
+                continue
+            wait = 1.0
+            if timeout is not None:
+                remaining = idle_since + timeout - time()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            watcher.wait(wait)
+
+    def stop(self):
+        """ Makes follow() return ( it may take up to a second ) """
+        self._stopped = True
+
+    def close(self):
+        """ Closes the file and the watcher. The offset is kept, read() opens the file again. """
+        self._stopped = True
+        with self._lock:
+            if self._file is not None:
+                self._offset = self._file.tell()
+                self._file.close()
+                self._file = None
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    def _open(self, from_start):
+        self._offset = 0
+        try:
+            self._file = io.open(self.path, 'rb')
+        except IOError:
+            return
+        st = os.fstat(self._file.fileno())
+        saved = self._load_position()
+        if saved is not None and saved[0] == st.st_ino and saved[1] <= st.st_size:
+            self._file.seek(saved[1])
+        elif not from_start:
+            self._file.seek(0, os.SEEK_END)
+
+    def _load_position(self):
+        """ (inode, offset) from the position file, or None -private """
+        if not self.position_file:
+            return None
+        try:
+            with open(self.position_file) as f:
+                inode, offset = f.read().split()
+            return int(inode), int(offset)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _save_position(self):
+        """ Remembers the start of the first line not handed out yet -private """
+        if not self.position_file:
+            return
+        try:
+            inode = os.fstat(self._file.fileno()).st_ino
+            with open(self.position_file, 'w') as f:
+                f.write('{} {}'.format(inode, self._file.tell() - len(self._partial)))
+        except (IOError, OSError) as e:
+            # Only costs a repeat after a restart
+            print("Couldn't save the dictation position")
+            print(e)
+
+    def _watch(self):
+        if self._watcher is None:
+            self._watcher = watch(self.path, self.interval, appends=True)
+        return self._watcher
+
+    def _read(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            st = None
+        if self._file is None:
+            if st is None:
+                return []
+            self._file = io.open(self.path, 'rb')
+            if st.st_size >= self._offset:
+                self._file.seek(self._offset)
+            else:
+                self._partial = b''
+        data = b''
+        if st is not None:
+            current = os.fstat(self._file.fileno())
+            if st.st_ino and (st.st_ino, st.st_dev) != (current.st_ino, current.st_dev):
+                # Rotated or replaced: finish the old file, then start the new one from the top
+                data = self._file.read()
+                if (data or self._partial) and not data.endswith(b'\n'):
+                    data += b'\n'
+                self._file.close()
+                self._file = io.open(self.path, 'rb')
+            elif st.st_size < self._file.tell():
+                self._file.seek(0)
+                self._partial = b''
+        data += self._file.read()
+        if not data:
+            return []
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        self._save_position()
+        return [to_text(line.rstrip(b'\r')) for line in lines if line.strip()]
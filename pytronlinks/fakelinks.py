@@ -0,0 +1,332 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Fake Links
+    ~~~~~~~~~~~~~~~~~~~
+
+    A stand-in for the Links web service, for trying out and benchmarking Pytron without a
+    Links install. It answers ?action=...&key=...&output=json|xml the way Client expects,
+    keeps its own variables ( optionally mirrored to a UserVariables.xml file ) and can add
+    latency and jitter to every request.
+
+        python -m pytronlinks.fakelinks --port 54657 --latency 0.005 --jitter 0.002
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import json
+import random
+import socket
+import threading
+import xml.etree.ElementTree as ET
+from time import sleep
+from xml.sax.saxutils import escape
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+
+from .compat import to_text
+from .grammar import Grammar
+
+
+class FakeLinks(object):
+    """ Fake Links web service running in a background thread.
+
+        Set drop_idle to close every connection after answering without a Connection: close header, the
+        way Links drops idle keep-alive connections. Clients only find out on their next request.
+
+         :Example:
+
+              import pytronlinks
+              from pytronlinks.fakelinks import FakeLinks
+
+              with FakeLinks(latency=0.005) as links:
+                  ai = pytronlinks.Client(ip=links.host, port=links.port)
+                  ai.talk("Hello")
+                  print(links.spoken)
+
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, key='ABC1234', latency=0.0, jitter=0.0,
+                 variables_file=None, grammars=None, commands=None, wordlists=None):
+        """
+        :param host: Interface to listen on
+        :param port: Port to listen on ( 0 picks a free one, see .port )
+        :param key: Links web key requests must carry
+        :param latency: Seconds added to every request
+        :param jitter: Up to this many extra seconds are added at random
+        :param variables_file: UserVariables.xml to keep in step with the variables. OPTIONAL
+        :param grammars: List of Grammar for GetGrammarList. OPTIONAL. A few made up ones by default
+        :param commands: Dict of command -> response for CallCommand. OPTIONAL
+        :param wordlists: Dict of wordlist -> { grammar: { column: value } } for GetWord. OPTIONAL
+        """
+        self.key = key
+        self.latency = latency
+        self.jitter = jitter
+        self.variables_file = variables_file
+        self.grammars = grammars if grammars is not None else make_grammars()
+        self.commands = commands or {}
+        self.wordlists = wordlists or {}
+        self.variables = {}
+        self.spoken = []
+        self.emulated = []
+        self.requests = 0
+        self.drop_idle = False
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.links = self
+        self._thread = None
+        if variables_file:
+            self._write_variables()
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return str(self._server.server_address[1])
+
+    def start(self):
+        """ Starts answering requests in a daemon thread """
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """ Stops the server and closes its socket """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def set_variable(self, name, value):
+        """ Sets a variable the way a Links command running [Set("name", "value")] would """
+        with self._lock:
+            self.variables[name] = value
+            if self.variables_file:
+                self._write_variables()
+
+    def run(self, action):
+        """ Evaluates a Links action string
+
+        :return: Returns a (response, error) tuple
+        """
+        try:
+            return _Evaluator(self).text(action, 0, '')[0], ''
+        except _LinksError as e:
+            return '', str(e)
+
+    def call(self, name, args):
+        """ Runs one Links function ( names are case insensitive ) -private """
+        name = name.lower()
+        arg = lambda i, default='': args[i] if len(args) > i else default
+        if name in ('speak', 'speakex', 'speakexsysvolsync', 'speakexsysvolasync', 'lloquendo.speech.speak'):
+            with self._lock:
+                self.spoken.append(arg(0))
+            return ''
+        if name == 'sayas':
+            return arg(0)
+        if name == 'set':
+            self.set_variable(arg(0), arg(1))
+            return ''
+        if name == 'get':
+            with self._lock:
+                return self.variables.get(arg(0), '')
+        if name == 'getword':
+            rows = self.wordlists.get(arg(0), {})
+            row = dict((k.lower(), v) for k, v in rows.items()).get(arg(1).lower(), {})
+            return row.get(arg(2), '')
+        if name == 'callcommand':
+            return self.commands.get(arg(0), 'Response to {}'.format(arg(0)))
+        if name == 'emulatespeech':
+            with self._lock:
+                self.emulated.append(arg(0))
+            return ''
+        if name in ('stopvoicebyname', 'stopvoicebyidentifier', 'setspeechvolume', 'setspeechvoice',
+                    'setspeechconfig'):
+            return ''
+        if name == 'getgrammarlist':
+            return grammar_document(self.grammars)
+        raise _LinksError('Unknown function: {}'.format(name))
+
+    def _write_variables(self):
+        root = ET.Element('UserVariables')
+        for name in sorted(self.variables):
+            variable = ET.SubElement(root, 'Variable')
+            ET.SubElement(variable, 'Name').text = name
+            ET.SubElement(variable, 'Value').text = self.variables[name] or None
+        ET.ElementTree(root).write(self.variables_file)
+
+
+def make_grammars(count=5, commands=20):
+    """ Makes up some grammars for GetGrammarList """
+    return [Grammar('Grammar {}'.format(g), g % 4 != 3, True, 0, False,
+                    tuple('command {} of grammar {}'.format(c, g) for c in range(commands)))
+            for g in range(count)]
+
+
+def grammar_document(grammars):
+    """ Builds the grammar document Links returns from [GetGrammarList] """
+    parts = ['<grammars>']
+    for g in grammars:
+        parts.append('<grammar><Name>{}</Name><Enabled>{}</Enabled><Loaded>{}</Loaded><Priority>{}</Priority>'
+                     '<DebugShowPhrases>{}</DebugShowPhrases>'.format(escape(g.name), _flag(g.enabled),
+                                                                      _flag(g.loaded), g.priority,
+                                                                      _flag(g.debug_show_phrases)))
+        parts.extend('<Commands>{}</Commands>'.format(escape(c)) for c in g.commands)
+        parts.append('</grammar>')
+    parts.append('</grammars>')
+    return ''.join(parts)
+
+
+def _flag(value):
+    return 'true' if value else 'false'
+
+
+class _LinksError(Exception):
+    pass
+
+
+class _Evaluator(object):
+    """ Just enough of the Links action language: [Function("arg", arg)], nested calls inside
+        quoted arguments, "" for a literal quote and plain text in between -private
+    """
+
+    def __init__(self, links):
+        self.links = links
+
+    def text(self, s, i, stop):
+        out = []
+        while i < len(s):
+            c = s[i]
+            if stop == '"' and c == '"':
+                if s[i + 1:i + 2] == '"':
+                    out.append('"')
+                    i += 2
+                    continue
+                break
+            if c in stop and stop != '"':
+                break
+            if c == '[' and self._is_call(s, i):
+                value, i = self.call(s, i)
+                out.append(value)
+                continue
+            out.append(c)
+            i += 1
+        return ''.join(out), i
+
+    def call(self, s, i):
+        paren = s.index('(', i)
+        name = s[i + 1:paren].strip()
+        i = paren + 1
+        args = []
+        while True:
+            while i < len(s) and s[i] == ' ':
+                i += 1
+            if i < len(s) and s[i] == ')':
+                i += 1
+                break
+            if i < len(s) and s[i] == '"':
+                value, i = self.text(s, i + 1, '"')
+                i += 1
+            else:
+                value, i = self.text(s, i, ',)')
+                value = value.strip()
+            args.append(value)
+            while i < len(s) and s[i] == ' ':
+                i += 1
+            if i >= len(s):
+                raise _LinksError('Unterminated function: {}'.format(name))
+            if s[i] == ',':
+                i += 1
+            elif s[i] == ')':
+                i += 1
+                break
+        if s[i:i + 1] != ']':
+            raise _LinksError('Expected ] after {}'.format(name))
+        return self.links.call(name, args), i + 1
+
+    @staticmethod
+    def _is_call(s, i):
+        paren = s.find('(', i)
+        return paren != -1 and s[i + 1:paren].replace('.', '').isalnum()
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        # Headers and body go out in separate writes, without this every reply waits on delayed ACKs.
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        BaseHTTPRequestHandler.setup(self)
+
+    def do_GET(self):
+        links = self.server.links
+        with links._lock:
+            links.requests += 1
+        if links.latency or links.jitter:
+            sleep(links.latency + random.uniform(0, links.jitter))
+        query = dict((k.lower(), v) for k, v in parse_qs(urlparse(self.path).query, keep_blank_values=True).items())
+        action = to_text(query.get('action', [''])[0])
+        output = query.get('output', ['json'])[0].lower()
+        if query.get('key', [''])[0] != links.key:
+            response, error = '', 'Invalid key'
+        else:
+            response, error = links.run(action)
+        if output == 'xml':
+            body = ('Links Web Service\r\n\r\n\r\n\r\n<?xml version="1.0"?>\r\n<Links><response>{}</response>'
+                    '<error>{}</error></Links>\r\n').format(escape(response), escape(error))
+        else:
+            body = 'Links Web Service\r\n\r\n\r\n{}\r\n'.format(json.dumps({'response': response, 'error': error}))
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if links.drop_idle:
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Fake Links web service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=54657)
+    parser.add_argument('--key', default='ABC1234')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--variables-file', default=None)
+    args = parser.parse_args()
+    links = FakeLinks(args.host, args.port, args.key, args.latency, args.jitter, args.variables_file)
+    print("Fake Links listening on {}:{} ( Ctrl-c to quit )".format(links.host, links.port))
+    try:
+        links._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Grammars
+    ~~~~~~~~~~~~~~~~~
+
+    Compact records for the grammars returned by [GetGrammarList], parsed one at a time, and
+    snapshots that tell what changed between two grammar lists.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import hashlib
+import io
+import os
+import xml.etree.ElementTree as ET
+
+
+class Grammar(object):
+    """ One Links grammar.
+
+        :name: Grammar name
+        :enabled: True when the grammar is enabled
+        :loaded: True when the grammar is loaded
+        :priority: Priority as an int ( or the raw text if Links sent something else )
+        :debug_show_phrases: True when DebugShowPhrases is on
+        :commands: Tuple of command phrases
+    """
+    __slots__ = ('name', 'enabled', 'loaded', 'priority', 'debug_show_phrases', 'commands')
+
+    def __init__(self, name, enabled, loaded, priority, debug_show_phrases, commands):
+        self.name = name
+        self.enabled = enabled
+        self.loaded = loaded
+        self.priority = priority
+        self.debug_show_phrases = debug_show_phrases
+        self.commands = commands
+
+    def lines(self):
+        """ Yields this grammar the way GetGrammarList lists it ( name, underline, markers, commands ) """
+        yield self.name
+        yield "=" * len(self.name)
+        yield "*Enabled*" if self.enabled else "*Disabled*"
+        yield "*Loaded*" if self.loaded else "*Not loaded*"
+        yield '\n'
+        for command in self.commands:
+            yield command
+        yield '\n \n'
+
+    def __repr__(self):
+        return 'Grammar({!r}, enabled={!r}, loaded={!r}, commands={})'.format(
+            self.name, self.enabled, self.loaded, len(self.commands))
+
+    @classmethod
+    def from_element(cls, element):
+        """ Builds a Grammar from a <grammar> element """
+        priority = element.findtext('Priority')
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            pass
+        return cls(element.findtext('Name'),
+                   _flag(element.findtext('Enabled')),
+                   _flag(element.findtext('Loaded')),
+                   priority,
+                   _flag(element.findtext('DebugShowPhrases')),
+                   tuple(c.text for c in element.findall('Commands')))
+
+
+def iter_grammars(xml):
+    """ Parses the grammar document Links puts in a GetGrammarList response, yielding one Grammar
+    at a time. Each <grammar> element is dropped as soon as it has been read, so the whole tree
+    is never held in memory.
+
+    :param xml: The grammar document ( text of the <response> element )
+    """
+    source = io.BytesIO(xml.encode('utf-16-be'))
+    root = None
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = element
+        elif event == 'end' and element.tag == 'grammar':
+            yield Grammar.from_element(element)
+            root.clear()
+
+
+class GrammarDelta(object):
+    """ What changed between two grammar lists, as lists of grammar names.
+
+        :added: New grammars
+        :removed: Grammars that are gone
+        :changed: Grammars whose commands, flags or priority changed
+        :enabled: Changed grammars that went from disabled to enabled
+        :disabled: Changed grammars that went from enabled to disabled
+
+        A delta is false when nothing changed.
+    """
+    __slots__ = ('added', 'removed', 'changed', 'enabled', 'disabled')
+
+    def __init__(self, added=(), removed=(), changed=(), enabled=(), disabled=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+        self.enabled = list(enabled)
+        self.disabled = list(disabled)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return 'GrammarDelta(added={!r}, removed={!r}, changed={!r}, enabled={!r}, disabled={!r})'.format(
+            self.added, self.removed, self.changed, self.enabled, self.disabled)
+
+
+class GrammarSnapshot(object):
+    """ The last grammar list seen, kept as one hash for the whole document and a (name, hash, enabled)
+        entry per grammar. update() compares a new document against it:
+
+        - An unchanged document is recognised from its hash alone, without parsing it
+        - Otherwise the grammars are parsed once and compared by hash, giving a GrammarDelta
+        - With a path, the exported command list ( same format as write_commands_to_file ) is only
+          rewritten from the first grammar that changed, moved or was added / removed
+
+        Use Client.grammar_changes() rather than creating one directly.
+    """
+
+    def __init__(self, path=None, decode=None):
+        """
+        :param path: Command list file to keep up to date. OPTIONAL
+        :param decode: Turns what update() is given into the grammar document. OPTIONAL
+        """
+        self.path = path
+        self.decode = decode
+        self.digest = None
+        self.entries = []
+        self.bytes_written = 0
+        self._offsets = None
+        self._exported = None
+
+    def update(self, document):
+        """ Compares document with the snapshot, then makes it the new snapshot
+
+        :param document: A GetGrammarList document ( or whatever decode takes )
+        :return: Returns a GrammarDelta
+        """
+        raw = document if isinstance(document, bytes) else document.encode('utf-8')
+        digest = hashlib.sha1(raw).digest()
+        if digest == self.digest and (self.path is None or self._export_current()):
+            return GrammarDelta()
+        xml = self.decode(document) if self.decode is not None else document
+        grammars = list(iter_grammars(xml))
+        entries = [(g.name, _digest(g), g.enabled) for g in grammars]
+        delta = _compare(self.entries, entries)
+        if self.path is not None:
+            self._export(grammars, entries)
+        self.digest = digest
+        self.entries = entries
+        return delta
+
+    def _export(self, grammars, entries):
+        """ Rewrites the command list from the first section that differs -private """
+        start = 0
+        if self._export_current():
+            old = self.entries
+            while start < min(len(old), len(entries)) and old[start][:2] == entries[start][:2]:
+                start += 1
+            offsets = self._offsets[:start + 1]
+            mode = 'r+b'
+        else:
+            offsets = [0]
+            mode = 'wb'
+        with open(self.path, mode) as f:
+            f.seek(offsets[-1])
+            for grammar in grammars[start:]:
+                data = ''.join(grammar.lines()).replace('\n', os.linesep).encode('utf-8')
+                f.write(data)
+                offsets.append(offsets[-1] + len(data))
+            f.truncate()
+        self.bytes_written += offsets[-1] - offsets[start]
+        self._offsets = offsets
+        self._exported = self.path
+
+    def _export_current(self):
+        """ True when the file at path is still the one this snapshot wrote -private """
+        return (self._exported == self.path and self._offsets is not None and os.path.exists(self.path) and
+                os.path.getsize(self.path) == self._offsets[-1])
+
+
+def _digest(grammar):
+    """ Content hash of a grammar -private """
+    text = '\x1f'.join([grammar.name, str(grammar.enabled), str(grammar.loaded), str(grammar.priority),
+                        str(grammar.debug_show_phrases), '\x1e'.join(c or '' for c in grammar.commands)])
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+
+def _compare(old, new):
+    """ GrammarDelta between two lists of (name, digest, enabled) entries -private """
+    before = dict((name, (digest, enabled)) for name, digest, enabled in old)
+    after = dict((name, (digest, enabled)) for name, digest, enabled in new)
+    delta = GrammarDelta()
+    for name, digest, enabled in new:
+        if name not in before:
+            delta.added.append(name)
+        elif before[name][0] != digest:
+            delta.changed.append(name)
+            if enabled and not before[name][1]:
+                delta.enabled.append(name)
+            elif not enabled and before[name][1]:
+                delta.disabled.append(name)
+    delta.removed = [name for name, digest, enabled in old if name not in after]
+    return delta
+
+
+def _flag(text):
+    return str(text).strip().lower() == 'true'
@@ -0,0 +1,481 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Dictation History
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Buffered, rotating writer for history.txt ( one "YYYY-mm-dd HH:MM:SS: text" line per dictation )
+    and time range queries over it.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import atexit
+import datetime
+import gzip
+import mmap
+import os
+import re
+import shutil
+import threading
+import weakref
+from time import localtime, strftime, time
+
+from .compat import string_types
+
+_writers = weakref.WeakSet()
+_compressing = threading.Lock()
+_STAMP = re.compile(br'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d: ')
+_STAMP_SIZE = 19
+# Seconds before a rotation that failed ( ie: history.txt open in another process on Windows ) is tried again
+_ROTATE_RETRY = 5.0
+
+
+class HistoryWriter(object):
+    """ Keeps history.txt open and writes entries in batches instead of opening the file per line.
+
+        - Entries are buffered and written once buffer_size bytes are waiting, every flush_interval
+          seconds, on flush() / close() and when the interpreter exits
+        - The file is rotated to history.<day>.txt ( history.<day>.1.txt and so on ) when it would grow
+          past max_bytes, and when the day changes if daily is set. <day> is the day of the segment's
+          first entry, which is what lets iter_history skip segments by name. When the file can't be
+          renamed ( ie: another process has it open ) entries keep going into it and the rotation is
+          tried again a little later
+        - Rotated segments can be gzipped ( in the background ) and pruned to the newest backups
+        - Safe to use from several threads
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client()
+              ai.history_writer.compress = True
+              ai.history_writer.backups = 30
+
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, daily=True, compress=False, backups=None,
+                 buffer_size=64 * 1024, flush_interval=1.0):
+        """
+        :param path: Full path to history.txt
+        :param max_bytes: Size that starts a new segment ( None for no limit )
+        :param daily: Start a new segment every day. OPTIONAL
+        :param compress: gzip rotated segments. OPTIONAL
+        :param backups: Most rotated segments to keep ( None keeps them all ). OPTIONAL
+        :param buffer_size: Bytes to buffer before writing. OPTIONAL
+        :param flush_interval: Longest time ( seconds ) an entry waits in the buffer. OPTIONAL
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.compress = compress
+        self.backups = backups
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered = 0
+        self._file = None
+        self._size = 0
+        self._day = None
+        self._first_day = None
+        self._rotate_after = None
+        self._stamp = (None, '')
+        self._flusher = None
+        self._stop = threading.Event()
+        self._lock = threading.RLock()
+        _writers.add(self)
+
+    def write(self, text, secs=None):
+        """ Adds an entry
+
+        :param text: Dictation text ( a line break is added if missing )
+        :param secs: Time of the entry. OPTIONAL. Defaults to now
+        """
+        if secs is None:
+            secs = time()
+        whole = int(secs)
+        with self._lock:
+            if self._stamp[0] != whole:
+                self._stamp = (whole, strftime('%Y-%m-%d %H:%M:%S', localtime(whole)))
+            stamp = self._stamp[1]
+            if self._file is None:
+                self._open()
+            day = stamp[:10]
+            if self._day != day:
+                previous, self._day = self._day, day
+                if self.daily and previous is not None:
+                    try:
+                        self._flush()
+                        self._rotate()
+                    except (IOError, OSError) as e:
+                        # What couldn't be written stays buffered, the rotation is tried again later
+                        print("Couldn't start a new history segment")
+                        print(e)
+                        self._rotate_after = time() + _ROTATE_RETRY
+            entry = stamp + ': ' + text
+            if not entry.endswith('\n'):
+                entry += '\n'
+            self._buffer.append(entry)
+            self._buffered += len(entry)
+            if self._buffered >= self.buffer_size:
+                self._flush()
+            elif self._flusher is None and self.flush_interval:
+                self._flusher = threading.Thread(target=self._flush_loop, name='pytron-history')
+                self._flusher.daemon = True
+                self._flusher.start()
+
+    def flush(self):
+        """ Writes out everything buffered """
+        with self._lock:
+            self._flush()
+
+    def rotate(self):
+        """ Starts a new segment now """
+        with self._lock:
+            self._flush()
+            self._rotate()
+
+    def close(self):
+        """ Flushes and closes the file. Writing again opens it again. """
+        self._stop.set()
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            flusher, self._flusher = self._flusher, None
+            self._stop = threading.Event()
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+
+    def _open(self):
+        self._file = open(self.path, 'ab')
+        self._file.seek(0, os.SEEK_END)
+        self._size = self._file.tell()
+        if self._size and self._day is None:
+            self._day = strftime('%Y-%m-%d', localtime(os.path.getmtime(self.path)))
+        if self._size and self._first_day is None:
+            self._first_day = _first_day(self.path) or self._day
+
+    def _flush(self):
+        """ Writes the buffer out. Entries only leave the buffer once they are written -private """
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open()
+        if self._rotate_after is not None and time() >= self._rotate_after:
+            self._rotate()
+            if self._file is None:
+                self._open()
+        data = _encode(''.join(self._buffer))
+        if not self.max_bytes or self._size + len(data) <= self.max_bytes or self._rotate_after is not None:
+            self._write(data)
+            self._buffer, self._buffered = [], 0
+            return
+        # Doesn't fit: write entry by entry, rotating whenever the next one would pass max_bytes
+        chunk = []
+        size = self._size
+        for entry in list(self._buffer):
+            entry = _encode(entry)
+            if size and size + len(entry) > self.max_bytes and self._rotate_after is None:
+                self._write(b''.join(chunk))
+                self._drop(len(chunk))
+                chunk = []
+                self._rotate()
+                if self._file is None:
+                    self._open()
+                size = self._size
+            chunk.append(entry)
+            size += len(entry)
+        self._write(b''.join(chunk))
+        self._buffer, self._buffered = [], 0
+
+    def _drop(self, count):
+        """ Takes the first count entries, now written, off the buffer -private """
+        self._buffered -= sum(len(entry) for entry in self._buffer[:count])
+        del self._buffer[:count]
+
+    def _write(self, data):
+        if data:
+            if not self._size:
+                self._first_day = data[:10].decode('ascii')
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+
+    def _rotate(self):
+        """ Renames the current file to the next segment name and starts an empty one. When the rename
+        fails the file is opened again and the rotation tried after _ROTATE_RETRY seconds -private """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._rotate_after = None
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return
+        segment = _segment_name(self.path, self._first_day or self._day or strftime('%Y-%m-%d'))
+        try:
+            os.rename(self.path, segment)
+        except OSError as e:
+            print("Couldn't rotate history.txt, will try again later")
+            print(e)
+            self._rotate_after = time() + _ROTATE_RETRY
+            self._open()
+            return
+        self._size = 0
+        self._first_day = None
+        if self.compress:
+            worker = threading.Thread(target=_compress, args=(segment, self.backups, self.path),
+                                      name='pytron-history-gzip')
+            worker.daemon = True
+            worker.start()
+        elif self.backups is not None:
+            _prune(self.path, self.backups)
+
+    def _flush_loop(self):
+        stop = self._stop
+        while not stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except (IOError, OSError) as e:
+                # The entries stay buffered for the next try
+                print("Couldn't write history.txt")
+                print(e)
+
+
+class HistoryEntry(object):
+    """ One dictation from history.txt.
+
+        :time: datetime of the entry
+        :text: What was dictated
+    """
+    __slots__ = ('time', 'text')
+
+    def __init__(self, time, text):
+        self.time = time
+        self.text = text
+
+    def __repr__(self):
+        return 'HistoryEntry({!r}, {!r})'.format(str(self.time), self.text)
+
+
+def iter_history(path, since=None, until=None, contains=None):
+    """ Yields the HistoryEntry records of a history file and its rotated segments, oldest first,
+    from since ( inclusive ) up to until ( exclusive ).
+
+    Plain files are memory-mapped and the first and last entries in range are found by binary search
+    on the timestamps, so only the lines in range are ever read. Segments outside the range are skipped
+    by their names ( the day of their first entry ), gzipped segments in range are streamed. Lines without a timestamp belong to the
+    entry above them.
+
+    :param path: Full path to history.txt
+    :param since: datetime, time() seconds or 'YYYY-mm-dd[ HH:MM:SS]' text. OPTIONAL
+    :param until: Same types as since. OPTIONAL
+    :param contains: Only entries with this text in them ( case insensitive ). OPTIONAL
+    """
+    since = _stamp(since)
+    until = _stamp(until)
+    needle = _encode(contains).lower() if contains else None
+    files = _segments(path) if os.path.exists(os.path.dirname(path) or '.') else []
+    files.append((None, None, path))
+    for i, (day, n, name) in enumerate(files):
+        if until is not None and day is not None and _encode(day) >= until:
+            break
+        next_day = files[i + 1][0] if i + 1 < len(files) else None
+        if since is not None and next_day is not None and _encode(next_day) + b' 99' < since:
+            continue
+        if name.endswith('.gz'):
+            lines = _gz_lines(name, since, until)
+        else:
+            lines = _mapped_lines(name, since, until)
+        for entry in _entries(lines, needle):
+            yield entry
+
+
+def segments(path):
+    """ Rotated segments of a history file, oldest first ( gzipped ones included )
+
+    :param path: Full path to history.txt
+    :return: Returns a list of paths
+    """
+    return [p for day, n, p in _segments(path)]
+
+
+def _segments(path):
+    """ Sorted (day, n, path) tuples of the rotated segments -private """
+    directory, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    pattern = re.compile(r'^{}\.(\d{{4}}-\d{{2}}-\d{{2}})(?:\.(\d+))?{}(\.gz)?$'.format(re.escape(stem), re.escape(ext)))
+    found = []
+    for entry in os.listdir(directory or '.'):
+        match = pattern.match(entry)
+        if match:
+            found.append((match.group(1), int(match.group(2) or 0), os.path.join(directory, entry)))
+    found.sort()
+    return found
+
+
+def _first_day(path):
+    """ Day of the first timestamped entry in a history file, or None -private """
+    with open(path, 'rb') as f:
+        for line in f:
+            if _STAMP.match(line):
+                return line[:10].decode('ascii')
+    return None
+
+
+def _encode(text):
+    return text if isinstance(text, bytes) else text.encode('utf-8')
+
+
+def _segment_name(path, day):
+    """ Next segment name for day, numbered after every existing one so names sort in order -private """
+    stem, ext = os.path.splitext(path)
+    taken = [n for d, n, p in _segments(path) if d == day]
+    if not taken:
+        return '{}.{}{}'.format(stem, day, ext)
+    return '{}.{}.{}{}'.format(stem, day, max(taken) + 1, ext)
+
+
+def _compress(segment, backups, path):
+    try:
+        with _compressing:
+            if os.path.exists(segment):
+                _gzip(segment)
+            if backups is not None:
+                _prune(path, backups)
+    except Exception as e:
+        print(e)
+        print("Exception compressing history segment")
+
+
+def _gzip(segment):
+    with open(segment, 'rb') as src:
+        f = gzip.open(segment + '.gz', 'wb')
+        try:
+            shutil.copyfileobj(src, f)
+        finally:
+            f.close()
+    os.remove(segment)
+
+
+def _prune(path, backups):
+    for old in segments(path)[:-backups or None]:
+        os.remove(old)
+
+
+@atexit.register
+def _close_all():
+    for writer in list(_writers):
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+def _stamp(value):
+    """ since / until as timestamp bytes, which compare in time order -private """
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        value = value.strftime('%Y-%m-%d %H:%M:%S')
+    elif isinstance(value, datetime.date):
+        value = value.strftime('%Y-%m-%d')
+    elif not isinstance(value, string_types):
+        value = strftime('%Y-%m-%d %H:%M:%S', localtime(value))
+    return _encode(value)
+
+
+def _mapped_lines(path, since, until):
+    """ Lines of a plain history file between the since and until timestamps -private """
+    try:
+        f = open(path, 'rb')
+    except IOError:
+        return
+    with f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        pos = _search(data, since) if since is not None else 0
+        end = _search(data, until) if until is not None else len(data)
+        while pos < end:
+            nl = data.find(b'\n', pos, end)
+            stop = end if nl < 0 else nl + 1
+            yield data[pos:stop]
+            pos = stop
+    finally:
+        data.close()
+
+
+def _gz_lines(path, since, until):
+    """ Lines of a gzipped segment from since, stopping at until -private """
+    f = gzip.open(path, 'rb')
+    try:
+        started = since is None
+        for line in f:
+            if _STAMP.match(line):
+                if not started:
+                    started = line[:_STAMP_SIZE] >= since
+                if until is not None and line[:_STAMP_SIZE] >= until:
+                    return
+            if started:
+                yield line
+    finally:
+        f.close()
+
+
+def _search(data, stamp):
+    """ Offset of the first timestamped line at or after stamp ( or the file size ) -private """
+    lo, hi = 0, len(data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = _line_at(data, mid)
+        if start >= hi or data[start:start + _STAMP_SIZE] >= stamp:
+            hi = mid
+        else:
+            lo = start + 1
+    return _line_at(data, lo)
+
+
+def _line_at(data, offset):
+    """ Start of the first timestamped line at or after offset -private """
+    size = len(data)
+    if offset:
+        nl = data.find(b'\n', offset - 1)
+        offset = size if nl < 0 else nl + 1
+    while offset < size and not _STAMP.match(data, offset):
+        nl = data.find(b'\n', offset)
+        offset = size if nl < 0 else nl + 1
+    return offset
+
+
+def _entries(lines, needle):
+    """ Groups lines into HistoryEntry records, continuation lines joining the entry above -private """
+    stamp = None
+    text = []
+    for line in lines:
+        line = line.rstrip(b'\r\n')
+        if _STAMP.match(line):
+            if stamp is not None:
+                entry = _entry(stamp, text, needle)
+                if entry is not None:
+                    yield entry
+            stamp = line[:_STAMP_SIZE]
+            text = [line[_STAMP_SIZE + 2:]]
+        elif stamp is not None:
+            text.append(line)
+    if stamp is not None:
+        entry = _entry(stamp, text, needle)
+        if entry is not None:
+            yield entry
+
+
+def _entry(stamp, text, needle):
+    text = b'\n'.join(text)
+    if needle is not None and needle not in text.lower():
+        return None
+    when = datetime.datetime(int(stamp[0:4]), int(stamp[5:7]), int(stamp[8:10]),
+                             int(stamp[11:13]), int(stamp[14:16]), int(stamp[17:19]))
+    return HistoryEntry(when, text.decode('utf-8', 'replace'))
@@ -0,0 +1,225 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Client Pool
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Several Links machines behind one object: broadcast to all of them at once, or send
+    single calls to the fastest ( or next ) healthy one.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import threading
+from time import time
+
+from .breaker import CircuitBreaker
+from .client import Client
+from .metrics import clock
+
+
+class Host(object):
+    """ One Links machine in a ClientPool and how it has been doing.
+
+        :client: The Client talking to it
+        :latency: Moving average of its successful call times in seconds ( None before the first one )
+        :calls: Calls sent to it
+        :last_used: time() of the last call
+        :failed_at: time() of the last call that couldn't reach it, None once a call succeeds again
+    """
+    __slots__ = ('client', 'latency', 'calls', 'last_used', 'failed_at')
+
+    def __init__(self, client):
+        self.client = client
+        self.latency = None
+        self.calls = 0
+        self.last_used = 0.0
+        self.failed_at = None
+
+    @property
+    def name(self):
+        return '{}:{}'.format(self.client.ip, self.client.port)
+
+    @property
+    def down(self):
+        """ True while the client's circuit breaker is open """
+        breaker = self.client.breaker
+        return breaker is not None and breaker.state != CircuitBreaker.CLOSED
+
+    def __repr__(self):
+        return 'Host({!r}, latency={!r}, down={!r}, failed={!r})'.format(
+            self.name, self.latency, self.down, self.failed_at is not None)
+
+
+class ClientPool(object):
+    """ Wraps a Client per Links machine.
+
+        - talk, Set and custom go to every host at once, each on its own thread, and return a dict
+          of host name ( 'ip:port' ) -> result
+        - CallCommand, Get and GetWord go to one host, picked by least latency or round robin. When that
+          host can't be reached the call is tried on the next one
+        - A host is out of rotation for recheck seconds after a call to it fails, and while its circuit
+          breaker is open ( see Client.breaker ). So are hosts slower than slow seconds on average, until
+          recheck seconds have passed since they were last used. When no host is healthy every host is
+          tried anyway.
+
+         :Example:
+
+              import pytronlinks
+
+              house = pytronlinks.ClientPool(['192.168.1.10', ('192.168.1.11', '54657', 'XYZ987')])
+
+              house.talk("Dinner is ready!")            # Every room at once
+              print(house.CallCommand("what time is it"))
+              print(house.health())
+
+    """
+    LEAST_LATENCY = 'least-latency'
+    ROUND_ROBIN = 'round-robin'
+    # Single-host calls that are safe to send to another host when the first can't be reached
+    _READS = ('CallCommand', 'Get', 'GetWord')
+
+    def __init__(self, targets, routing=LEAST_LATENCY, slow=1.0, recheck=30.0, **client_kwargs):
+        """
+        :param targets: Clients, ip strings or (ip, port, key) tuples ( at least one )
+        :param routing: ClientPool.LEAST_LATENCY or ClientPool.ROUND_ROBIN. OPTIONAL
+        :param slow: Average call time ( seconds ) that takes a host out of rotation. OPTIONAL
+        :param recheck: Seconds before a slow or failed host gets another call. OPTIONAL
+        :param client_kwargs: Passed on to every Client made from an ip or tuple ( ie: timeout=2 )
+        """
+        self.routing = routing
+        self.slow = slow
+        self.recheck = recheck
+        self.hosts = [Host(self._client(target, client_kwargs)) for target in targets]
+        if not self.hosts:
+            raise ValueError('ClientPool needs at least one Links host')
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def talk(self, text):
+        """ Speaks on every host at once """
+        return self.broadcast('talk', text)
+
+    def Set(self, var_name, var_value):
+        """ Sets a variable on every host at once """
+        return self.broadcast('Set', var_name, var_value)
+
+    def custom(self, string):
+        """ Runs an action string on every host at once """
+        return self.broadcast('custom', string)
+
+    def CallCommand(self, command):
+        """ Calls a command on one host and returns its response """
+        return self.call('CallCommand', command)
+
+    def Get(self, var_name):
+        return self.call('Get', var_name)
+
+    def GetWord(self, wordlist, grammar, column):
+        return self.call('GetWord', wordlist, grammar, column)
+
+    def broadcast(self, method, *args):
+        """ Calls a Client method on every host, concurrently
+
+        :param method: Client method name ( ie: 'talk' )
+        :return: Returns a dict of host name -> result
+        """
+        results = {}
+
+        def run(host):
+            results[host.name] = self._timed(host, method, args)
+
+        threads = [threading.Thread(target=run, args=(host,)) for host in self.hosts[1:]]
+        for t in threads:
+            t.start()
+        if self.hosts:
+            run(self.hosts[0])
+        for t in threads:
+            t.join()
+        return results
+
+    def call(self, method, *args):
+        """ Calls a Client method on the host picked by the routing, returns its result. Reads that fail
+        are tried on the next host, until every host has had a go.
+        """
+        tried = []
+        while True:
+            host = self.pick(exclude=tried)
+            result = self._timed(host, method, args)
+            if host.failed_at is None or method not in self._READS:
+                return result
+            tried.append(host)
+            if len(tried) >= len(self.hosts):
+                return result
+
+    def pick(self, exclude=()):
+        """ Returns the Host the next single-target call goes to
+
+        :param exclude: Hosts not to pick ( ie: already tried ). OPTIONAL
+        """
+        with self._lock:
+            now = time()
+            hosts = [h for h in self.hosts if h not in exclude] or self.hosts
+            candidates = [h for h in hosts if not h.down and
+                          (h.failed_at is None or now - h.failed_at >= self.recheck) and
+                          (h.latency is None or h.latency < self.slow or now - h.last_used >= self.recheck)]
+            if not candidates:
+                # Hosts that failed go last, after the ones that are only slow
+                candidates = [h for h in hosts if not h.down and h.failed_at is None] or \
+                             [h for h in hosts if not h.down] or hosts
+            if self.routing == self.ROUND_ROBIN:
+                host = candidates[self._next % len(candidates)]
+                self._next += 1
+            else:
+                host = min(candidates, key=lambda h: -1 if h.latency is None else h.latency)
+            host.last_used = now
+            return host
+
+    def health(self):
+        """ Returns a list of dicts with host, state ( 'up', 'slow' or 'down' ), latency and calls """
+        with self._lock:
+            return [{
+                'host': h.name,
+                'state': 'down' if h.down or h.failed_at is not None else
+                         'slow' if h.latency is not None and h.latency >= self.slow else 'up',
+                'latency': h.latency,
+                'calls': h.calls,
+            } for h in self.hosts]
+
+    def close(self):
+        for host in self.hosts:
+            host.client.close()
+
+    def _timed(self, host, method, args):
+        """ Calls the method and records the outcome. Only successful calls count towards latency -private """
+        client = host.client
+        client._outcome.failed = False
+        failed = True
+        started = clock()
+        try:
+            result = getattr(client, method)(*args)
+            failed = client._failed()
+            return result
+        finally:
+            elapsed = clock() - started
+            with self._lock:
+                host.calls += 1
+                host.last_used = time()
+                if failed:
+                    host.failed_at = host.last_used
+                else:
+                    host.failed_at = None
+                    host.latency = elapsed if host.latency is None else host.latency * 0.8 + elapsed * 0.2
+
+    @staticmethod
+    def _client(target, client_kwargs):
+        if isinstance(target, Client):
+            return target
+        if isinstance(target, (tuple, list)):
+            keys = ('ip', 'port', 'key')
+            kwargs = dict(client_kwargs)
+            kwargs.update(zip(keys, target))
+            return Client(**kwargs)
+        return Client(ip=target, **client_kwargs)
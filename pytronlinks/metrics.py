@@ -0,0 +1,204 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Metrics
+    ~~~~~~~~~~~~~~~~
+
+    Per-function call counts, errors, bytes and latency histograms for a Client.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import math
+import threading
+from timeit import default_timer as clock
+
+
+class Histogram(object):
+    """ Latency histogram with log spaced buckets, each 5% wider than the last ( from 1 us up ).
+        Recording is one log() and a dict increment, memory stays a few hundred buckets at most
+        and percentiles are accurate to within the bucket width.
+    """
+    MIN = 1e-6
+    GROWTH = 1.05
+
+    _log_growth = math.log(GROWTH)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = {}
+
+    def record(self, seconds):
+        bucket = int(math.log(seconds / self.MIN) / self._log_growth) if seconds > self.MIN else 0
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """ Returns the p-th percentile in seconds ( None when empty )
+
+        :param p: 0 to 100
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * p / 100.0)))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                # Geometric middle of the bucket, kept inside what was actually seen.
+                value = self.MIN * self.GROWTH ** (bucket + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class CallStats(object):
+    """ Counters and latency histogram for one function. open_rejections counts the calls the circuit
+        breaker turned away without sending, they aren't in calls or errors.
+    """
+    __slots__ = ('calls', 'errors', 'open_rejections', 'bytes_out', 'bytes_in', 'latency')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.open_rejections = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency = Histogram()
+
+    def as_dict(self):
+        latency = self.latency
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'open_rejections': self.open_rejections,
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'mean': latency.mean,
+            'p50': latency.percentile(50),
+            'p95': latency.percentile(95),
+            'p99': latency.percentile(99),
+            'max': latency.max,
+        }
+
+
+class Metrics(object):
+    """ Collects CallStats by name. Client records every Links function it sends ( by function name,
+        'Batch' for batches ) plus the UserVariables.xml parses and writes ( 'xml.parse', 'xml.write' ).
+        Latencies are in seconds.
+
+        exporter is called after every record with ( name, seconds, bytes_out, bytes_in, error ),
+        so numbers can be pushed to statsd, a log file and so on as they happen.
+
+         :Example:
+
+              import pytronlinks
+
+              def to_log(name, seconds, bytes_out, bytes_in, error):
+                  print("{} took {:.1f} ms".format(name, seconds * 1000))
+
+              ai = pytronlinks.Client(metrics=pytronlinks.Metrics(exporter=to_log))
+              ai.talk("Hello")
+              print(ai.stats()['Speak']['p95'])
+
+    """
+
+    def __init__(self, exporter=None):
+        """
+        :param exporter: Callable getting every recorded call. OPTIONAL
+        """
+        self.exporter = exporter
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, bytes_out=0, bytes_in=0, error=False):
+        """ Records one call
+
+        :param name: Function name ( ie: 'Speak' )
+        :param seconds: How long it took
+        :param bytes_out: Bytes sent
+        :param bytes_in: Bytes received
+        :param error: True if the call failed
+        """
+        with self._lock:
+            stats = self._calls.get(name)
+            if stats is None:
+                stats = self._calls[name] = CallStats()
+            stats.calls += 1
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            if error:
+                stats.errors += 1
+            stats.latency.record(seconds)
+        if self.exporter is not None:
+            try:
+                self.exporter(name, seconds, bytes_out, bytes_in, error)
+            except Exception as e:
+                print(e)
+                print("Exception in metrics exporter")
+
+    def error(self, name):
+        """ Counts an error against a call that was already recorded ( ie: Links answered with an error ) """
+        with self._lock:
+            stats = self._calls.get(name)
+            if stats is None:
+                stats = self._calls[name] = CallStats()
+            stats.errors += 1
+
+    def rejected(self, name):
+        """ Counts a call the circuit breaker turned away before it was sent """
+        with self._lock:
+            stats = self._calls.get(name)
+            if stats is None:
+                stats = self._calls[name] = CallStats()
+            stats.open_rejections += 1
+
+    def timer(self, name):
+        """ Context manager recording how long its block takes, as an error if it raises """
+        return _Timer(self, name)
+
+    def stats(self, reset=False):
+        """ Returns a dict of name -> dict with calls, errors, open_rejections, bytes_out, bytes_in, mean, p50,
+        p95, p99 and max
+
+        :param reset: Start counting from zero again afterwards. OPTIONAL
+        """
+        with self._lock:
+            calls = self._calls
+            if reset:
+                self._calls = {}
+            return dict((name, stats.as_dict()) for name, stats in calls.items())
+
+    def reset(self):
+        with self._lock:
+            self._calls = {}
+
+
+class _Timer(object):
+    __slots__ = ('metrics', 'name', 'bytes_out', 'bytes_in', 'started')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    def __enter__(self):
+        self.started = clock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.record(self.name, clock() - self.started, self.bytes_out, self.bytes_in, exc_type is not None)
@@ -0,0 +1,113 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Phrase Index
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Answers "which grammar and command handles this phrase?" without scanning the grammar list.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import bisect
+import re
+
+_punctuation = re.compile(r"[^\w\s']+", re.UNICODE)
+
+
+def normalize(phrase):
+    """ Lower case, punctuation dropped and whitespace collapsed. "Jarvis, come back  online" and
+    "jarvis come back online" normalize to the same key.
+    """
+    return ' '.join(_punctuation.sub(' ', phrase.lower()).split())
+
+
+class Match(object):
+    """ A command that handles a phrase.
+
+        :grammar: The Grammar the command belongs to ( see grammar.enabled and grammar.loaded )
+        :command: The command phrase exactly as Links lists it
+    """
+    __slots__ = ('grammar', 'command')
+
+    def __init__(self, grammar, command):
+        self.grammar = grammar
+        self.command = command
+
+    @property
+    def active(self):
+        """ True when the grammar is both enabled and loaded, ie: Links will actually respond """
+        return self.grammar.enabled and self.grammar.loaded
+
+    def __repr__(self):
+        return 'Match({!r}, {!r})'.format(self.grammar.name, self.command)
+
+
+class PhraseIndex(object):
+    """ Exact and prefix lookups over every command phrase of a set of grammars.
+        Exact lookups are a dict hit, prefix lookups a binary search over the sorted phrases.
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client()
+
+              index = ai.phrase_index()
+              for match in index.lookup("What time is it?"):
+                  if match.active:
+                      ai.emulate_speech(match.command)
+
+    """
+
+    def __init__(self, grammars=()):
+        """
+        :param grammars: Iterable of Grammar objects ( see Client.iter_grammars )
+        """
+        self._exact = {}
+        self._keys = []
+        self.refresh(grammars)
+
+    def refresh(self, grammars):
+        """ Rebuilds the index from a fresh set of grammars """
+        exact = {}
+        for grammar in grammars:
+            for command in grammar.commands:
+                if command:
+                    exact.setdefault(normalize(command), []).append(Match(grammar, command))
+        self._exact = dict((key, tuple(matches)) for key, matches in exact.items())
+        self._keys = sorted(self._exact)
+
+    def lookup(self, phrase):
+        """ Returns every Match whose command is the phrase ( after normalize ), as a tuple """
+        return self._exact.get(normalize(phrase), ())
+
+    def prefix(self, phrase, whole_words=True, limit=None):
+        """ Yields every Match whose command starts with the phrase, in alphabetical order.
+
+        :param phrase: Start of a command
+        :param whole_words: Only match on word boundaries ( "what time" won't match "what timer" ). OPTIONAL
+        :param limit: Stop after this many commands. OPTIONAL
+        """
+        start = normalize(phrase)
+        keys = self._keys
+        found = 0
+        i = bisect.bisect_left(keys, start)
+        while i < len(keys) and keys[i].startswith(start):
+            key = keys[i]
+            i += 1
+            if whole_words and start and len(key) > len(start) and key[len(start)] != ' ':
+                continue
+            for match in self._exact[key]:
+                yield match
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+    def __contains__(self, phrase):
+        return normalize(phrase) in self._exact
+
+    def __len__(self):
+        return len(self._keys)
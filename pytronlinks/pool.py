@@ -0,0 +1,181 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Connection Pool
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Persistent HTTP/1.1 keep-alive connections to the Links web service.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import errno
+import select
+import socket
+import threading
+from time import time
+
+from .compat import httplib
+
+# A kept-alive connection Links has already dropped fails with one of these on its next use.
+_STALE_ERRNOS = (errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED)
+
+
+class ConnectionPool(object):
+    """ Holds idle keep-alive connections per (ip, port) and hands them out again.
+
+         :Example:
+
+              from pytronlinks.pool import ConnectionPool
+
+              pool = ConnectionPool(maxsize=4)
+              status, body = pool.request('localhost', 54657, '/?action=[Speak("hi")]&key=ABC1234')
+              print(pool.stats())
+
+    """
+
+    def __init__(self, maxsize=4, timeout=None):
+        """ Create an empty pool. Connections are opened lazily on first use.
+
+        :param maxsize: Max idle connections kept per (ip, port)
+        :param timeout: Socket timeout in seconds for new connections ( None blocks forever )
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'created': 0,
+            'reused': 0,
+            'reconnects': 0,
+            'discarded': 0,
+        }
+
+    def request(self, host, port, path, timeout=None, idempotent=False, deadline=None):
+        """ Sends a GET request over a pooled connection and reads the whole response.
+
+        Idle connections Links has already closed are dropped before use. If a reused connection still
+        turns out to be dead ( reset, or closed before any response came back ) the request is sent again
+        once on a fresh connection: always when writing the request failed, otherwise only when it is
+        idempotent. Timeouts are never retried here. With a deadline the second send only gets what is
+        left of it.
+
+        :param host: ip or host name of the computer running Links
+        :param port: Port that Links is listening on
+        :param path: Request path, already quoted ( ie: '/?action=...&key=...' )
+        :param timeout: Socket timeout in seconds for this request. OPTIONAL. Defaults to the pool timeout
+        :param idempotent: Safe to send twice ( reads only ). OPTIONAL
+        :param deadline: time() by which the request has to be answered, resend included. OPTIONAL
+        :return: Returns a (status, body) tuple
+        """
+        key = (host, int(port))
+        if timeout is None:
+            timeout = self.timeout
+        conn, reused = self._acquire(key)
+        sent = []
+        try:
+            status, body, will_close = self._send(conn, path, timeout, sent)
+        except (httplib.HTTPException, socket.error) as e:
+            conn.close()
+            if not reused or not _stale(e) or (sent and not idempotent):
+                raise
+            if deadline is not None:
+                timeout = deadline - time() if timeout is None else min(timeout, deadline - time())
+                if timeout <= 0:
+                    raise socket.timeout('Deadline passed before the request could be sent again')
+            self._count('reconnects')
+            conn = self._connect(key)
+            try:
+                status, body, will_close = self._send(conn, path, timeout)
+            except Exception:
+                conn.close()
+                raise
+        self._count('requests')
+        if will_close:
+            conn.close()
+            self._count('discarded')
+        else:
+            self._release(key, conn)
+        return status, body
+
+    def stats(self):
+        """ Returns a snapshot of the pool counters plus the number of idle connections per host. """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = dict(('{}:{}'.format(*k), len(v)) for k, v in self._idle.items())
+        return stats
+
+    def close(self):
+        """ Closes every idle connection. The pool can still be used afterwards. """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    @staticmethod
+    def _send(conn, path, timeout=None, sent=None):
+        # Applies to the connect of a new connection as well as every read on an open one.
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request('GET', path, headers={'Connection': 'keep-alive'})
+        if sent is not None:
+            sent.append(True)
+        r = conn.getresponse()
+        body = r.read()
+        return r.status, body, r.will_close
+
+    def _acquire(self, key):
+        while True:
+            with self._lock:
+                conns = self._idle.get(key)
+                if not conns:
+                    break
+                conn = conns.pop()
+            if _closed(conn):
+                conn.close()
+                self._count('discarded')
+                continue
+            self._count('reused')
+            return conn, True
+        return self._connect(key), False
+
+    def _connect(self, key):
+        self._count('created')
+        return httplib.HTTPConnection(key[0], key[1])
+
+    def _release(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.maxsize:
+                conns.append(conn)
+                return
+            self._stats['discarded'] += 1
+        conn.close()
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+def _closed(conn):
+    """ True when an idle connection has been closed by Links ( or has unexpected data waiting ) -private """
+    if conn.sock is None:
+        return True
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (select.error, socket.error, ValueError):
+        return True
+
+
+def _stale(error):
+    """ True for errors of a connection that was dead before the request got an answer -private """
+    if isinstance(error, socket.timeout):
+        return False
+    if isinstance(error, httplib.BadStatusLine):
+        return True
+    return isinstance(error, socket.error) and getattr(error, 'errno', None) in _STALE_ERRNOS
@@ -0,0 +1,89 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Response Decoding
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Turns Links web service replies into Response objects. Each body is parsed in
+    one pass with the json or xml parser, wherever the payload starts in the body.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import ast
+import json
+import re
+import xml.etree.ElementTree as ET
+
+
+_decoder = json.JSONDecoder()
+_xml_start = re.compile(r'<[?!A-Za-z_]')
+
+
+class Response(object):
+    """ A decoded Links reply.
+
+        :status: HTTP status code
+        :response: Text Links returned for the action ( '' when there is none )
+        :error: Error text reported by Links ( '' when the action worked )
+    """
+    __slots__ = ('status', 'response', 'error')
+
+    def __init__(self, status, response, error):
+        self.status = status
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        """ True when Links answered 200 without an error """
+        return self.status == 200 and not self.error
+
+    def __repr__(self):
+        return 'Response(status={!r}, response={!r}, error={!r})'.format(self.status, self.response, self.error)
+
+
+def decode_json(body, status=200):
+    """ Decodes an output=json reply. The json object may be preceded by any number of lines.
+
+    :param body: Response body text
+    :param status: HTTP status code
+    :return: Returns a Response
+    :raises ValueError: When no json object with a response field is found
+    """
+    start = body.find('{')
+    while start != -1:
+        try:
+            obj, end = _decoder.raw_decode(body, start)
+        except ValueError:
+            obj = _literal(body, start)
+        if isinstance(obj, dict) and 'response' in obj:
+            return Response(status, obj['response'] or '', obj.get('error') or '')
+        start = body.find('{', start + 1)
+    raise ValueError('No Links response found in body')
+
+
+def decode_xml(body, status=200):
+    """ Decodes an output=xml reply. Anything in front of the xml document is skipped.
+
+    :param body: Response body text
+    :param status: HTTP status code
+    :return: Returns a Response
+    :raises ValueError: When the body holds no xml document
+    """
+    match = _xml_start.search(body)
+    if not match:
+        raise ValueError('No Links response found in body')
+    root = ET.fromstring(body[match.start():])
+    return Response(status, root.findtext('response') or '', root.findtext('error') or '')
+
+
+def _literal(body, start):
+    """ Falls back on the literal_eval reading _get_request has always used, for replies json rejects -private """
+    end = body.find('\n', start)
+    try:
+        return ast.literal_eval(body[start:end if end != -1 else None].strip())
+    except (ValueError, SyntaxError):
+        return None
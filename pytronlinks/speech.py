@@ -0,0 +1,312 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Speech Queue
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Speaks in the background so callers don't wait on Links, and splits long text into chunks
+    that can be spoken while the rest is still being read.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import heapq
+import itertools
+import re
+import threading
+from time import time
+
+from . import actions
+from .compat import string_types
+
+# End of a sentence ( with any closing quotes or brackets ) or a blank line
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n\s*\n')
+_CLAUSE_END = re.compile(r'[,;:]\s+')
+# Words whose full stop doesn't end the sentence
+_ABBREVIATIONS = frozenset(['mr', 'mrs', 'ms', 'dr', 'st', 'jr', 'sr', 'vs', 'etc', 'e.g', 'i.e', 'approx'])
+# Words that are only abbreviations before a number ( 'No. 5' but not 'I said no. Then...' )
+_NUMBER_ABBREVIATIONS = frozenset(['no'])
+_LAST_WORD = re.compile(r'([\w.]+)\.$')
+
+LOW = 0
+NORMAL = 1
+HIGH = 2
+
+
+class SpeechQueue(object):
+    """ Bounded priority queue of things to say, spoken one request at a time by a worker thread.
+
+        - Higher priorities are spoken first, equal priorities in the order they came in
+        - Runs of queued LOW priority text are merged into one [Speak] request
+        - Text still waiting past its deadline is dropped
+        - A HIGH priority item cuts off whatever Links is saying, when the queue knows the voice
+          name ( StopVoiceByName ) or identifier ( StopVoiceByIdentifier )
+        - When the queue is full put() waits for room, or drops the oldest lower priority item
+
+        Use Client.talk_async() rather than creating one directly.
+    """
+    LOW = LOW
+    NORMAL = NORMAL
+    HIGH = HIGH
+    TTL = {LOW: 10.0, NORMAL: 30.0, HIGH: None}
+
+    def __init__(self, client, maxsize=64, voice=None, identifier=None, max_merge=400):
+        """
+        :param client: Client to speak through
+        :param maxsize: Most items waiting at once
+        :param voice: Voice name to stop when a HIGH priority item comes in. OPTIONAL
+        :param identifier: Voice identifier to stop instead of a name. OPTIONAL
+        :param max_merge: Longest text LOW priority items are merged into
+        """
+        self.client = client
+        self.maxsize = maxsize
+        self.voice = voice
+        self.identifier = identifier
+        self.max_merge = max_merge
+        self._heap = []
+        self._order = itertools.count()
+        self._busy = False
+        self._closed = False
+        self._worker = None
+        self._last_priority = None
+        self._cond = threading.Condition()
+        self._stats = dict.fromkeys(('queued', 'requests', 'merged', 'expired', 'dropped', 'preempted'), 0)
+
+    def put(self, text, priority=NORMAL, ttl=False, block=True, timeout=None):
+        """ Queues text to be spoken and returns straight away ( unless the queue is full ).
+
+        :param text: Text to speak
+        :param priority: SpeechQueue.LOW, NORMAL or HIGH. OPTIONAL
+        :param ttl: Seconds the text may wait before it is dropped, None for no limit.
+                    OPTIONAL. Defaults to SpeechQueue.TTL for the priority
+        :param block: Wait for room when the queue is full. OPTIONAL
+        :param timeout: Longest wait for room, in seconds. OPTIONAL
+        :return: Returns True if queued, False if there was no room
+        """
+        if ttl is False:
+            ttl = self.TTL.get(priority)
+        deadline = time() + ttl if ttl else None
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._heap) >= self.maxsize and not self._drop_lower(priority):
+                if not block:
+                    self._stats['dropped'] += 1
+                    return False
+                end = None if timeout is None else time() + timeout
+                while len(self._heap) >= self.maxsize and not self._closed:
+                    remaining = None if end is None else end - time()
+                    if remaining is not None and remaining <= 0:
+                        self._stats['dropped'] += 1
+                        return False
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return False
+            heapq.heappush(self._heap, (-priority, next(self._order), text, deadline))
+            self._stats['queued'] += 1
+            self._start()
+            self._cond.notify_all()
+        return True
+
+    def join(self, timeout=None):
+        """ Waits until everything queued has been sent.
+
+        :return: Returns True when the queue emptied, False on timeout
+        """
+        end = None if timeout is None else time() + timeout
+        with self._cond:
+            while self._heap or self._busy:
+                remaining = None if end is None else end - time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def clear(self):
+        """ Drops everything still waiting """
+        with self._cond:
+            self._stats['dropped'] += len(self._heap)
+            del self._heap[:]
+            self._cond.notify_all()
+
+    def close(self):
+        """ Drops what is still waiting and stops the worker once the current request is done """
+        with self._cond:
+            self._closed = True
+            del self._heap[:]
+            self._cond.notify_all()
+            worker, self._worker = self._worker, None
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+
+    def stats(self):
+        """ Returns a dict with queued, requests, merged, expired, dropped, preempted and pending """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._heap)
+            return stats
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    def _start(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='pytron-speech')
+            self._worker.daemon = True
+            self._worker.start()
+
+    def _drop_lower(self, priority):
+        """ Makes room by dropping the oldest item of the lowest priority below priority -private """
+        neg = max(item[0] for item in self._heap)
+        if -neg >= priority:
+            return False
+        lowest = min(item for item in self._heap if item[0] == neg)
+        self._heap.remove(lowest)
+        heapq.heapify(self._heap)
+        self._stats['dropped'] += 1
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                priority, text = self._next()
+                if text is None:
+                    continue
+                self._busy = True
+            try:
+                self._speak(priority, text)
+            except Exception as e:
+                print(e)
+                print("Exception in speech queue")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _next(self):
+        """ Pops the next text to say, merging a run of LOW items -private
+
+        :return: Returns a (priority, text) tuple, text is None when everything popped had expired
+        """
+        now = time()
+        parts = []
+        priority = None
+        while self._heap:
+            neg, order, text, deadline = self._heap[0]
+            if deadline is not None and deadline < now:
+                heapq.heappop(self._heap)
+                self._stats['expired'] += 1
+                continue
+            if parts and (priority != LOW or -neg != LOW or
+                          sum(len(p) + 1 for p in parts) + len(text) > self.max_merge):
+                break
+            heapq.heappop(self._heap)
+            priority = -neg
+            parts.append(text)
+        self._cond.notify_all()
+        if not parts:
+            return None, None
+        self._stats['merged'] += len(parts) - 1
+        return priority, _join(parts)
+
+    def _speak(self, priority, text):
+        fcn = actions.Speak(text)
+        if priority >= HIGH and self._last_priority is not None and self._last_priority < HIGH:
+            stop = self._stop_action()
+            if stop:
+                fcn = stop + fcn
+                self._stats['preempted'] += 1
+        self._last_priority = priority
+        self._stats['requests'] += 1
+        self.client._get_request(fcn)
+
+    def _stop_action(self):
+        if self.voice:
+            return actions.StopVoiceByName(self.voice, '')
+        if self.identifier:
+            return actions.StopVoiceByIdentifier(self.identifier, '')
+        return ''
+
+
+def _join(parts):
+    """ Joins sentences, adding a full stop where one is missing -private """
+    if len(parts) == 1:
+        return parts[0]
+    out = []
+    for part in parts:
+        part = part.strip()
+        if part and part[-1] not in '.!?,;:':
+            part += '.'
+        out.append(part)
+    return ' '.join(out)
+
+
+def chunk_text(text, max_chars=300):
+    """ Splits text into sentences, lazily. Sentences longer than max_chars are split again at a clause
+    ( , ; : ) or, failing that, at a space.
+
+    :param text: A string, or any iterable of strings ( ie: lines or paragraphs as they are downloaded ).
+                 Pieces are joined as they come in, so a sentence may span several of them
+    :param max_chars: Longest chunk. OPTIONAL
+    """
+    pieces = (text,) if isinstance(text, string_types) else text
+    buf = ''
+    for piece in pieces:
+        buf += piece
+        pos = 0
+        while True:
+            match = _SENTENCE_END.search(buf, pos)
+            if match is None:
+                break
+            word = _LAST_WORD.search(buf, max(0, match.start() - 16), match.start() + 1)
+            word = word.group(1).lower() if word is not None else None
+            if word in _ABBREVIATIONS:
+                pos = match.end()
+                continue
+            if word in _NUMBER_ABBREVIATIONS:
+                if match.end() == len(buf):
+                    break  # Wait for the next piece to see if a number follows
+                if buf[match.end()].isdigit():
+                    pos = match.end()
+                    continue
+            for chunk in _split_long(buf[:match.end()], max_chars):
+                yield chunk
+            buf = buf[match.end():]
+            pos = 0
+        while len(buf) > max_chars:
+            cut = _cut(buf, max_chars)
+            yield buf[:cut].strip()
+            buf = buf[cut:]
+    for chunk in _split_long(buf, max_chars):
+        yield chunk
+
+
+def _split_long(sentence, max_chars):
+    """ Yields a sentence in pieces of at most max_chars, skipping blank ones -private """
+    while len(sentence) > max_chars:
+        cut = _cut(sentence, max_chars)
+        chunk = sentence[:cut].strip()
+        if chunk:
+            yield chunk
+        sentence = sentence[cut:]
+    sentence = sentence.strip()
+    if sentence:
+        yield sentence
+
+
+def _cut(text, max_chars):
+    """ Where to split text that is too long: after the last clause end, else the last space -private """
+    clause = None
+    for clause in _CLAUSE_END.finditer(text, 0, max_chars + 1):
+        pass
+    if clause is not None:
+        return clause.end()
+    space = text.rfind(' ', 0, max_chars + 1)
+    return space + 1 if space > 0 else max_chars
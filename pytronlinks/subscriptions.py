@@ -0,0 +1,98 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Subscriptions
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    One loop that listens to many UserVariables.xml variables at once.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import threading
+
+
+class Dispatcher(object):
+    """ Watches every subscribed variable from one read of UserVariables.xml per change. When a
+        variable gets a new value its callback is called with it, and all consumed values are
+        cleared again in one write.
+
+        Use Client.subscribe() and Client.run_forever() rather than creating one directly.
+    """
+
+    def __init__(self, store, watcher):
+        """
+        :param store: VariableStore for UserVariables.xml
+        :param watcher: Watcher for the same file ( see pytronlinks.watcher.watch )
+        """
+        self.store = store
+        self.watcher = watcher
+        self._callbacks = {}
+        self._last = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def subscribe(self, callbacks):
+        """ Adds or replaces callbacks.
+
+        :param callbacks: Dict of variable name -> callback( value )
+        """
+        with self._lock:
+            self._callbacks.update(callbacks)
+
+    def unsubscribe(self, names):
+        """ Removes the callbacks for the given variable names """
+        with self._lock:
+            for name in names:
+                self._callbacks.pop(name, None)
+                self._last.pop(name, None)
+
+    def poll(self):
+        """ Checks every subscribed variable once and fires callbacks for new values.
+
+        :return: Returns the number of callbacks that were called
+        """
+        with self._lock:
+            callbacks = dict(self._callbacks)
+        values = self.store.get_many(callbacks)
+        fired = []
+        for name, value in values.items():
+            if value and value != self._last.get(name):
+                self._last[name] = value
+                fired.append(name)
+        if not fired:
+            return 0
+        try:
+            self.store.clear_many(fired)
+            for name in fired:
+                self._last[name] = None
+        except Exception as e:
+            # Fired values are remembered, so they won't fire again until they change.
+            print("Exception clearing subscribed variables")
+            print(e)
+        for name in fired:
+            try:
+                callbacks[name](values[name])
+            except Exception as e:
+                print("Exception in callback for {}".format(name))
+                print(e)
+        return len(fired)
+
+    def run_forever(self, check_stop=1.0):
+        """ Clears the subscribed variables, then dispatches changes until stop() is called.
+
+        :param check_stop: How often ( in seconds ) a blocked wait looks at the stop flag
+        """
+        self._stop.clear()
+        with self._lock:
+            names = list(self._callbacks)
+        self.store.clear_many(names)
+        while not self._stop.is_set():
+            self.poll()
+            self.watcher.wait(check_stop)
+
+    def stop(self):
+        """ Makes run_forever return after its current wait """
+        self._stop.set()
@@ -0,0 +1,226 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - User Variables
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Cached, indexed access to Links' UserVariables.xml file.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+
+from .compat import string_types
+
+# Times write_many re-reads the file when it changed under it, the last attempt writes regardless
+_WRITE_ATTEMPTS = 3
+
+
+class VariableStore(object):
+    """ Parses UserVariables.xml once into a name -> value dict. Every lookup checks os.stat
+        ( mtime, size, inode ) and only re-parses the file when one of them changed.
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client()
+
+              print(ai.variables.get('Pytron'))
+              print(ai.variables.get_many(['Pytron', 'Answer']))
+
+    """
+
+    def __init__(self, path, metrics=None, on_write=None):
+        """
+        :param path: Full path to UserVariables.xml
+        :param metrics: Metrics to time parses and writes with ( as 'xml.parse' and 'xml.write' ). OPTIONAL
+        :param on_write: Called with the list of names after every write_many / clear_many. OPTIONAL
+        """
+        self.path = path
+        self.metrics = metrics
+        self.on_write = on_write
+        self.parses = 0
+        self._signature = None
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, default=False):
+        """ Returns the value of a variable ( None when it is empty )
+
+        :param name: Variable name
+        :param default: Returned when there is no such variable. OPTIONAL. Defaults to False like _get_xml
+        """
+        with self._lock:
+            self._refresh()
+            return self._values.get(name, default)
+
+    def get_many(self, names, default=False):
+        """ Looks up several variables against a single check of the file.
+
+        :param names: Iterable of variable names
+        :param default: Used for names that don't exist. OPTIONAL
+        :return: Returns a dict of name -> value
+        """
+        with self._lock:
+            self._refresh()
+            values = self._values
+            return dict((name, values.get(name, default)) for name in names)
+
+    def names(self):
+        """ Returns a list of every variable name in the file """
+        with self._lock:
+            self._refresh()
+            return list(self._values)
+
+    def clear_many(self, names):
+        """ Empties the value of several variables with one parse and one write of the file.
+
+        :param names: Iterable of variable names
+        """
+        self.write_many(dict((name, None) for name in names))
+
+    def write_many(self, values):
+        """ Sets several variables with one parse and one write of the file. The new file is written
+        next to the old one and renamed into place, so a crash can't leave it half written.
+        Variables that don't exist yet are added.
+
+        :param values: Dict of name -> value ( None empties the value )
+        """
+        if not values:
+            return
+        with self._lock:
+            for attempt in range(_WRITE_ATTEMPTS):
+                # Links may write the file while we rewrite it, start over rather than lose its change
+                expected = None if attempt == _WRITE_ATTEMPTS - 1 else _signature(self.path)
+                tree = self._load()
+                root = tree.getroot()
+                pending = dict(values)
+                for variable in root.findall('Variable'):
+                    name = variable.findtext('Name')
+                    if name in pending:
+                        self._set_value(variable, pending.pop(name))
+                for name in sorted(pending):
+                    variable = ET.SubElement(root, 'Variable')
+                    ET.SubElement(variable, 'Name').text = name
+                    self._set_value(variable, pending[name])
+                if self.metrics is None:
+                    signature = self._write(tree, expected)
+                else:
+                    with self.metrics.timer('xml.write') as timer:
+                        signature = self._write(tree, expected)
+                        timer.bytes_out = signature[1] if signature else 0
+                if signature is not None:
+                    break
+            self._values = self._index(root)
+            self._signature = signature
+        if self.on_write is not None:
+            self.on_write(list(values))
+
+    def refresh(self):
+        """ Re-parses the file if it changed.
+
+        :return: Returns True when the file was parsed again
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        signature = _signature(self.path)
+        if signature == self._signature:
+            return False
+        self._values = self._parse()
+        self._signature = signature
+        return True
+
+    def _parse(self):
+        return self._index(self._load().getroot())
+
+    def _load(self):
+        """ Parses the file, timed as 'xml.parse' when there are metrics -private """
+        self.parses += 1
+        if self.metrics is None:
+            return ET.parse(self.path)
+        with self.metrics.timer('xml.parse') as timer:
+            tree = ET.parse(self.path)
+            timer.bytes_in = os.path.getsize(self.path)
+        return tree
+
+    def _write(self, tree, expected=None):
+        """ Writes the tree to a temp file and renames it over the original -private
+
+        :param expected: Stat signature the original must still have. OPTIONAL
+        :return: Returns the stat signature of the new file, or None when the original had changed
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix='.UserVariables', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                tree.write(f)
+                f.flush()
+                os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
+            try:
+                shutil.copymode(self.path, tmp)
+            except OSError:
+                pass
+            if expected is not None and _signature(self.path) != expected:
+                os.remove(tmp)
+                return None
+            try:
+                _replace(tmp, self.path)
+            except OSError:
+                # Links may hold the file open on Windows. Fall back on rewriting it in place.
+                tree.write(self.path)
+                os.remove(tmp)
+                st = os.stat(self.path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return st.st_mtime, st.st_size, st.st_ino
+
+    @staticmethod
+    def _set_value(variable, value):
+        v = variable.find('Value')
+        if v is None:
+            v = ET.SubElement(variable, 'Value')
+        v.clear()
+        if value is not None:
+            v.text = value if isinstance(value, string_types) else str(value)
+
+    @staticmethod
+    def _index(root):
+        values = {}
+        for variable in root.findall('Variable'):
+            name = variable.findtext('Name')
+            if name not in values:
+                value = variable.find('Value')
+                values[name] = value.text if value is not None else None
+        return values
+
+
+def _signature(path):
+    """ (mtime, size, inode) of a file, what the cache is keyed on -private """
+    st = os.stat(path)
+    return st.st_mtime, st.st_size, st.st_ino
+
+
+def _replace(src, dst):
+    """ Atomically renames src over dst -private """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    elif os.name == 'nt':
+        import ctypes
+        # MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH
+        if not ctypes.windll.kernel32.MoveFileExW(unicode(src), unicode(dst), 0x1 | 0x8):
+            raise ctypes.WinError()
+    else:
+        os.rename(src, dst)
@@ -0,0 +1,181 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - File Watcher
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Block until a file changes. Uses inotify on Linux and falls back on
+    checking os.stat ( mtime, size, inode ) everywhere else.
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import errno
+import os
+import select
+import struct
+import sys
+from time import sleep, time
+
+_libc = None
+if sys.platform.startswith('linux'):
+    try:
+        import ctypes
+        import ctypes.util
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        _libc.inotify_init1
+    except (ImportError, OSError, AttributeError):
+        _libc = None
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct('iIII')
+
+
+def watch(path, interval=0.2, appends=False):
+    """ Returns the best watcher available for path.
+
+    :param path: File to watch. It doesn't have to exist yet
+    :param interval: Delay ( in seconds ) between checks when inotify isn't available
+    :param appends: Also wake on every write and on the file being created, not just when a writer
+                    closes it. For files that are appended to while held open. OPTIONAL
+    :return: Returns an InotifyWatcher or a PollingWatcher
+
+    :Example:
+
+        from pytronlinks.watcher import watch
+
+        watcher = watch(r'C:\\Users\\me\\AppData\\Roaming\\LINKS\\Customization\\XML\\UserVariables.xml')
+        while watcher.wait():
+            print("UserVariables.xml changed!")
+    """
+    if _libc is not None:
+        try:
+            return InotifyWatcher(path, interval, appends)
+        except OSError:
+            pass
+    return PollingWatcher(path, interval)
+
+
+class PollingWatcher(object):
+    """ Wakes up when os.stat reports a new mtime, size or inode for the file.
+        Much cheaper than re-parsing the file itself every time.
+    """
+
+    def __init__(self, path, interval=0.2):
+        self.path = path
+        self.interval = interval
+        self._last = self._signature()
+
+    def wait(self, timeout=None):
+        """ Blocks until the file changes since the last call ( or since the watcher was made ).
+
+        :param timeout: Seconds to wait. OPTIONAL. Waits forever by default
+        :return: Returns True when the file changed, False on timeout
+        """
+        deadline = None if timeout is None else time() + timeout
+        while True:
+            sig = self._signature()
+            if sig != self._last:
+                self._last = sig
+                return True
+            delay = self.interval
+            if deadline is not None:
+                remaining = deadline - time()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            sleep(delay)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size, st.st_ino
+
+
+class InotifyWatcher(PollingWatcher):
+    """ Sleeps in the kernel until the file is closed after writing or renamed into place ( or, with
+        appends, written to or created ). The parent directory is watched, so files Links replaces on
+        write are followed too.
+    """
+
+    def __init__(self, path, interval=0.2, appends=False):
+        PollingWatcher.__init__(self, path, interval)
+        directory, name = os.path.split(os.path.abspath(path))
+        if not isinstance(name, bytes):
+            name = name.encode(sys.getfilesystemencoding())
+            directory = directory.encode(sys.getfilesystemencoding())
+        self._name = name
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO
+        if appends:
+            mask |= IN_MODIFY | IN_CREATE
+        if _libc.inotify_add_watch(self._fd, directory, mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            self._fd = None
+            raise OSError(err, 'inotify_add_watch failed')
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time(), 0)
+            try:
+                ready = select.select([self._fd], [], [], remaining)[0]
+            except (select.error, OSError) as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+            if not ready:
+                return False
+            if self._read_events():
+                self._last = self._signature()
+                return True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_events(self):
+        """ Drains pending events and reports if any of them were for our file -private """
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return False
+            raise
+        hit = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & (IN_Q_OVERFLOW | IN_IGNORED) or name == self._name:
+                hit = True
+        return hit
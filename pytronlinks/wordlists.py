@@ -0,0 +1,221 @@
+# -*- coding: UTF-8 -*-
+
+"""
+    Pytron - Wordlists
+    ~~~~~~~~~~~~~~~~~~
+
+    Read Links wordlist files straight from the Customization folder instead of asking
+    Links for one cell at a time with [GetWord].
+
+
+    :copyright: (c) 2016 by Scott Doucet / aka: traBpUkciP
+    :license: BSD, see LICENSE for more details.
+"""
+
+import contextlib
+import mmap
+import os
+import re
+import threading
+
+from .compat import string_types
+
+_BOM = b'\xef\xbb\xbf'
+_wide_space = re.compile(r'\s{2,}')
+
+
+class Wordlist(object):
+    """ One wordlist file, read through a memory map. The first line names the columns, the first column holds
+        the grammar ( alternatives separated by ';' ) and columns are tab separated:
+
+            yes or no answers<TAB>clean response
+            yes; yes please; affirmative<TAB>yes
+            no; nope; no thanks<TAB>no
+
+        Row offsets are indexed once and indexed again whenever the mtime or size changes. The file
+        is only open and mapped while a lookup reads it ( Windows won't let Links save a file that
+        is mapped ), and cells are only decoded when asked for.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Full path to the wordlist file
+        """
+        self.path = path
+        self.columns = []
+        self._signature = None
+        self._rows = []
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def get(self, grammar, column):
+        """ Same lookup as [GetWord("wordlist", "grammar", "column")]
+
+        :param grammar: Any of the alternatives in the first column ( case insensitive )
+        :param column: Column name, or its position ( 0 is the grammar column )
+        :return: Returns the cell text, or None if there is no such row or column
+        """
+        with self._lock, self._mapped() as data:
+            row = self._index.get(_key(grammar))
+            position = self._position(column)
+            if row is None or position is None:
+                return None
+            cells = _cells(data, row)
+            return cells[position] if position < len(cells) else None
+
+    def column(self, column):
+        """ Yields a column's value for every row, in file order
+
+        :param column: Column name, or its position ( 0 is the grammar column )
+        """
+        with self._lock, self._mapped() as data:
+            position = self._position(column)
+            if position is None:
+                return
+            lines = [data[start:end] for start, end in self._rows]
+        for line in lines:
+            cells = _split(_decode(line))
+            yield cells[position] if position < len(cells) else None
+
+    def rows(self):
+        """ Yields every row as a list of cells """
+        with self._lock, self._mapped() as data:
+            lines = [data[start:end] for start, end in self._rows]
+        for line in lines:
+            yield _split(_decode(line))
+
+    def close(self):
+        """ Drops the index, the next lookup builds it again """
+        with self._lock:
+            self.columns, self._rows, self._index = [], [], {}
+            self._signature = None
+
+    def __len__(self):
+        with self._lock, self._mapped():
+            return len(self._rows)
+
+    @contextlib.contextmanager
+    def _mapped(self):
+        """ Maps the file for one lookup, indexing it again first if it changed -private """
+        with open(self.path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b''
+            try:
+                signature = (st.st_mtime, st.st_size, st.st_ino)
+                if signature != self._signature:
+                    self._build(data)
+                    self._signature = signature
+                yield data
+            finally:
+                if st.st_size:
+                    data.close()
+
+    def _build(self, data):
+        """ Finds every line in the file and indexes rows by their grammar alternatives -private """
+        size = len(data)
+        start = 3 if data[:3] == _BOM else 0
+        lines = []
+        while start < size:
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = size
+            stop = end - 1 if end > start and data[end - 1:end] == b'\r' else end
+            if stop > start:
+                lines.append((start, stop))
+            start = end + 1
+        if not lines:
+            self.columns, self._rows, self._index = [], [], {}
+            return
+        self.columns = _split(_decode(data[lines[0][0]:lines[0][1]]))
+        self._rows = lines[1:]
+        index = {}
+        for row in self._rows:
+            for alternative in _cells(data, row)[0].split(';'):
+                index.setdefault(_key(alternative), row)
+        self._index = index
+
+    def _position(self, column):
+        if isinstance(column, int):
+            return column
+        wanted = _key(column)
+        for i, name in enumerate(self.columns):
+            if _key(name) == wanted:
+                return i
+        if wanted.isdigit():
+            return int(wanted)
+        return None
+
+
+
+class WordlistReader(object):
+    """ Opens wordlists under a folder by name, keeping each one's index between calls.
+
+         :Example:
+
+              import pytronlinks
+
+              ai = pytronlinks.Client()
+
+              print(ai.wordlists.get("RSSFeeds", "CNN", "url"))
+              for url in ai.wordlists.column("RSSFeeds", "url"):
+                  print(url)
+
+    """
+
+    def __init__(self, root, extension='.txt'):
+        """
+        :param root: Folder holding the wordlist files
+        :param extension: File type of the wordlists. OPTIONAL. Defaults to '.txt'
+        """
+        self.root = root
+        self.extension = extension
+        self._wordlists = {}
+        self._lock = threading.Lock()
+
+    def wordlist(self, name):
+        """ Returns the Wordlist for a file name ( file type not needed ) """
+        with self._lock:
+            wordlist = self._wordlists.get(name)
+            if wordlist is None:
+                wordlist = Wordlist(os.path.join(self.root, name + self.extension))
+                self._wordlists[name] = wordlist
+            return wordlist
+
+    def get(self, wordlist, grammar, column):
+        """ Same as Client.GetWord, but read from the file
+
+        :raises IOError/OSError: When the wordlist file can't be read
+        """
+        return self.wordlist(wordlist).get(grammar, column)
+
+    def column(self, wordlist, column):
+        """ Yields a whole column of a wordlist """
+        return self.wordlist(wordlist).column(column)
+
+    def close(self):
+        with self._lock:
+            wordlists, self._wordlists = self._wordlists, {}
+        for wordlist in wordlists.values():
+            wordlist.close()
+
+
+def _cells(data, row):
+    return _split(_decode(data[row[0]:row[1]]))
+
+
+def _split(line):
+    cells = line.split('\t') if '\t' in line else _wide_space.split(line)
+    return [cell.strip() for cell in cells]
+
+
+def _decode(data):
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('mbcs' if os.name == 'nt' else 'latin-1')
+
+
+def _key(text):
+    if not isinstance(text, string_types):
+        text = str(text)
+    return ' '.join(text.lower().split())
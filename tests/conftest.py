@@ -0,0 +1,34 @@
+# -*- coding: UTF-8 -*-
+
+import os
+
+import pytest
+
+import pytronlinks
+from pytronlinks.fakelinks import FakeLinks
+
+
+@pytest.fixture
+def links():
+    with FakeLinks() as fake:
+        yield fake
+
+
+@pytest.fixture
+def customization(tmp_path):
+    """ Stand-in for %APPDATA%\\LINKS\\Customization. Client joins its folders with a backslash, so on
+    Linux the files land next to each other in tmp_path as 'XML\\UserVariables.xml' and so on.
+    """
+    return str(tmp_path) + os.sep
+
+
+@pytest.fixture
+def client(links, customization):
+    ai = pytronlinks.Client(ip=links.host, port=links.port)
+    ai._XML_PATH = customization + 'XML'
+    ai._SCRIPTS_PATH = customization + 'Scripts'
+    ai._WORDLISTS_PATH = customization + 'Wordlists'
+    links.variables_file = ai._xml_file()
+    links.set_variable('Pytron', '')
+    yield ai
+    ai.close()
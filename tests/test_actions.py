@@ -0,0 +1,46 @@
+# -*- coding: UTF-8 -*-
+
+from pytronlinks import actions
+from pytronlinks.actions import Inline
+
+
+def test_quotes_are_doubled():
+    assert actions.Speak('She said "hi"') == '[Speak("She said ""hi""")]'
+
+
+def test_nested_actions_are_passed_through():
+    assert actions.Speak('Mood is [Get("Mood")]') == '[Speak("Mood is [Get("Mood")]")]'
+    assert actions.Speak('[Get("Last Subject")]') == '[Speak("[Get("Last Subject")]")]'
+
+
+def test_brackets_without_a_call_are_still_escaped():
+    assert actions.Speak('[not "an" action]') == '[Speak("[not ""an"" action]")]'
+
+
+def test_inline_is_never_escaped():
+    assert actions.Speak(Inline('say ""this""')) == '[Speak("say ""this""")]'
+
+
+def test_arguments_are_counted():
+    try:
+        actions.Set('Mood')
+    except TypeError as e:
+        assert 'var_value' in str(e)
+    else:
+        raise AssertionError('Set with one argument should fail')
+
+
+def test_encode_keeps_brackets_readable():
+    assert actions.encode('[Speak("a & b")]') == '[Speak(%22a%20%26%20b%22)]'
+
+
+def test_talk_sends_nested_actions_to_links(client, links):
+    links.set_variable('Last Subject', 'pytron')
+    client.talk('The last subject was [Get("Last Subject")]')
+    client.custom(r'[Speak("[Get("Last Subject")]")]')
+    assert links.spoken[-2:] == ['The last subject was pytron', 'pytron']
+
+
+def test_talk_sends_quotes_intact(client, links):
+    client.talk('She said "hi" & left')
+    assert links.spoken[-1] == 'She said "hi" & left'
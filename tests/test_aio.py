@@ -0,0 +1,188 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+import threading
+from time import time
+
+import pytest
+
+import pytronlinks
+from pytronlinks import watcher as watcher_module
+from pytronlinks.aio import AsyncConnectionPool
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_requests_share_a_connection(links):
+    async def main():
+        ai = pytronlinks.AsyncClient(ip=links.host, port=links.port)
+        await ai.talk('one')
+        await ai.talk('two')
+        stats = ai.pool_stats()
+        ai.close()
+        return stats
+
+    stats = _run(main())
+    assert links.spoken == ['one', 'two']
+    assert stats['created'] == 1
+    assert stats['reused'] == 1
+
+
+def test_timed_out_requests_close_their_connection(links, monkeypatch):
+    opened = []
+    connect = AsyncConnectionPool._connect
+
+    async def recording_connect(self, key):
+        conn = await connect(self, key)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(AsyncConnectionPool, '_connect', recording_connect)
+    links.latency = 0.5
+
+    async def main():
+        pool = AsyncConnectionPool()
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.request(links.host, links.port, '/?action=&key=ABC1234', timeout=0.1)
+        return pool.stats()
+
+    stats = _run(main())
+    assert len(opened) == 1
+    assert opened[0][1].is_closing()
+    assert stats['idle'] == {}
+
+
+def test_writes_are_not_sent_twice_when_links_drops_the_connection(links):
+    links.drop_idle = True
+
+    async def main():
+        pool = AsyncConnectionPool()
+        await pool.request(links.host, links.port, '/?action=[Speak("one")]&key=ABC1234')
+        # Sent straight away, before the loop has seen Links close the connection
+        try:
+            await pool.request(links.host, links.port, '/?action=[Speak("two")]&key=ABC1234')
+        except EOFError:
+            pass
+        await asyncio.sleep(0.1)
+        return pool.stats()
+
+    stats = _run(main())
+    assert links.spoken.count('two') <= 1
+    assert stats['reconnects'] == 0
+
+
+def test_reads_are_resent_when_links_drops_the_connection(links):
+    links.drop_idle = True
+    links.set_variable('Mood', 'happy')
+
+    async def main():
+        ai = pytronlinks.AsyncClient(ip=links.host, port=links.port, breaker=False, retries=0,
+                                     read_mode='http')
+        values = [await ai.Get('Mood') for _ in range(5)]
+        ai.close()
+        return values
+
+    assert _run(main()) == ['happy'] * 5
+
+
+def test_idle_connections_links_closed_are_not_reused(links):
+    links.drop_idle = True
+
+    async def main():
+        pool = AsyncConnectionPool()
+        for i in range(3):
+            await pool.request(links.host, links.port, '/?action=[Speak("line{}")]&key=ABC1234'.format(i))
+            await asyncio.sleep(0.05)  # Idle long enough for the close to arrive
+        return pool.stats()
+
+    stats = _run(main())
+    assert links.spoken == ['line0', 'line1', 'line2']
+    assert stats['created'] == 3
+    assert stats['reused'] == 0
+    assert stats['reconnects'] == 0
+
+
+@pytest.mark.skipif(watcher_module._libc is None, reason='inotify is not available')
+def test_listen_wakes_on_the_watcher(client):
+    async def main():
+        ai = pytronlinks.AsyncClient(ip=client.ip, port=client.port)
+        ai._client = client
+        loop = asyncio.get_event_loop()
+        listening = asyncio.ensure_future(ai.listen(freq=2.0))
+        await asyncio.sleep(0.3)
+        started = time()
+        await loop.run_in_executor(None, client.variables.write_many, {'Pytron': 'hello'})
+        value = await asyncio.wait_for(listening, 2.0)
+        return value, time() - started
+
+    value, waited = _run(main())
+    assert value == 'hello'
+    assert waited < 0.5
+
+
+def test_cancelled_listen_closes_its_watcher(client, monkeypatch):
+    watchers = []
+    xml_watcher = client._xml_watcher
+
+    def recording_watcher(freq=0.2):
+        watcher = xml_watcher(freq)
+        watchers.append(watcher)
+        return watcher
+
+    monkeypatch.setattr(client, '_xml_watcher', recording_watcher)
+
+    async def main():
+        ai = pytronlinks.AsyncClient(ip=client.ip, port=client.port)
+        ai._client = client
+        listening = asyncio.ensure_future(ai.listen())
+        await asyncio.sleep(0.2)
+        listening.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listening
+        # The wait in the executor gives up within a second, then the watcher is closed
+        await asyncio.sleep(1.2)
+
+    _run(main())
+    assert len(watchers) == 1
+    assert getattr(watchers[0], '_fd', None) is None
+
+
+def test_confirmations_are_set_up_off_the_loop(client, links, monkeypatch):
+    threads = []
+    clear_many = client.variables.clear_many
+
+    def recording_clear_many(names):
+        threads.append(threading.current_thread())
+        clear_many(names)
+
+    monkeypatch.setattr(client.variables, 'clear_many', recording_clear_many)
+
+    async def main():
+        ai = pytronlinks.AsyncClient(ip=client.ip, port=client.port)
+        ai._client = client
+        answer = ai.confirm_async('LightsAnswer', timeout=2)
+        asking = asyncio.ensure_future(ai.GetConfirmation('OvenAnswer', confirm='Oven off?', timeout=2))
+        await asyncio.sleep(0.3)
+        links.set_variable('LightsAnswer', 'yes')
+        links.set_variable('OvenAnswer', 'no')
+        return await asyncio.wait_for(answer, 2.0), await asyncio.wait_for(asking, 2.0)
+
+    assert _run(main()) == (True, False)
+    assert links.spoken == ['Oven off?']
+    assert threads and threading.main_thread() not in threads
+
+
+def test_close_closes_the_wrapped_client(client, monkeypatch):
+    closed = []
+    monkeypatch.setattr(client, 'close', lambda: closed.append(True))
+    ai = pytronlinks.AsyncClient(ip=client.ip, port=client.port)
+    ai._client.close()
+    ai._client = client
+    ai.close()
+    assert closed == [True]
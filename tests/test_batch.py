@@ -0,0 +1,35 @@
+# -*- coding: UTF-8 -*-
+
+
+def test_batch_is_one_request(client, links):
+    with client.batch() as b:
+        b.Set('Mood', 'happy')
+        b.Set('Weather', 'sunny')
+        b.talk('Scene set!')
+        b.Get('Mood')
+    assert links.requests == 1
+    assert links.variables['Mood'] == 'happy'
+    assert links.spoken == ['Scene set!']
+    assert len(b.results) == 4
+    assert b.results[-1] == 'happy'
+
+
+def test_long_batches_are_split(client, links):
+    b = client.batch(max_url_length=300)
+    for i in range(20):
+        b.talk('sentence number {}'.format(i))
+    results = b.flush()
+    assert len(results) == 20
+    assert links.requests > 1
+    assert links.spoken == ['sentence number {}'.format(i) for i in range(20)]
+
+
+def test_batch_is_dropped_on_exceptions(client, links):
+    try:
+        with client.batch() as b:
+            b.talk('never said')
+            raise ValueError
+    except ValueError:
+        pass
+    assert links.requests == 0
+    assert len(b) == 0
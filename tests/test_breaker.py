@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+
+import socket
+from time import sleep, time
+
+import pytest
+
+import pytronlinks
+from pytronlinks.breaker import CircuitBreaker, CircuitOpenError, backoff
+
+
+def test_opens_after_failures_in_a_row():
+    breaker = CircuitBreaker(failures=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.allow()
+        breaker.failure()
+    breaker.success()
+    for _ in range(3):
+        breaker.allow()
+        breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_half_open_lets_one_trial_call_through():
+    breaker = CircuitBreaker(failures=1, reset_timeout=0.05)
+    breaker.failure()
+    sleep(0.1)
+    breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    sleep(0.1)
+    breaker.allow()
+    breaker.success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_closes_the_breaker():
+    healthy = []
+    breaker = CircuitBreaker(failures=1, reset_timeout=0.05, probe=lambda: bool(healthy))
+    breaker.failure()
+    sleep(0.15)
+    assert breaker.state == CircuitBreaker.OPEN
+    healthy.append(True)
+    deadline = time() + 2
+    while breaker.state != CircuitBreaker.CLOSED and time() < deadline:
+        sleep(0.02)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()['probes'] >= 2
+    breaker.close()
+
+
+def test_backoff_is_capped():
+    assert all(0 <= backoff(n) <= 1.0 for n in range(20))
+    assert all(backoff(0) <= 0.05 for _ in range(50))
+
+
+def test_client_fails_fast_while_links_is_down():
+    s = socket.socket()
+    s.bind(('127.0.0.1', 0))
+    port = s.getsockname()[1]
+    s.close()
+    breaker = CircuitBreaker(failures=2, reset_timeout=60)
+    ai = pytronlinks.Client(ip='127.0.0.1', port=port, breaker=breaker, retries=0)
+    for _ in range(5):
+        ai.talk('anyone there?')
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()['rejected'] == 3
+    ai.close()
+
+
+def test_reads_are_retried(links):
+    ai = pytronlinks.Client(ip=links.host, port=links.port, timeout=0.2, retries=2, read_mode='http')
+    links.set_variable('Mood', 'happy')
+    links.latency = 0.3
+    started = time()
+    assert ai.Get('Mood') is False
+    assert ai.stats()['Get']['errors'] == 3
+    assert time() - started < 1.5
+    ai.close()
@@ -0,0 +1,55 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+
+from pytronlinks.cache import ResponseCache
+
+
+@pytest.fixture
+def cached(client):
+    client._cache = ResponseCache()
+    return client
+
+
+def test_gets_are_cached(cached, links):
+    links.set_variable('Mood', 'happy')
+    assert cached.Get('Mood') == 'happy'
+    assert cached.Get('Mood') == 'happy'
+    assert cached.cache_stats()['hits'] == 1
+
+
+def test_variable_store_writes_invalidate_cached_gets(cached, links):
+    links.set_variable('Mood', 'happy')
+    assert cached.Get('Mood') == 'happy'
+    cached.variables.write_many({'Mood': 'grumpy'})
+    assert cached.Get('Mood') == 'grumpy'
+    cached.variables.clear_many(['Mood'])
+    assert cached.Get('Mood') is None
+
+
+def test_dispatcher_clears_invalidate_cached_gets(cached, links):
+    seen = []
+    cached.subscribe({'Lights': seen.append})
+    links.set_variable('Lights', 'on')
+    assert cached.Get('Lights') == 'on'
+    assert cached._subscriptions().poll() == 1
+    assert seen == ['on']
+    assert cached.Get('Lights') is None
+
+
+def test_confirmation_clears_invalidate_cached_gets(cached, links):
+    links.set_variable('Answer', 'maybe')
+    assert cached.Get('Answer') == 'maybe'
+    confirmation = cached.confirm_async('Answer', timeout=5)
+    assert cached.Get('Answer') is None
+    links.set_variable('Answer', 'yes')
+    assert confirmation.result(2.0) is True
+    assert cached.Get('Answer') is None
+
+
+def test_set_invalidates_the_cached_get(cached, links):
+    cached.read_mode = cached.READ_HTTP
+    links.set_variable('Mood', 'happy')
+    assert cached.Get('Mood') == 'happy'
+    cached.Set('Mood', 'sleepy')
+    assert cached.Get('Mood') == 'sleepy'
@@ -0,0 +1,55 @@
+# -*- coding: UTF-8 -*-
+
+import threading
+from time import sleep, time
+
+
+def test_answers_resolve_their_confirmations(client, links):
+    lights = client.confirm_async('LightsAnswer', confirm='Turn off the lights?', on_yes='Okay')
+    oven = client.confirm_async('OvenAnswer', on_no='Go check!')
+    assert not lights.done() and not oven.done()
+    links.set_variable('LightsAnswer', 'Yes')
+    links.set_variable('OvenAnswer', 'no')
+    assert lights.result(2.0) is True
+    assert oven.result(2.0) is False
+    client.speech.join(2.0)
+    assert sorted(links.spoken) == sorted(['Turn off the lights?', 'Okay', 'Go check!'])
+    assert client.variables.get_many(['LightsAnswer', 'OvenAnswer']) == {'LightsAnswer': None, 'OvenAnswer': None}
+
+
+def test_confirmations_on_one_variable_share_the_answer(client, links):
+    first = client.confirm_async('Answer')
+    second = client.confirm_async('Answer')
+    links.set_variable('Answer', 'yes')
+    assert first.result(2.0) is True
+    assert second.result(2.0) is True
+
+
+def test_unanswered_confirmations_time_out(client):
+    started = time()
+    confirmation = client.confirm_async('Answer', timeout=0.3)
+    assert confirmation.result(2.0) is None
+    assert confirmation.done()
+    assert 0.25 < time() - started < 1.0
+
+
+def test_cancel_and_callbacks(client):
+    called = []
+    confirmation = client.confirm_async('Answer', timeout=10)
+    confirmation.add_done_callback(called.append)
+    confirmation.cancel()
+    assert confirmation.result(0) is None
+    assert called == [confirmation]
+    confirmation.add_done_callback(called.append)
+    assert len(called) == 2
+    deadline = time() + 2
+    while client._confirmation_waiter().pending() and time() < deadline:
+        sleep(0.05)
+    assert client._confirmation_waiter().pending() == 0
+
+
+def test_get_confirmation_blocks_for_the_answer(client, links):
+    timer = threading.Timer(0.2, links.set_variable, ('Answer', 'no'))
+    timer.start()
+    assert client.GetConfirmation('Answer', timeout=3) is False
+    timer.join()
@@ -0,0 +1,49 @@
+# -*- coding: UTF-8 -*-
+
+import socket
+from time import sleep, time
+
+import pytest
+
+import pytronlinks
+from pytronlinks import pool
+from pytronlinks.pool import ConnectionPool
+
+# How far past a deadline a call may return
+SLACK = 0.1
+
+
+def test_deadline_caps_a_slow_call(links):
+    ai = pytronlinks.Client(ip=links.host, port=links.port, breaker=False, read_mode='http')
+    links.latency = 1.0
+    started = time()
+    with ai.deadline(0.3):
+        ai.Get('Mood')
+    assert time() - started < 0.3 + SLACK
+    ai.close()
+
+
+def test_deadline_covers_the_pool_resend(links, monkeypatch):
+    # Keep the dead connection in the pool so the request has to be sent again
+    monkeypatch.setattr(pool, '_closed', lambda conn: False)
+    links.drop_idle = True
+    p = ConnectionPool()
+    p.request(links.host, links.port, '/?action=&key=ABC1234')
+    sleep(0.05)
+    links.latency = 1.0
+    started = time()
+    with pytest.raises(socket.timeout):
+        p.request(links.host, links.port, '/?action=&key=ABC1234', 0.5, True, time() + 0.3)
+    assert time() - started < 0.3 + SLACK
+    assert p.stats()['reconnects'] == 1
+
+
+def test_nested_deadlines_use_the_sooner_one(links):
+    ai = pytronlinks.Client(ip=links.host, port=links.port, breaker=False)
+    links.latency = 1.0
+    started = time()
+    with ai.deadline(5.0):
+        with ai.deadline(0.2):
+            ai.talk('late')
+    assert time() - started < 0.2 + SLACK
+    ai.close()
@@ -0,0 +1,97 @@
+# -*- coding: UTF-8 -*-
+
+import os
+import threading
+from time import sleep
+
+from pytronlinks.dictation import DictationReader
+
+
+def _append(path, text):
+    with open(path, 'ab') as f:
+        f.write(text.encode('utf-8'))
+
+
+def test_lines_written_before_the_first_read_are_read(tmp_path):
+    path = str(tmp_path / 'dictation.txt')
+    _append(path, 'said early\n')
+    reader = DictationReader(path)
+    assert reader.read() == ['said early']
+    assert reader.read() == []
+    reader.close()
+
+
+def test_from_start_false_only_reads_new_lines(tmp_path):
+    path = str(tmp_path / 'dictation.txt')
+    _append(path, 'old\n')
+    reader = DictationReader(path, from_start=False)
+    _append(path, 'new\n')
+    assert reader.read() == ['new']
+    reader.close()
+
+
+def test_partial_lines_wait_for_their_line_break(tmp_path):
+    path = str(tmp_path / 'dictation.txt')
+    reader = DictationReader(path)
+    _append(path, 'hello wo')
+    assert reader.read() == []
+    _append(path, 'rld\n\nsecond\r\n')
+    assert reader.read() == ['hello world', 'second']
+    reader.close()
+
+
+def test_truncated_and_replaced_files_are_followed(tmp_path):
+    path = str(tmp_path / 'dictation.txt')
+    _append(path, 'one\ntwo\n')
+    reader = DictationReader(path)
+    assert reader.read() == ['one', 'two']
+    open(path, 'w').close()
+    _append(path, '3\n')
+    assert reader.read() == ['3']
+    _append(path, 'last of the old file')
+    os.rename(path, path + '.1')
+    _append(path, 'first of the new file\n')
+    assert reader.read() == ['last of the old file', 'first of the new file']
+    reader.close()
+
+
+def test_position_file_carries_over_to_a_new_reader(tmp_path):
+    path = str(tmp_path / 'dictation.txt')
+    position = str(tmp_path / 'dictation.pos')
+    _append(path, 'a\nb\npartial')
+    reader = DictationReader(path, position_file=position)
+    assert reader.read() == ['a', 'b']
+    reader.close()
+    _append(path, ' line\nc\n')
+    reader = DictationReader(path, position_file=position)
+    assert reader.read() == ['partial line', 'c']
+    reader.close()
+
+
+def test_follow_yields_lines_as_they_are_written(tmp_path):
+    path = str(tmp_path / 'dictation.txt')
+    reader = DictationReader(path)
+
+    def writer():
+        for word in ('lights on', 'lights off'):
+            sleep(0.1)
+            _append(path, word + '\n')
+
+    t = threading.Thread(target=writer)
+    t.start()
+    assert list(reader.follow(timeout=1.0)) == ['lights on', 'lights off']
+    t.join()
+    reader.close()
+
+
+def test_client_returns_dictation_written_before_it_looked(client):
+    _append(client._SCRIPTS_PATH + r'\dictation.txt', 'what time is it\n')
+    assert client._check_for_input() == 'what time is it'
+    assert client._check_for_input() is False
+
+
+def test_each_dictation_call_uses_its_own_freq(client):
+    assert list(client.dictation(timeout=0.1, freq=0.2)) == []
+    assert client._dictation._watcher.interval == 0.2
+    assert list(client.dictation(timeout=0.1, freq=1.0)) == []
+    assert client._dictation._watcher.interval == 1.0
@@ -0,0 +1,51 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+
+from pytronlinks.cache import ResponseCache
+
+
+def test_local_links_is_read_from_the_file(client, links):
+    links.set_variable('Mood', 'happy')
+    assert client.read_source == client.READ_FILE
+    assert client.Get('Mood') == 'happy'
+    assert links.requests == 0
+    assert 'Get.file' in client.stats()
+    assert 'Get' not in client.stats()
+
+
+def test_remote_links_is_asked_over_http(client, links, monkeypatch):
+    monkeypatch.setattr(client, '_LOCAL_HOSTS', ())
+    links.set_variable('Mood', 'happy')
+    assert client.read_source == client.READ_HTTP
+    assert client.Get('Mood') == 'happy'
+    assert links.requests == 1
+
+
+def test_read_mode_overrides_auto(client, links):
+    links.set_variable('Mood', 'happy')
+    client.read_mode = client.READ_HTTP
+    assert client.Get('Mood') == 'happy'
+    assert links.requests == 1
+    client.read_mode = client.READ_FILE
+    assert client.Get('Mood') == 'happy'
+    assert links.requests == 1
+
+
+@pytest.mark.parametrize('mode', ['file', 'http'])
+def test_get_many_is_one_read(client, links, mode):
+    client.read_mode = mode
+    links.set_variable('Mood', 'happy')
+    links.set_variable('Weather', 'sunny')
+    assert client.get_many(['Mood', 'Weather']) == {'Mood': 'happy', 'Weather': 'sunny'}
+    assert links.requests == (1 if mode == 'http' else 0)
+
+
+def test_get_many_uses_the_cache(client, links):
+    client._cache = ResponseCache()
+    client.read_mode = client.READ_HTTP
+    links.set_variable('Mood', 'happy')
+    links.set_variable('Weather', 'sunny')
+    assert client.Get('Mood') == 'happy'
+    assert client.get_many(['Mood', 'Weather']) == {'Mood': 'happy', 'Weather': 'sunny'}
+    assert links.requests == 2
@@ -0,0 +1,95 @@
+# -*- coding: UTF-8 -*-
+
+import io
+import os
+
+from pytronlinks.fakelinks import grammar_document, make_grammars
+from pytronlinks.grammar import Grammar, GrammarSnapshot, iter_grammars
+
+
+def _exported(grammars):
+    return ''.join(line for g in grammars for line in g.lines()).replace('\n', os.linesep).encode('utf-8')
+
+
+def _read(path):
+    with io.open(path, 'rb') as f:
+        return f.read()
+
+
+def test_iter_grammars_reads_every_field():
+    grammars = make_grammars(3, 2)
+    parsed = list(iter_grammars(grammar_document(grammars)))
+    assert [g.name for g in parsed] == ['Grammar 0', 'Grammar 1', 'Grammar 2']
+    assert parsed[0].commands == ('command 0 of grammar 0', 'command 1 of grammar 0')
+    assert parsed[0].enabled is True and parsed[0].loaded is True and parsed[0].priority == 0
+
+
+def test_first_update_adds_everything_and_exports(tmp_path):
+    path = str(tmp_path / 'command_list.txt')
+    grammars = make_grammars()
+    snapshot = GrammarSnapshot(path)
+    delta = snapshot.update(grammar_document(grammars))
+    assert delta.added == [g.name for g in grammars]
+    assert _read(path) == _exported(grammars)
+
+
+def test_unchanged_document_writes_nothing(tmp_path):
+    path = str(tmp_path / 'command_list.txt')
+    document = grammar_document(make_grammars())
+    snapshot = GrammarSnapshot(path)
+    snapshot.update(document)
+    written = snapshot.bytes_written
+    delta = snapshot.update(document)
+    assert not delta
+    assert snapshot.bytes_written == written
+
+
+def test_export_is_rewritten_from_the_first_change(tmp_path):
+    path = str(tmp_path / 'command_list.txt')
+    grammars = make_grammars(10)
+    snapshot = GrammarSnapshot(path)
+    snapshot.update(grammar_document(grammars))
+    full = snapshot.bytes_written
+    last = grammars[-1]
+    grammars[-1] = Grammar(last.name, last.enabled, last.loaded, last.priority, last.debug_show_phrases,
+                           last.commands + ('a new command',))
+    delta = snapshot.update(grammar_document(grammars))
+    assert delta.changed == [last.name]
+    assert _read(path) == _exported(grammars)
+    assert snapshot.bytes_written - full < full / 5
+
+
+def test_enabled_disabled_added_and_removed(tmp_path):
+    grammars = make_grammars(4)
+    snapshot = GrammarSnapshot(str(tmp_path / 'command_list.txt'))
+    snapshot.update(grammar_document(grammars))
+    first = grammars[0]
+    grammars[0] = Grammar(first.name, False, first.loaded, first.priority, first.debug_show_phrases, first.commands)
+    removed = grammars.pop(1)
+    grammars.append(Grammar('Brand new', True, True, 0, False, ('hello',)))
+    delta = snapshot.update(grammar_document(grammars))
+    assert delta.disabled == [first.name]
+    assert delta.changed == [first.name]
+    assert delta.removed == [removed.name]
+    assert delta.added == ['Brand new']
+    assert _read(snapshot.path) == _exported(grammars)
+
+
+def test_export_edited_by_someone_else_is_written_again(tmp_path):
+    path = str(tmp_path / 'command_list.txt')
+    grammars = make_grammars()
+    document = grammar_document(grammars)
+    snapshot = GrammarSnapshot(path)
+    snapshot.update(document)
+    with open(path, 'ab') as f:
+        f.write(b'my notes')
+    assert not snapshot.update(document)
+    assert _read(path) == _exported(grammars)
+
+
+def test_client_grammar_changes(client, links):
+    assert client.grammar_changes().added == [g.name for g in links.grammars]
+    assert not client.grammar_changes()
+    links.grammars.append(Grammar('Lights', True, True, 0, False, ('lights on', 'lights off')))
+    assert client.grammar_changes().added == ['Lights']
+    assert _read(client._SCRIPTS_PATH + r'\command_list.txt') == _exported(links.grammars)
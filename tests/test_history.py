@@ -0,0 +1,169 @@
+# -*- coding: UTF-8 -*-
+
+import datetime
+import gzip
+import os
+import threading
+from time import mktime, sleep, time
+
+from pytronlinks.history import HistoryWriter, iter_history, segments
+
+
+def _secs(day, hour=12):
+    return mktime(datetime.datetime(2016, 11, day, hour).timetuple())
+
+
+def _write_days(path, **kwargs):
+    """ Three entries a day from Nov 1st to Nov 4th """
+    writer = HistoryWriter(path, flush_interval=0, **kwargs)
+    for day in range(1, 5):
+        for hour in (9, 12, 18):
+            writer.write('day {} hour {}'.format(day, hour), _secs(day, hour))
+    writer.close()
+    return writer
+
+
+def test_entries_read_back_in_order(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    _write_days(path)
+    entries = list(iter_history(path))
+    assert len(entries) == 12
+    assert entries[0].text == 'day 1 hour 9'
+    assert entries[0].time == datetime.datetime(2016, 11, 1, 9)
+    assert len(segments(path)) == 3
+
+
+def test_range_queries_across_daily_segments(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    _write_days(path)
+    assert len(list(iter_history(path, until='2016-11-03'))) == 6
+    assert len(list(iter_history(path, since='2016-11-02 12:00:00', until='2016-11-04 12:00:00'))) == 6
+    assert [e.text for e in iter_history(path, contains='DAY 4 HOUR 18')] == ['day 4 hour 18']
+
+
+def test_range_queries_across_size_rotated_segments(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    _write_days(path, daily=False, max_bytes=100)
+    assert len(segments(path)) > 3
+    # Segments are named after their first entry
+    assert os.path.basename(segments(path)[0]).startswith('history.2016-11-01')
+    assert len(list(iter_history(path, until='2016-11-03'))) == 6
+    assert len(list(iter_history(path, since='2016-11-01 12:00:00', until='2016-11-03 18:00:00'))) == 7
+
+
+def test_range_queries_without_daily_rotation(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    writer = _write_days(path, daily=False, max_bytes=None)
+    writer.rotate()
+    _write_days(path, daily=False, max_bytes=None)
+    assert len(segments(path)) == 1
+    assert len(list(iter_history(path, until='2016-11-03'))) == 12
+    assert len(list(iter_history(path, since='2016-11-04'))) == 6
+
+
+def test_gzipped_segments_are_searched(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    _write_days(path, compress=True)
+    deadline = time() + 5
+    while not all(s.endswith('.gz') for s in segments(path)) and time() < deadline:
+        sleep(0.05)
+    for segment in segments(path):
+        assert segment.endswith('.gz')
+        with gzip.open(segment) as f:
+            assert f.read()
+    assert len(list(iter_history(path, since='2016-11-02', until='2016-11-03'))) == 3
+
+
+def test_multiline_entries_stay_together(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    writer = HistoryWriter(path, flush_interval=0)
+    writer.write('first line\nsecond line', _secs(1))
+    writer.write('next', _secs(1, 13))
+    writer.close()
+    assert [e.text for e in iter_history(path)] == ['first line\nsecond line', 'next']
+
+
+def test_entries_survive_a_rename_that_fails(tmp_path, monkeypatch):
+    from pytronlinks import history
+
+    def locked(src, dst):
+        raise OSError(13, 'The process cannot access the file because it is being used by another process')
+
+    path = str(tmp_path / 'history.txt')
+    writer = HistoryWriter(path, flush_interval=0)
+    monkeypatch.setattr(history.os, 'rename', locked)
+    for day in range(1, 4):
+        writer.write('day{}'.format(day), _secs(day))
+    writer.flush()
+    assert segments(path) == []
+    assert [e.text for e in iter_history(path)] == ['day1', 'day2', 'day3']
+
+    monkeypatch.undo()
+    monkeypatch.setattr(history, '_ROTATE_RETRY', 0)
+    writer._rotate_after = 0
+    writer.write('day3 again', _secs(3, 13))
+    writer.write('day4', _secs(4))
+    writer.close()
+    assert len(segments(path)) == 2
+    assert [e.text for e in iter_history(path)] == ['day1', 'day2', 'day3', 'day3 again', 'day4']
+    assert [e.text for e in iter_history(path, since='2016-11-04')] == ['day4']
+
+
+def test_entries_stay_buffered_until_written(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    writer = HistoryWriter(path, flush_interval=0)
+    write = writer._write
+    failures = []
+
+    def failing_write(data):
+        if not failures:
+            failures.append(data)
+            raise IOError(28, 'No space left on device')
+        write(data)
+
+    writer._write = failing_write
+    writer.write('one', _secs(1))
+    try:
+        writer.flush()
+    except IOError:
+        pass
+    writer.write('two', _secs(1, 13))
+    writer.close()
+    assert failures
+    assert [e.text for e in iter_history(path)] == ['one', 'two']
+
+
+def test_flush_interval_writes_in_the_background(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    writer = HistoryWriter(path, flush_interval=0.1)
+    writer.write('buffered', _secs(1))
+    assert list(iter_history(path)) == []
+    deadline = time() + 2
+    while not list(iter_history(path)) and time() < deadline:
+        sleep(0.02)
+    assert [e.text for e in iter_history(path)] == ['buffered']
+    writer.write('closed', _secs(1, 13))
+    writer.close()
+    assert [e.text for e in iter_history(path)] == ['buffered', 'closed']
+
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / 'history.txt')
+    writer = HistoryWriter(path, max_bytes=2000, buffer_size=200, flush_interval=0.01)
+
+    def dictate(name):
+        for i in range(100):
+            writer.write('{} {}'.format(name, i), _secs(1))
+
+    threads = [threading.Thread(target=dictate, args=('thread{}'.format(n),)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    texts = [e.text for e in iter_history(path)]
+    assert len(segments(path)) > 1
+    assert sorted(texts) == sorted('thread{} {}'.format(n, i) for n in range(4) for i in range(100))
+    for n in range(4):
+        mine = [t for t in texts if t.startswith('thread{} '.format(n))]
+        assert mine == ['thread{} {}'.format(n, i) for i in range(100)]
@@ -0,0 +1,63 @@
+# -*- coding: UTF-8 -*-
+
+import socket
+
+import pytest
+
+from pytronlinks.hosts import ClientPool
+
+
+def _dead_port():
+    s = socket.socket()
+    s.bind(('127.0.0.1', 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def _pool(links, **kwargs):
+    live = (links.host, links.port)
+    dead = ('127.0.0.1', _dead_port())
+    return ClientPool([dead, live], timeout=1.0, retries=0, **kwargs)
+
+
+def test_reads_skip_a_dead_host(links):
+    house = _pool(links)
+    assert [house.CallCommand('hi') for _ in range(6)] == ['Response to hi'] * 6
+    dead, live = house.hosts
+    assert dead.calls == 1
+    assert dead.latency is None
+    assert dead.failed_at is not None
+    assert [h['state'] for h in house.health()] == ['down', 'up']
+    house.close()
+
+
+def test_round_robin_skips_a_dead_host(links):
+    house = _pool(links, routing=ClientPool.ROUND_ROBIN)
+    assert [house.CallCommand('hi') for _ in range(4)] == ['Response to hi'] * 4
+    assert house.hosts[0].calls == 1
+    house.close()
+
+
+def test_failed_host_gets_another_call_after_recheck(links):
+    house = _pool(links, recheck=0.0)
+    house.CallCommand('hi')
+    dead = house.hosts[0]
+    assert dead.failed_at is not None
+    house.CallCommand('hi')
+    assert dead.calls == 2
+    house.close()
+
+
+def test_broadcast_reaches_every_live_host(links):
+    house = _pool(links)
+    house.talk('dinner')
+    assert links.spoken == ['dinner']
+    assert house.hosts[0].failed_at is not None
+    assert house.hosts[1].failed_at is None
+    house.close()
+
+
+def test_an_empty_host_list_is_rejected():
+    with pytest.raises(ValueError, match='at least one'):
+        ClientPool([])
@@ -0,0 +1,83 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+
+import pytronlinks
+from pytronlinks.metrics import Histogram, Metrics
+
+
+def test_percentiles_are_within_a_bucket():
+    h = Histogram()
+    for ms in range(1, 101):
+        h.record(ms / 1000.0)
+    assert h.count == 100
+    assert h.percentile(50) == pytest.approx(0.050, rel=0.05)
+    assert h.percentile(99) == pytest.approx(0.099, rel=0.05)
+    assert h.percentile(100) == pytest.approx(h.max, rel=0.05)
+    assert h.max == 0.1
+    assert h.mean == pytest.approx(0.0505)
+    assert Histogram().percentile(50) is None
+
+
+def test_exporter_gets_every_call_and_errors_are_counted():
+    seen = []
+    metrics = Metrics(exporter=lambda *args: seen.append(args))
+    metrics.record('Speak', 0.01, 40, 60)
+    with pytest.raises(ValueError):
+        with metrics.timer('xml.parse'):
+            raise ValueError
+    stats = metrics.stats(reset=True)
+    assert stats['Speak']['calls'] == 1 and stats['Speak']['bytes_in'] == 60
+    assert stats['xml.parse']['errors'] == 1
+    assert [s[0] for s in seen] == ['Speak', 'xml.parse']
+    assert metrics.stats() == {}
+
+
+def test_client_records_calls_by_links_function(client, links):
+    client.talk('hi')
+    client.CallCommand('hi')
+    with client.batch() as b:
+        b.talk('one')
+        b.talk('two')
+    stats = client.stats()
+    assert stats['Speak']['calls'] == 1
+    assert stats['CallCommand']['calls'] == 1
+    assert stats['Batch']['calls'] == 1
+    assert stats['Speak']['p50'] > 0
+
+
+def test_metrics_can_be_turned_off(links):
+    ai = pytronlinks.Client(ip=links.host, port=links.port, metrics=False)
+    ai.talk('quiet')
+    assert ai.stats() is None
+    ai.close()
+
+
+def test_calls_the_breaker_turns_away_are_counted(links):
+    breaker = pytronlinks.CircuitBreaker(failures=1, reset_timeout=60)
+    ai = pytronlinks.Client(ip=links.host, port=links.port, breaker=breaker)
+    ai.talk('sent')
+    breaker.failure()
+    for _ in range(3):
+        ai.talk('turned away')
+    stats = ai.stats()['Speak']
+    assert stats['calls'] == 1
+    assert stats['errors'] == 0
+    assert stats['open_rejections'] == 3
+    assert links.spoken == ['sent']
+    ai.close()
+
+
+def test_async_calls_the_breaker_turns_away_are_counted(links):
+    import asyncio
+
+    breaker = pytronlinks.CircuitBreaker(failures=1, reset_timeout=60)
+    breaker.failure()
+    ai = pytronlinks.AsyncClient(ip=links.host, port=links.port, breaker=breaker)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(ai.talk('turned away'))
+    finally:
+        loop.close()
+    assert ai.stats()['Speak']['open_rejections'] == 1
+    ai.close()
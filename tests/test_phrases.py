@@ -0,0 +1,37 @@
+# -*- coding: UTF-8 -*-
+
+from pytronlinks.grammar import Grammar
+from pytronlinks.phrases import PhraseIndex, normalize
+
+GRAMMARS = [
+    Grammar('Clock', True, True, 0, False, ('What time is it', 'what timer is running')),
+    Grammar('Lights', False, True, 0, False, ('Lights on', 'lights off', 'what time is it')),
+]
+
+
+def test_normalize():
+    assert normalize('Jarvis, come back  online!') == 'jarvis come back online'
+
+
+def test_exact_lookup_finds_every_grammar():
+    index = PhraseIndex(GRAMMARS)
+    matches = index.lookup('what time is it?')
+    assert [(m.grammar.name, m.command) for m in matches] == [('Clock', 'What time is it'), ('Lights', 'what time is it')]
+    assert [m.active for m in matches] == [True, False]
+    assert 'LIGHTS ON' in index
+    assert index.lookup('lights dim') == ()
+
+
+def test_prefix_lookup_on_word_boundaries():
+    index = PhraseIndex(GRAMMARS)
+    assert [m.command for m in index.prefix('what time')] == ['What time is it', 'what time is it']
+    assert [m.command for m in index.prefix('what time', whole_words=False)] == \
+        ['What time is it', 'what time is it', 'what timer is running']
+    assert [m.command for m in index.prefix('lights', limit=1)] == ['lights off']
+
+
+def test_refresh_replaces_the_index():
+    index = PhraseIndex(GRAMMARS)
+    index.refresh([Grammar('Music', True, True, 0, False, ('play music',))])
+    assert 'lights on' not in index
+    assert 'play music' in index
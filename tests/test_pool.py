@@ -0,0 +1,58 @@
+# -*- coding: UTF-8 -*-
+
+import socket
+from time import sleep, time
+
+import pytest
+
+import pytronlinks
+from pytronlinks.pool import ConnectionPool
+
+
+def test_connections_are_reused(links):
+    pool = ConnectionPool()
+    for _ in range(3):
+        assert pool.request(links.host, links.port, '/?action=&key=ABC1234')[0] == 200
+    stats = pool.stats()
+    assert stats['created'] == 1
+    assert stats['reused'] == 2
+
+
+def test_slow_reply_is_not_sent_twice(links):
+    ai = pytronlinks.Client(ip=links.host, port=links.port, timeout=0.3, breaker=False)
+    ai.talk('warm up')
+    links.latency = 0.5
+    started = time()
+    ai.talk('only once please')
+    assert time() - started < 0.45
+    sleep(0.6)  # Anything sent a second time would be spoken by now
+    assert links.spoken.count('only once please') == 1
+    ai.close()
+
+
+def test_pool_reraises_timeouts_on_reused_connections(links):
+    pool = ConnectionPool()
+    pool.request(links.host, links.port, '/?action=&key=ABC1234')
+    links.latency = 0.3
+    with pytest.raises(socket.timeout):
+        pool.request(links.host, links.port, '/?action=[Speak("x")]&key=ABC1234', timeout=0.1, idempotent=True)
+    assert pool.stats()['reconnects'] == 0
+
+
+def test_idle_connections_dropped_by_links_are_replaced(links):
+    links.drop_idle = True
+    ai = pytronlinks.Client(ip=links.host, port=links.port, breaker=False)
+    for i in range(5):
+        ai.talk('line {}'.format(i))
+        sleep(0.05)  # Idle long enough for the close to arrive
+    assert links.spoken == ['line {}'.format(i) for i in range(5)]
+    assert ai.pool_stats()['created'] == 5
+    ai.close()
+
+
+def test_reads_are_resent_when_the_connection_dies_under_them(links):
+    links.drop_idle = True
+    links.set_variable('Mood', 'happy')
+    ai = pytronlinks.Client(ip=links.host, port=links.port, breaker=False, retries=0, read_mode='http')
+    assert [ai.Get('Mood') for _ in range(5)] == ['happy'] * 5
+    ai.close()
@@ -0,0 +1,42 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+
+from pytronlinks.response import decode_json, decode_xml
+
+
+def test_json_after_preamble_lines():
+    response = decode_json('Links 3.0\r\nready\r\n{"response": "hi there", "error": ""}\r\n')
+    assert response.ok
+    assert response.response == 'hi there'
+
+
+def test_json_errors_and_nulls():
+    response = decode_json('{"response": null, "error": "Invalid key"}', 200)
+    assert not response.ok
+    assert response.response == ''
+    assert response.error == 'Invalid key'
+
+
+def test_single_quoted_replies_fall_back_on_literal_eval():
+    assert decode_json("{'response': 'old style', 'error': ''}").response == 'old style'
+
+
+def test_braces_in_the_preamble_are_skipped():
+    assert decode_json('note {not json}\n{"response": "ok"}').response == 'ok'
+
+
+def test_json_without_a_response():
+    with pytest.raises(ValueError):
+        decode_json('nothing here')
+
+
+def test_xml_after_preamble():
+    response = decode_xml('junk\n<?xml version="1.0"?><root><response>&lt;grammars/&gt;</response></root>', 200)
+    assert response.ok
+    assert response.response == '<grammars/>'
+
+
+def test_xml_without_a_document():
+    with pytest.raises(ValueError):
+        decode_xml('no xml at all')
@@ -0,0 +1,38 @@
+# -*- coding: UTF-8 -*-
+
+from pytronlinks.speech import chunk_text
+
+
+def test_sentences_are_split():
+    assert list(chunk_text('Hello there! How are you? Fine.')) == ['Hello there!', 'How are you?', 'Fine.']
+
+
+def test_abbreviations_do_not_end_a_sentence():
+    assert list(chunk_text('Mr. Smith met Dr. Jones. They talked.')) == ['Mr. Smith met Dr. Jones.', 'They talked.']
+
+
+def test_no_only_counts_as_an_abbreviation_before_a_number():
+    assert list(chunk_text('I said no. Then I left.')) == ['I said no.', 'Then I left.']
+    assert list(chunk_text('Track no. 5 is next. Enjoy.')) == ['Track no. 5 is next.', 'Enjoy.']
+
+
+def test_no_at_the_end_of_a_piece_waits_for_the_next_one():
+    assert list(chunk_text(['Track no. ', '5 is next. ', 'I said no. ', 'Bye.'])) == \
+        ['Track no. 5 is next.', 'I said no.', 'Bye.']
+
+
+def test_sentences_span_pieces():
+    assert list(chunk_text(['The weather is ', 'sunny. Tomorrow ', 'rain.'])) == \
+        ['The weather is sunny.', 'Tomorrow rain.']
+
+
+def test_long_sentences_are_split_at_clauses_then_spaces():
+    chunks = list(chunk_text('one two three, four five six seven eight nine', max_chars=20))
+    assert chunks[0] == 'one two three,'
+    assert all(len(c) <= 20 for c in chunks)
+    assert ' '.join(chunks).split() == 'one two three, four five six seven eight nine'.split()
+
+
+def test_talk_stream_speaks_a_sentence_at_a_time(client, links):
+    client.talk_stream('First one. Second one.')
+    assert links.spoken == ['First one.', 'Second one.']
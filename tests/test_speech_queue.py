@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+
+from time import sleep
+
+from pytronlinks.speech import SpeechQueue
+
+
+def test_talk_async_speaks_in_order(client, links):
+    for i in range(3):
+        assert client.talk_async('line {}'.format(i))
+    assert client.speech.join(2.0)
+    assert links.spoken == ['line 0', 'line 1', 'line 2']
+
+
+def test_higher_priorities_go_first_and_low_ones_merge(client, links):
+    links.latency = 0.2
+    queue = client.speech
+    queue.put('busy')
+    sleep(0.05)  # The worker is now waiting on 'busy'
+    queue.put('low one', SpeechQueue.LOW)
+    queue.put('low two', SpeechQueue.LOW)
+    queue.put('urgent', SpeechQueue.HIGH)
+    assert queue.join(3.0)
+    assert links.spoken == ['busy', 'urgent', 'low one. low two.']
+    assert queue.stats()['merged'] == 1
+
+
+def test_stale_text_is_dropped(client, links):
+    links.latency = 0.3
+    queue = client.speech
+    queue.put('busy')
+    sleep(0.05)
+    queue.put('too late', ttl=0.1)
+    assert queue.join(3.0)
+    assert links.spoken == ['busy']
+    assert queue.stats()['expired'] == 1
+
+
+def test_full_queue_drops_lower_priorities_first(client, links):
+    links.latency = 0.3
+    queue = SpeechQueue(client, maxsize=2)
+    queue.put('busy')
+    sleep(0.05)
+    queue.put('low', SpeechQueue.LOW)
+    queue.put('normal')
+    assert queue.put('high', SpeechQueue.HIGH, block=False)
+    assert not queue.put('another normal', block=False)
+    assert queue.join(3.0)
+    assert links.spoken == ['busy', 'high', 'normal']
+    assert queue.stats()['dropped'] == 2
+    queue.close()
+
+
+def test_high_priority_stops_the_current_voice(client, links):
+    queue = client.speech
+    queue.voice = 'IVONA Brian'
+    queue.put('chatter', SpeechQueue.LOW)
+    queue.join(2.0)
+    queue.put('alarm!', SpeechQueue.HIGH)
+    assert queue.join(2.0)
+    assert queue.stats()['preempted'] == 1
+    assert links.spoken[-1] == 'alarm!'
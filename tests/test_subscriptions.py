@@ -0,0 +1,56 @@
+# -*- coding: UTF-8 -*-
+
+import threading
+from time import sleep, time
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time() + timeout
+    while not condition() and time() < deadline:
+        sleep(0.02)
+    return condition()
+
+
+def test_callbacks_fire_once_per_value(client, links):
+    seen = []
+    client.subscribe({'Lights': lambda v: seen.append(('Lights', v)), 'Music': lambda v: seen.append(('Music', v))})
+    dispatcher = client._subscriptions()
+    links.set_variable('Lights', 'on')
+    links.set_variable('Music', 'jazz')
+    assert dispatcher.poll() == 2
+    assert dispatcher.poll() == 0
+    assert sorted(seen) == [('Lights', 'on'), ('Music', 'jazz')]
+    assert client.variables.get_many(['Lights', 'Music']) == {'Lights': None, 'Music': None}
+
+
+def test_unsubscribe(client, links):
+    seen = []
+    client.subscribe({'Lights': seen.append})
+    client.unsubscribe('Lights')
+    links.set_variable('Lights', 'on')
+    assert client._subscriptions().poll() == 0
+    assert client.variables.get('Lights') == 'on'
+
+
+def test_failing_callbacks_do_not_stop_the_others(client, links):
+    seen = []
+    client.subscribe({'Bad': lambda v: 1 / 0, 'Good': seen.append})
+    links.set_variable('Bad', 'x')
+    links.set_variable('Good', 'y')
+    assert client._subscriptions().poll() == 2
+    assert seen == ['y']
+
+
+def test_run_forever_until_stop(client, links):
+    seen = []
+    client.subscribe({'Lights': seen.append})
+    runner = threading.Thread(target=client.run_forever)
+    runner.start()
+    sleep(0.2)
+    links.set_variable('Lights', 'on')
+    assert _wait_for(lambda: seen == ['on'])
+    links.set_variable('Lights', 'off')
+    assert _wait_for(lambda: seen == ['on', 'off'])
+    client.stop()
+    runner.join(2.0)
+    assert not runner.is_alive()
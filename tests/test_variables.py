@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+
+import os
+
+import pytest
+
+from pytronlinks.variables import VariableStore
+
+XML = ('<?xml version="1.0" encoding="utf-8"?>\n<UserVariables>'
+       '<Variable><Name>Pytron</Name><Value>hello</Value></Variable>'
+       '<Variable><Name>Answer</Name><Value /></Variable>'
+       '</UserVariables>')
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / 'UserVariables.xml')
+    with open(path, 'w') as f:
+        f.write(XML)
+    return VariableStore(path)
+
+
+def test_lookups_parse_the_file_once(store):
+    assert store.get('Pytron') == 'hello'
+    assert store.get('Answer') is None
+    assert store.get('Missing') is False
+    assert store.get_many(['Pytron', 'Missing'], default=None) == {'Pytron': 'hello', 'Missing': None}
+    assert sorted(store.names()) == ['Answer', 'Pytron']
+    assert store.parses == 1
+
+
+def test_changes_on_disk_are_picked_up(store):
+    store.get('Pytron')
+    with open(store.path, 'w') as f:
+        f.write(XML.replace('hello', 'changed, and longer'))
+    assert store.get('Pytron') == 'changed, and longer'
+    assert store.parses == 2
+
+
+def test_write_many_sets_adds_and_clears_in_one_write(store):
+    store.write_many({'Pytron': None, 'Mood': 'happy', 'Answer': 'yes'})
+    assert store.parses == 1
+    fresh = VariableStore(store.path)
+    assert fresh.get_many(['Pytron', 'Mood', 'Answer']) == {'Pytron': None, 'Mood': 'happy', 'Answer': 'yes'}
+    assert store.get('Mood') == 'happy'
+    assert store.parses == 1
+    assert not [name for name in os.listdir(os.path.dirname(store.path)) if name.endswith('.tmp')]
+
+
+def test_clear_many_empties_values(store):
+    store.clear_many(['Pytron'])
+    assert VariableStore(store.path).get('Pytron') is None
+
+
+def test_on_write_gets_the_names(store):
+    written = []
+    store.on_write = written.append
+    store.write_many({'Mood': 'happy'})
+    store.clear_many(['Pytron', 'Answer'])
+    assert written == [['Mood'], ['Pytron', 'Answer']]
+
+
+def test_write_many_keeps_changes_made_while_it_writes(store):
+    load = store._load
+
+    def links_writes_after_load():
+        tree = load()
+        if store.parses == 1:
+            with open(store.path, 'w') as f:
+                f.write(XML.replace('<Value />', '<Value>yes</Value>'))
+        return tree
+
+    store._load = links_writes_after_load
+    store.write_many({'Pytron': None})
+    assert store.get_many(['Pytron', 'Answer']) == {'Pytron': None, 'Answer': 'yes'}
+    assert store.parses == 2
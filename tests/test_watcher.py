@@ -0,0 +1,80 @@
+# -*- coding: UTF-8 -*-
+
+import threading
+from time import sleep, time
+
+import pytest
+
+from pytronlinks import watcher as watcher_module
+from pytronlinks.watcher import PollingWatcher, watch
+
+
+@pytest.fixture(params=['inotify', 'polling'])
+def watchers(request, monkeypatch):
+    """ Runs a test with the best watcher available and again with the os.stat fallback """
+    if request.param == 'polling':
+        monkeypatch.setattr(watcher_module, '_libc', None)
+    elif watcher_module._libc is None:
+        pytest.skip('inotify is not available')
+    return request.param
+
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_watcher_wakes_on_change(tmp_path):
+    path = str(tmp_path / 'UserVariables.xml')
+    _write(path, 'one')
+    with watch(path) as watcher:
+        assert not watcher.wait(0.1)
+        _write(path, 'two')
+        assert watcher.wait(1.0)
+
+
+def test_polling_watcher_sees_a_new_file(tmp_path):
+    path = str(tmp_path / 'UserVariables.xml')
+    watcher = PollingWatcher(path, 0.05)
+    _write(path, 'created')
+    assert watcher.wait(1.0)
+
+
+def _start(target):
+    thread = threading.Thread(target=target)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def test_listen_and_get_confirmation_both_wake(client, watchers):
+    results = {}
+    listener = _start(lambda: results.setdefault('listen', client.listen()))
+    confirmer = _start(lambda: results.setdefault('confirm', client.GetConfirmation('Answer', timeout=5)))
+    sleep(0.3)
+    started = time()
+    client.variables.write_many({'Pytron': 'hello'})
+    listener.join(2.0)
+    assert results.get('listen') == 'hello'
+    assert time() - started < 1.0
+    client.variables.write_many({'Answer': 'yes'})
+    confirmer.join(2.0)
+    assert results.get('confirm') is True
+
+
+def test_listen_wakes_while_subscribed(client, watchers):
+    seen = []
+    client.subscribe({'Lights': seen.append})
+    dispatcher = _start(client.run_forever)
+    results = {}
+    listener = _start(lambda: results.setdefault('listen', client.listen()))
+    sleep(0.3)
+    client.variables.write_many({'Pytron': 'hello', 'Lights': 'on'})
+    listener.join(2.0)
+    assert results.get('listen') == 'hello'
+    deadline = time() + 2.0
+    while not seen and time() < deadline:
+        sleep(0.05)
+    assert seen == ['on']
+    client.stop()
+    dispatcher.join(2.0)
@@ -0,0 +1,51 @@
+# -*- coding: UTF-8 -*-
+
+import io
+import os
+
+from pytronlinks.wordlists import Wordlist, WordlistReader
+
+ANSWERS = u'yes or no answers\tclean response\nyes; yes please; affirmative\tyes\nno; nope; no thanks\tno\n'
+
+
+def _write(path, text):
+    with io.open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def test_lookup_by_any_alternative(tmp_path):
+    path = str(tmp_path / 'Answers.txt')
+    _write(path, ANSWERS)
+    wordlist = Wordlist(path)
+    assert wordlist.get('Yes Please', 'clean response') == 'yes'
+    assert wordlist.get('nope', 1) == 'no'
+    assert wordlist.get('maybe', 'clean response') is None
+    assert list(wordlist.column('clean response')) == ['yes', 'no']
+    assert len(wordlist) == 2
+
+
+def test_file_is_not_held_open_between_lookups(tmp_path):
+    path = str(tmp_path / 'Answers.txt')
+    _write(path, ANSWERS)
+    wordlist = Wordlist(path)
+    wordlist.get('yes', 1)
+    fds = '/proc/self/fd'
+    if os.path.isdir(fds):
+        assert not any(os.path.realpath(os.path.join(fds, fd)) == os.path.realpath(path) for fd in os.listdir(fds))
+    # Replacing the file the way an editor saves it works and is picked up
+    os.remove(path)
+    _write(path, ANSWERS.replace('\tyes\n', '\tsure\n') + u'maybe\tmaybe\n')
+    assert wordlist.get('yes', 1) == 'sure'
+    assert wordlist.get('maybe', 1) == 'maybe'
+
+
+def test_get_word_only_reads_files_for_a_local_links(client, links, monkeypatch):
+    os.makedirs(client._WORDLISTS_PATH)
+    _write(os.path.join(client._WORDLISTS_PATH, 'Answers.txt'), ANSWERS)
+    links.wordlists = {'Answers': {'yes': {'clean response': 'from links'}}}
+    client._wordlists = WordlistReader(client._WORDLISTS_PATH)
+    assert client._get_word('Answers', 'yes', 'clean response') == 'yes'
+    assert links.requests == 0
+    monkeypatch.setattr(client, '_LOCAL_HOSTS', ())
+    assert client._get_word('Answers', 'yes', 'clean response') == 'from links'
+    assert links.requests == 1